@@ -1,7 +1,6 @@
 """Application entry point"""
 
 from dotenv import load_dotenv
-import os
 import logging
 from pathlib import Path
 
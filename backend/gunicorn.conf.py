@@ -0,0 +1,21 @@
+"""Gunicorn configuration for running the backend on Linux/macOS
+
+Usage: gunicorn -c gunicorn.conf.py app:app
+
+Requests spend most of their time waiting on LM Studio and the Node backend,
+so threaded (gthread) workers let one process overlap many of them. Keep a
+single worker by default: generation slots, caches and the status queue are
+per process.
+"""
+
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5001')}"
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+threads = int(os.getenv("GUNICORN_THREADS", "32"))
+
+# Repo and document generation can run for as long as LM_STUDIO_TIMEOUT
+timeout = int(os.getenv("LM_STUDIO_TIMEOUT", "3600"))
+graceful_timeout = 30
+keepalive = 5
@@ -13,8 +13,16 @@ logger = logging.getLogger(__name__)
 class BotService:
     """Service for bot management operations"""
     
-    def __init__(self):
-        """Initialize bot service"""
+    def __init__(self, ensure_indexes: bool = True):
+        """
+        Initialize bot service
+        
+        Args:
+            ensure_indexes: Create the bot collection indexes now. Pass False
+                when the caller creates them itself, so construction does no I/O.
+        """
+        if not ensure_indexes:
+            return
         # Ensure indexes are created
         try:
             BotModel.create_indexes()
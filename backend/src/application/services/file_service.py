@@ -1,9 +1,13 @@
 """File handling service"""
 
 import logging
+import re
+import shutil
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 from werkzeug.utils import secure_filename
 
 from src.config.settings import settings
@@ -12,6 +16,17 @@ from src.domain.exceptions import FileProcessingError, ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Placed between files in combined content
+_FILE_SEPARATOR = "\n\n\n" + "=" * 80 + "\n\n\n"
+
+# Each upload batch is saved under UPLOAD_PATH/<upload_id>/, a uuid4 hex
+_UPLOAD_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+# Expired upload directories are swept at most this often
+_UPLOAD_SWEEP_INTERVAL = 600.0
+_last_upload_sweep = float("-inf")
+_upload_sweep_lock = threading.Lock()
+
 
 class FileService:
     """Service for handling file operations"""
@@ -68,10 +83,29 @@ class FileService:
             raise FileProcessingError(f"Cannot read file: {e}") from e
     
     @staticmethod
-    def save_uploaded_files(files: List) -> Tuple[List[FileUpload], List[str]]:
+    def upload_dir(upload_id: str) -> Path:
+        """
+        Resolve the directory an upload batch was saved to.
+        
+        Raises:
+            ValidationError: If upload_id is not a server-generated id
+        """
+        if not isinstance(upload_id, str) or not _UPLOAD_ID_RE.fullmatch(upload_id):
+            raise ValidationError("Invalid upload_id")
+        return settings.UPLOAD_PATH / upload_id
+    
+    @staticmethod
+    def save_uploaded_files(files: List, upload_id: str) -> Tuple[List[FileUpload], List[str]]:
         """
         Save uploaded files and return FileUpload objects.
         
+        Files go to their own directory per upload, so identically named files
+        from different uploads never overwrite each other.
+        
+        Args:
+            files: Uploaded FileStorage objects
+            upload_id: Server-generated id naming the batch's directory
+            
         Returns:
             Tuple of (saved files, skipped filenames)
         """
@@ -81,6 +115,7 @@ class FileService:
         if len(files) > settings.MAX_FILES:
             raise ValidationError(f"Too many files. Maximum allowed is {settings.MAX_FILES}.")
         
+        upload_dir = FileService.upload_dir(upload_id)
         saved: List[FileUpload] = []
         skipped: List[str] = []
         
@@ -94,8 +129,12 @@ class FileService:
                 continue
             
             safe_name = secure_filename(file.filename)
-            saved_path = settings.UPLOAD_PATH / safe_name
-            file.save(saved_path)
+            if not safe_name:
+                skipped.append(file.filename)
+                continue
+            upload_dir.mkdir(parents=True, exist_ok=True)
+            saved_path = upload_dir / safe_name
+            file.save(saved_path, buffer_size=settings.UPLOAD_WRITE_BUFFER_SIZE)
             
             content_type = FileService.detect_content_type(file.filename)
             file_upload = FileUpload(
@@ -115,34 +154,126 @@ class FileService:
         return saved, skipped
     
     @staticmethod
-    def combine_file_contents(uploads: List[FileUpload]) -> str:
-        """Combine contents of multiple files into a single string with intelligent formatting"""
-        combined_parts: List[str] = []
+    def load_saved_uploads(upload_id: str, max_age: Optional[float] = None) -> List[FileUpload]:
+        """
+        Rebuild FileUpload objects for an upload batch saved by save_uploaded_files.
+        
+        Args:
+            upload_id: Id returned by the upload
+            max_age: Seconds after which the upload counts as expired
+            
+        Returns:
+            FileUpload objects, ordered by filename
+            
+        Raises:
+            ValidationError: If the upload does not exist or has expired
+        """
+        upload_dir = FileService.upload_dir(upload_id)
+        try:
+            dir_stat = upload_dir.stat()
+            paths = sorted(path for path in upload_dir.iterdir() if path.is_file())
+        except OSError:
+            paths = []
+        if not paths or (max_age is not None and time.time() - dir_stat.st_mtime > max_age):
+            raise ValidationError("Upload not found or expired. Please upload the files again.")
+        
+        uploads: List[FileUpload] = []
+        for saved_path in paths:
+            stat = saved_path.stat()
+            uploads.append(FileUpload(
+                filename=saved_path.name,
+                file_path=saved_path,
+                content_type=FileService.detect_content_type(saved_path.name),
+                size=stat.st_size,
+                uploaded_at=datetime.fromtimestamp(stat.st_mtime)
+            ))
+        return uploads
+    
+    @staticmethod
+    def remove_expired_uploads(max_age: float) -> int:
+        """
+        Delete upload batch directories not modified for over max_age seconds.
+        
+        Only directories named like a server-generated upload_id are touched.
+        
+        Returns:
+            Number of directories removed
+        """
+        cutoff = time.time() - max_age
+        removed = 0
+        try:
+            entries = list(settings.UPLOAD_PATH.iterdir())
+        except OSError:
+            return 0
+        for entry in entries:
+            if not _UPLOAD_ID_RE.fullmatch(entry.name):
+                continue
+            try:
+                if not entry.is_dir() or entry.stat().st_mtime > cutoff:
+                    continue
+                shutil.rmtree(entry)
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Failed to remove expired upload {entry.name}: {e}")
+        if removed:
+            logger.info(f"Removed {removed} expired upload(s)")
+        return removed
+    
+    @staticmethod
+    def maybe_remove_expired_uploads(max_age: float) -> bool:
+        """Start a sweep of expired uploads if the last one was over _UPLOAD_SWEEP_INTERVAL ago"""
+        global _last_upload_sweep
+        now = time.monotonic()
+        if now - _last_upload_sweep < _UPLOAD_SWEEP_INTERVAL:
+            return False
+        with _upload_sweep_lock:
+            if now - _last_upload_sweep < _UPLOAD_SWEEP_INTERVAL:
+                return False
+            _last_upload_sweep = now
+        threading.Thread(
+            target=FileService.remove_expired_uploads,
+            args=(max_age,),
+            name="upload-sweep",
+            daemon=True,
+        ).start()
+        return True
+    
+    @staticmethod
+    def iter_file_contents(uploads: List[FileUpload]) -> Iterator[str]:
+        """
+        Yield the combined content of multiple files piece by piece.
         
+        Headers, separators and file bodies are yielded separately, so callers
+        can stream them without building the combined string.
+        """
         for idx, upload in enumerate(uploads, 1):
+            # Use clear separators between files
+            if idx > 1:
+                yield _FILE_SEPARATOR
+            
+            yield f"FILE {idx}: {upload.filename}\n"
+            
             ext = upload.extension
             if ext in {"pdf", "doc", "docx"}:
                 logger.warning(f"Binary document {upload.filename} cannot be processed - content extraction not available")
-                content = f"[Binary document detected: {upload.filename} - Content extraction not available for this file type]"
+                yield f"[Binary document detected: {upload.filename} - Content extraction not available for this file type]"
             else:
                 try:
                     # Read full file content without truncation for generation
                     content = FileService.read_file_content(upload.file_path, limit_bytes=None)
                     logger.info(f"Successfully read {len(content)} characters from {upload.filename}")
-                    # Add file metadata header for context
-                    file_header = f"---\nFile: {upload.filename}\nType: {upload.content_type}\nSize: {upload.size} bytes\n---\n\n"
-                    content = file_header + content
                 except Exception as e:
                     logger.error(f"Failed to read file {upload.filename}: {e}")
                     raise FileProcessingError(f"Failed to read file {upload.filename}: {e}") from e
-            
-            # Use clear separators between files
-            if idx > 1:
-                combined_parts.append("\n" + "="*80 + "\n")
-            
-            combined_parts.append(f"FILE {idx}: {upload.filename}\n{content}")
-        
-        combined = "\n\n".join(combined_parts)
+                # Add file metadata header for context
+                yield f"---\nFile: {upload.filename}\nType: {upload.content_type}\nSize: {upload.size} bytes\n---\n\n"
+                yield content
+    
+    @staticmethod
+    def combine_file_contents(uploads: List[FileUpload]) -> str:
+        """Combine contents of multiple files into a single string with intelligent formatting"""
+        # Joined once, so each file's content is copied only into the result
+        combined = "".join(FileService.iter_file_contents(uploads))
         logger.info(f"Combined {len(uploads)} files into {len(combined)} characters total")
         return combined
     
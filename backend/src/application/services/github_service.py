@@ -1,9 +1,11 @@
 """GitHub repository ingestion service"""
 
+import json
 import logging
 import re
 import time
-from dataclasses import dataclass
+import uuid
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
 from typing import List, Optional, Tuple
 from urllib.parse import urlparse
@@ -12,9 +14,17 @@ import requests
 
 from src.config.settings import settings
 from src.domain.exceptions import ValidationError
+from src.infrastructure.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# repo_ids are "<owner>_<repo>_<timestamp>_<suffix>"; GitHub names only use these characters,
+# and the leading alphanumeric rules out "." and ".." path segments
+_REPO_ID_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+
+# In-memory manifests are dropped after this long; the disk copy still serves them
+_MANIFEST_TTL = 3600.0
+
 
 @dataclass
 class RepoFile:
@@ -37,6 +47,7 @@ class RepoIngestionResult:
     total_files: int
     total_chars: int
     warnings: List[str]
+    tree_sha: Optional[str] = None  # Git tree SHA the file list was built from
 
 
 class GitHubService:
@@ -70,6 +81,8 @@ class GitHubService:
             self.session.headers.update({
                 "Accept": "application/vnd.github.v3+json"
             })
+        # Ingestion results keyed by "owner/repo" -> result (validated against tree SHA)
+        self._manifests = TTLCache()
     
     def parse_repo_url(self, url: str) -> Tuple[str, str]:
         """
@@ -127,12 +140,38 @@ class GitHubService:
         ext = filename.rsplit(".", 1)[1].lower()
         return ext in settings.ALLOWED_EXTENSIONS
     
-    def fetch_repo_tree(self, owner: str, repo: str, branch: str = "main") -> List[dict]:
+    def _to_validation_error(
+        self,
+        error: requests.exceptions.RequestException,
+        owner: str,
+        repo: str
+    ) -> ValidationError:
+        """Translate a GitHub API request failure into a ValidationError"""
+        if isinstance(error, requests.exceptions.HTTPError):
+            if error.response.status_code == 404:
+                return ValidationError(
+                    f"Repository {owner}/{repo} not found or is private. "
+                    "Ensure the repository is public or provide a GitHub token."
+                )
+            elif error.response.status_code == 403:
+                return ValidationError(
+                    "GitHub API rate limit exceeded. "
+                    "Set GITHUB_TOKEN environment variable to increase limits."
+                )
+            return ValidationError(f"Failed to fetch repository: {str(error)}")
+        if isinstance(error, requests.exceptions.Timeout):
+            return ValidationError(
+                f"Timeout fetching repository from GitHub (>{settings.GITHUB_TIMEOUT}s). "
+                "The repository may be too large."
+            )
+        return ValidationError(f"Failed to connect to GitHub API: {str(error)}")
+    
+    def resolve_tree_sha(self, owner: str, repo: str, branch: str = "main") -> str:
         """
-        Fetch repository tree recursively.
+        Resolve the tree SHA at the head of a branch.
         
         Returns:
-            List of file objects from GitHub API
+            Tree SHA of the branch head commit
         """
         try:
             # Get default branch if not specified
@@ -151,8 +190,31 @@ class GitHubService:
             branch_resp = self.session.get(branch_url, timeout=settings.GITHUB_TIMEOUT)
             branch_resp.raise_for_status()
             branch_data = branch_resp.json()
-            tree_sha = branch_data["commit"]["commit"]["tree"]["sha"]
+            return branch_data["commit"]["commit"]["tree"]["sha"]
             
+        except requests.exceptions.RequestException as e:
+            raise self._to_validation_error(e, owner, repo) from e
+    
+    def fetch_repo_tree(
+        self,
+        owner: str,
+        repo: str,
+        branch: str = "main",
+        tree_sha: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Fetch repository tree recursively.
+        
+        Args:
+            tree_sha: Already-resolved tree SHA (skips the branch lookup)
+        
+        Returns:
+            List of file objects from GitHub API
+        """
+        if not tree_sha:
+            tree_sha = self.resolve_tree_sha(owner, repo, branch)
+        
+        try:
             # Get recursive tree
             tree_url = f"{self.api_base}/repos/{owner}/{repo}/git/trees/{tree_sha}?recursive=1"
             tree_resp = self.session.get(tree_url, timeout=settings.GITHUB_TIMEOUT)
@@ -161,25 +223,8 @@ class GitHubService:
             
             return tree_data.get("tree", [])
             
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                raise ValidationError(
-                    f"Repository {owner}/{repo} not found or is private. "
-                    "Ensure the repository is public or provide a GitHub token."
-                ) from e
-            elif e.response.status_code == 403:
-                raise ValidationError(
-                    "GitHub API rate limit exceeded. "
-                    "Set GITHUB_TOKEN environment variable to increase limits."
-                ) from e
-            raise ValidationError(f"Failed to fetch repository: {str(e)}") from e
-        except requests.exceptions.Timeout:
-            raise ValidationError(
-                f"Timeout fetching repository from GitHub (>{settings.GITHUB_TIMEOUT}s). "
-                "The repository may be too large."
-            )
         except requests.exceptions.RequestException as e:
-            raise ValidationError(f"Failed to connect to GitHub API: {str(e)}") from e
+            raise self._to_validation_error(e, owner, repo) from e
     
     def filter_and_validate_files(
         self,
@@ -288,8 +333,94 @@ class GitHubService:
         owner, repo_name = self.parse_repo_url(repo_url)
         logger.info(f"Parsed: owner={owner}, repo={repo_name}")
         
+        tree_sha = self.resolve_tree_sha(owner, repo_name)
+        return self._ingest(owner, repo_name, tree_sha)
+    
+    def get_or_ingest(self, repo_url: str, repo_id: Optional[str] = None) -> RepoIngestionResult:
+        """
+        Return a cached ingestion manifest when the repository head is unchanged.
+        
+        Only the branch head is resolved; the recursive tree fetch and filtering
+        are skipped when a manifest for the same tree SHA exists, either in
+        memory or on disk under ``repo_id``.
+        
+        A cached manifest is returned under a new repo_id: the id names one
+        generation run (checkpoints, RAG index, PDF), so two runs over the
+        same head must not share it.
+        
+        Args:
+            repo_url: GitHub repository URL or owner/repo format
+            repo_id: Optional repository identifier from a previous ingestion
+            
+        Returns:
+            RepoIngestionResult with file information
+        """
+        owner, repo_name = self.parse_repo_url(repo_url)
+        tree_sha = self.resolve_tree_sha(owner, repo_name)
+        
+        key = f"{owner}/{repo_name}".lower()
+        cached = self._manifests.get(key)
+        if (cached is None or cached.tree_sha != tree_sha) and repo_id:
+            cached = self.load_manifest(repo_id)
+        
+        if (
+            cached is not None
+            and cached.tree_sha == tree_sha
+            and f"{cached.owner}/{cached.repo_name}".lower() == key
+        ):
+            logger.info(f"Using cached ingestion manifest for {key} (repo_id={cached.repo_id})")
+            self._remember_manifest(key, cached)
+            return replace(cached, repo_id=self._new_repo_id(owner, repo_name))
+        
+        logger.info(f"No cached manifest for {key} at {tree_sha}, ingesting")
+        return self._ingest(owner, repo_name, tree_sha)
+    
+    @staticmethod
+    def is_valid_repo_id(repo_id: str) -> bool:
+        """Check that repo_id has the form ingestion generates (safe as a path segment)"""
+        return isinstance(repo_id, str) and _REPO_ID_RE.fullmatch(repo_id) is not None
+    
+    @staticmethod
+    def _new_repo_id(owner: str, repo_name: str) -> str:
+        """Generate a repo_id for a new run; the suffix keeps same-second runs apart"""
+        return f"{owner}_{repo_name}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+    
+    def _remember_manifest(self, key: str, result: RepoIngestionResult) -> None:
+        """Keep a manifest in memory for _MANIFEST_TTL seconds"""
+        self._manifests.prune()
+        self._manifests.set(key, result, _MANIFEST_TTL)
+    
+    def load_manifest(self, repo_id: str) -> Optional[RepoIngestionResult]:
+        """Load a persisted ingestion manifest, if present"""
+        if not self.is_valid_repo_id(repo_id):
+            logger.warning(f"Refusing to load manifest for invalid repo_id: {repo_id!r}")
+            return None
+        manifest_path = settings.REPO_CACHE_PATH / repo_id / "manifest.json"
+        if not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            data["included_files"] = [RepoFile(**item) for item in data.get("included_files", [])]
+            return RepoIngestionResult(**data)
+        except Exception as e:
+            logger.warning(f"Failed to load manifest for {repo_id}: {e}")
+            return None
+    
+    def _save_manifest(self, result: RepoIngestionResult) -> None:
+        """Persist an ingestion manifest so later requests can reuse it"""
+        try:
+            manifest_dir = settings.REPO_CACHE_PATH / result.repo_id
+            manifest_dir.mkdir(parents=True, exist_ok=True)
+            with open(manifest_dir / "manifest.json", "w", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(result), indent=2))
+        except Exception as e:
+            logger.warning(f"Failed to save manifest for {result.repo_id}: {e}")
+    
+    def _ingest(self, owner: str, repo_name: str, tree_sha: str) -> RepoIngestionResult:
+        """Fetch, filter and cache the file list for a resolved tree SHA"""
         # Fetch tree
-        tree_items = self.fetch_repo_tree(owner, repo_name)
+        tree_items = self.fetch_repo_tree(owner, repo_name, tree_sha=tree_sha)
         logger.info(f"Fetched {len(tree_items)} items from repository")
         
         # Filter files
@@ -306,11 +437,11 @@ class GitHubService:
         )
         
         # Generate repo_id
-        repo_id = f"{owner}_{repo_name}_{int(time.time())}"
+        repo_id = self._new_repo_id(owner, repo_name)
         
         total_chars = sum(f.size for f in included)
         
-        return RepoIngestionResult(
+        result = RepoIngestionResult(
             repo_id=repo_id,
             owner=owner,
             repo_name=repo_name,
@@ -318,6 +449,10 @@ class GitHubService:
             skipped_files=skipped,
             total_files=len(included),
             total_chars=total_chars,
-            warnings=warnings
+            warnings=warnings,
+            tree_sha=tree_sha
         )
-
+        
+        self._remember_manifest(f"{owner}/{repo_name}".lower(), result)
+        self._save_manifest(result)
+        return result
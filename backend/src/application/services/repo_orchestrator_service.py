@@ -43,15 +43,18 @@ class RepoOrchestratorService:
         self.checkpoint_service = checkpoint_service or CheckpointService()
         self.user_id = user_id
     
-    def ingest_repository(self, repo_url: str) -> RepoIngestionResult:
+    def ingest_repository(self, repo_url: str, repo_id: Optional[str] = None) -> RepoIngestionResult:
         """
         Step 1: Ingest repository from GitHub.
         
+        Reuses the manifest from an earlier ingestion of the same repository
+        head instead of re-fetching the full tree.
+        
         Returns:
             RepoIngestionResult with file information
         """
         logger.info(f"Ingesting repository: {repo_url}")
-        return self.github_service.ingest_repository(repo_url)
+        return self.github_service.get_or_ingest(repo_url, repo_id=repo_id)
     
     def _report_status(
         self,
@@ -138,7 +141,7 @@ class RepoOrchestratorService:
             repo_url=repo_url,
             repo_id=repo_id
         )
-        ingestion_result = self.ingest_repository(repo_url)
+        ingestion_result = self.ingest_repository(repo_url, repo_id=repo_id)
         logger.info(f"Ingested {ingestion_result.total_files} files")
         
         # Save checkpoint after ingestion
@@ -1,11 +1,14 @@
 """Zip file extraction and processing service"""
 
 import logging
+import os
 import re
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from src.config.settings import settings
 from src.domain.exceptions import ValidationError, FileProcessingError
@@ -62,6 +65,7 @@ class ZipService:
         self.max_files = settings.GITHUB_MAX_REPO_FILES
         self.max_total_chars = settings.GITHUB_MAX_TOTAL_CHARS
         self.max_single_file = settings.GITHUB_MAX_SINGLE_FILE_SIZE
+        self.max_workers = min(8, os.cpu_count() or 1)
     
     def _should_ignore_path(self, path: str) -> bool:
         """Check if a file path should be ignored"""
@@ -80,6 +84,89 @@ class ZipService:
         ext = filename.rsplit(".", 1)[1].lower()
         return ext in settings.ALLOWED_EXTENSIONS
     
+    def _select_members(
+        self, zip_path: Path, skipped: List[str], warnings: List[str]
+    ) -> List[zipfile.ZipInfo]:
+        """
+        Apply path, extension and size filters using only the zip directory.
+        
+        Returns:
+            ZipInfo entries to read, in archive order
+        """
+        selected: List[zipfile.ZipInfo] = []
+        budget = 0
+        
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            members = zip_ref.infolist()
+            logger.info(f"Extracting zip with {len(members)} entries")
+            
+            for info in members:
+                file_path = info.filename
+                
+                # Skip directories
+                if info.is_dir():
+                    continue
+                
+                # Check ignored patterns
+                if self._should_ignore_path(file_path):
+                    skipped.append(f"{file_path} (ignored pattern)")
+                    continue
+                
+                # Check extension
+                if not self._is_allowed_extension(file_path):
+                    skipped.append(f"{file_path} (unsupported extension)")
+                    continue
+                
+                # Check file count limit
+                if len(selected) >= self.max_files:
+                    skipped.append(f"{file_path} (max files reached: {self.max_files})")
+                    warnings.append(f"Reached maximum file limit ({self.max_files}). Some files were skipped.")
+                    break
+                
+                # Check single file size
+                file_size = info.file_size
+                if file_size > self.max_single_file:
+                    skipped.append(f"{file_path} (too large: {file_size} bytes)")
+                    warnings.append(f"Skipped {file_path}: exceeds max file size ({self.max_single_file} bytes)")
+                    continue
+                
+                # Check total character limit
+                if budget + file_size > self.max_total_chars:
+                    skipped.append(f"{file_path} (total size limit reached)")
+                    warnings.append(
+                        f"Reached total size limit ({self.max_total_chars} chars). "
+                        f"Processed {len(selected)} files with {budget} characters."
+                    )
+                    break
+                
+                selected.append(info)
+                budget += file_size
+        
+        return selected
+    
+    @staticmethod
+    def _make_reader(zip_path: Path, handles: List[zipfile.ZipFile]):
+        """
+        Build a member reader that keeps one ZipFile handle per worker thread.
+        
+        A single ZipFile handle is not safe to read from concurrently. Opened
+        handles are appended to ``handles`` so the caller can close them.
+        """
+        local = threading.local()
+        
+        def read(info: zipfile.ZipInfo) -> Tuple[Optional[str], Optional[str]]:
+            handle = getattr(local, "handle", None)
+            if handle is None:
+                handle = local.handle = zipfile.ZipFile(zip_path, 'r')
+                handles.append(handle)
+            try:
+                return handle.read(info).decode('utf-8', errors='ignore'), None
+            except Exception as e:
+                logger.warning(f"Failed to read {info.filename}: {e}")
+                return None, f"read error: {str(e)}"
+        
+        return read
+    
     def extract_zip(self, zip_path: Path) -> ZipIngestionResult:
         """
         Extract and process zip file with same filtering as GitHub repos.
@@ -99,81 +186,31 @@ class ZipService:
         total_chars = 0
         
         try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                file_list = zip_ref.namelist()
-                logger.info(f"Extracting zip with {len(file_list)} entries")
+            selected = self._select_members(zip_path, skipped, warnings)
+            
+            # Decompress selected members in parallel; zlib releases the GIL
+            workers = max(1, min(self.max_workers, len(selected)))
+            handles: List[zipfile.ZipFile] = []
+            try:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zip") as executor:
+                    results = list(executor.map(self._make_reader(zip_path, handles), selected))
+            finally:
+                for handle in handles:
+                    handle.close()
+            
+            for info, (content, error) in zip(selected, results):
+                if error is not None:
+                    skipped.append(f"{info.filename} ({error})")
+                    continue
                 
-                for file_path in file_list:
-                    # Skip directories
-                    if file_path.endswith('/'):
-                        continue
-                    
-                    # Check ignored patterns
-                    if self._should_ignore_path(file_path):
-                        skipped.append(f"{file_path} (ignored pattern)")
-                        continue
-                    
-                    # Check extension
-                    if not self._is_allowed_extension(file_path):
-                        skipped.append(f"{file_path} (unsupported extension)")
-                        continue
-                    
-                    # Check file count limit
-                    if len(included) >= self.max_files:
-                        skipped.append(f"{file_path} (max files reached: {self.max_files})")
-                        warnings.append(f"Reached maximum file limit ({self.max_files}). Some files were skipped.")
-                        break
-                    
-                    try:
-                        # Get file info
-                        file_info = zip_ref.getinfo(file_path)
-                        file_size = file_info.file_size
-                        
-                        # Check single file size
-                        if file_size > self.max_single_file:
-                            skipped.append(f"{file_path} (too large: {file_size} bytes)")
-                            warnings.append(f"Skipped {file_path}: exceeds max file size ({self.max_single_file} bytes)")
-                            continue
-                        
-                        # Check total character limit
-                        if total_chars + file_size > self.max_total_chars:
-                            skipped.append(f"{file_path} (total size limit reached)")
-                            warnings.append(
-                                f"Reached total size limit ({self.max_total_chars} chars). "
-                                f"Processed {len(included)} files with {total_chars} characters."
-                            )
-                            break
-                        
-                        # Extract and read file content
-                        try:
-                            content = zip_ref.read(file_path).decode('utf-8', errors='ignore')
-                            
-                            # Extract extension
-                            ext = file_path.rsplit(".", 1)[1].lower() if "." in file_path else ""
-                            
-                            zip_file = ZipFile(
-                                path=file_path,
-                                content=content,
-                                size=len(content),
-                                extension=ext
-                            )
-                            
-                            included.append(zip_file)
-                            total_chars += len(content)
-                            
-                        except UnicodeDecodeError:
-                            skipped.append(f"{file_path} (encoding error)")
-                            logger.warning(f"Failed to decode {file_path} as UTF-8")
-                        except Exception as e:
-                            skipped.append(f"{file_path} (read error: {str(e)})")
-                            logger.warning(f"Failed to read {file_path}: {e}")
-                    
-                    except KeyError:
-                        skipped.append(f"{file_path} (not found in zip)")
-                        logger.warning(f"File {file_path} not found in zip")
-                    except Exception as e:
-                        skipped.append(f"{file_path} (error: {str(e)})")
-                        logger.error(f"Error processing {file_path}: {e}")
+                ext = info.filename.rsplit(".", 1)[1].lower() if "." in info.filename else ""
+                included.append(ZipFile(
+                    path=info.filename,
+                    content=content,
+                    size=len(content),
+                    extension=ext
+                ))
+                total_chars += len(content)
         
         except zipfile.BadZipFile:
             raise ValidationError("Invalid zip file format")
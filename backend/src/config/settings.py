@@ -13,11 +13,13 @@ class Settings:
     LM_MODEL_NAME: str = os.getenv("LM_MODEL_NAME", "qwen3-14b")
     LM_STUDIO_EMBED_MODEL: str = os.getenv("LM_STUDIO_EMBED_MODEL", "qwen-2.5-1.5b-embedding-entropy-rl-1")
     LM_STUDIO_TIMEOUT: int = int(os.getenv("LM_STUDIO_TIMEOUT", "3600"))  # 60 minutes default for slow 14B models and large generations
+    MAX_CONCURRENT_GENERATIONS: int = int(os.getenv("MAX_CONCURRENT_GENERATIONS", "2"))  # Repo generations allowed in parallel
     
     # File Upload Configuration
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
     MAX_CONTENT_PREVIEW: int = int(os.getenv("MAX_CONTENT_PREVIEW", "200000"))  # Increased to 200KB for real documents
     MAX_FILES: int = int(os.getenv("MAX_FILES", "5"))
+    UPLOAD_WRITE_BUFFER_SIZE: int = int(os.getenv("UPLOAD_WRITE_BUFFER_SIZE", str(1024 * 1024)))  # Bytes per read/write when saving uploads
     
     # Allowed file extensions
     ALLOWED_EXTENSIONS: set[str] = {
@@ -33,6 +35,7 @@ class Settings:
     GITHUB_MAX_TOTAL_CHARS: int = int(os.getenv("GITHUB_MAX_TOTAL_CHARS", "200000"))
     GITHUB_MAX_SINGLE_FILE_SIZE: int = int(os.getenv("GITHUB_MAX_SINGLE_FILE_SIZE", "200000"))  # 200KB
     GITHUB_TIMEOUT: int = int(os.getenv("GITHUB_TIMEOUT", "60"))
+    REPO_CACHE_DIR: str = os.getenv("REPO_CACHE_DIR", "data/repo_cache")  # Ingest manifests keyed by repo_id
     
     # RAG Pipeline Configuration
     RAG_CHUNK_SIZE: int = int(os.getenv("RAG_CHUNK_SIZE", "700"))
@@ -44,6 +47,9 @@ class Settings:
     API_PORT: int = int(os.getenv("PORT", "5001"))
     API_HOST: str = os.getenv("HOST", "0.0.0.0")
     DEBUG: bool = os.getenv("DEBUG", "false").lower() in ("true", "1", "yes")
+    USE_X_SENDFILE: bool = os.getenv("USE_X_SENDFILE", "false").lower() in ("true", "1", "yes")  # Behind Apache mod_xsendfile
+    X_ACCEL_UPLOADS_PREFIX: Optional[str] = os.getenv("X_ACCEL_UPLOADS_PREFIX")  # Internal nginx location for /uploads, e.g. /_uploads_internal/
+    USAGE_FLUSH_INTERVAL: float = float(os.getenv("USAGE_FLUSH_INTERVAL", "5"))  # Seconds between batched usage increments; 0 sends each one immediately
     
     # Node Backend Configuration (for status reporting)
     NODE_BACKEND_URL: str = os.getenv("NODE_BACKEND_URL", "http://localhost:5002")
@@ -51,18 +57,24 @@ class Settings:
     # MongoDB Configuration
     MONGODB_URI: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017/recall_ai")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "recall_ai")
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "5"))  # Kept warm so status pings don't pay for a handshake
+    MONGODB_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "500"))  # Fail fast when the pool is exhausted
     
     # Base directories
     BASE_DIR: Path = Path(__file__).resolve().parent.parent.parent
     FRONTEND_DIR: Path = BASE_DIR.parent / "frontend"
     UPLOAD_PATH: Path = BASE_DIR / UPLOAD_DIR
     RAG_INDEX_PATH: Path = BASE_DIR / RAG_INDEX_DIR
+    REPO_CACHE_PATH: Path = BASE_DIR / REPO_CACHE_DIR
     
     @classmethod
     def ensure_directories(cls) -> None:
         """Ensure required directories exist"""
         cls.UPLOAD_PATH.mkdir(parents=True, exist_ok=True)
         cls.RAG_INDEX_PATH.mkdir(parents=True, exist_ok=True)
+        cls.REPO_CACHE_PATH.mkdir(parents=True, exist_ok=True)
 
 
 # Global settings instance
@@ -33,7 +33,7 @@ class DocumentGeneration:
     
     def validate(self) -> None:
         """Validate the generation request"""
-        if not self.raw_content or not self.raw_content.strip():
+        if not self.raw_content or self.raw_content.isspace():
             raise ValueError("raw_content must not be empty")
         if self.content_type not in {"code", "text"}:
             raise ValueError("contentType must be 'code' or 'text'")
@@ -2,9 +2,7 @@
 
 import json
 import logging
-import os
 from pathlib import Path
-from typing import Optional
 
 from flask import jsonify, request, Response
 from werkzeug.utils import secure_filename
@@ -16,13 +14,13 @@ from src.infrastructure.storage.chat_message_model import ChatMessageModel
 
 logger = logging.getLogger(__name__)
 
-# Initialize bot service
-bot_service = BotService()
+# Initialize bot service; create_app() creates the indexes, so importing this
+# module doesn't block on MongoDB
+bot_service = BotService(ensure_indexes=False)
 
 # RAG indices directory
 RAG_INDICES_DIR = Path(settings.BASE_DIR) / "data" / "rag_indices"
 RAG_INDICES_DIR.mkdir(parents=True, exist_ok=True)
-RAG_INDICES_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def register_bot_routes(app):
@@ -133,7 +131,7 @@ def register_bot_routes(app):
                 if file.filename:
                     filename = secure_filename(file.filename)
                     file_path = bot_upload_dir / filename
-                    file.save(str(file_path))
+                    file.save(str(file_path), buffer_size=settings.UPLOAD_WRITE_BUFFER_SIZE)
                     saved_files.append({
                         "filename": filename,
                         "path": str(file_path),
@@ -0,0 +1,49 @@
+"""Gzip compression for text and JSON API responses"""
+
+import gzip
+
+from flask import Flask, Response, request
+
+COMPRESS_MIMETYPES = frozenset(("application/json", "text/html", "text/plain"))
+COMPRESS_LEVEL = 4  # Good ratio on source text without burning CPU
+COMPRESS_MIN_SIZE = 1024  # Below this the gzip header overhead isn't worth it
+
+
+def accepts_gzip() -> bool:
+    """Check whether the client accepts gzip (honouring q-values, so gzip;q=0 is a refusal)"""
+    return request.accept_encodings["gzip"] > 0
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    """Gzip ``data`` at the level used for responses"""
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+
+
+def compress_response(response: Response) -> Response:
+    """Gzip ``response`` in place when the client and payload allow it"""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESS_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if not accepts_gzip():
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(gzip_bytes(data))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def install_compression(app: Flask) -> None:
+    """Compress eligible responses for every route on ``app``"""
+    app.after_request(compress_response)
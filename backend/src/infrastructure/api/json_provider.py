@@ -0,0 +1,78 @@
+"""Flask JSON provider backed by orjson when it is installed"""
+
+import logging
+from typing import Any
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+# orjson is optional; Flask's stdlib-based provider is used without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson.
+
+    Values orjson can't encode natively (e.g. datetimes, which Flask renders
+    as HTTP dates) go through Flask's default hook, and anything orjson
+    rejects outright falls back to the stdlib encoder.
+    """
+
+    _OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def _dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes"""
+        option = self._OPTIONS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs).encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize ``obj`` to a JSON string"""
+        return self._dumps_bytes(obj, **kwargs).decode("utf-8")
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """
+        Build a JSON response from orjson's bytes directly.
+
+        Skips the str round-trip (decode, then re-encode by the response) that
+        the default provider does, which matters for multi-MB payloads.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            dump_args = {"indent": 2}
+        else:
+            dump_args = {"separators": (",", ":")}
+        return self._app.response_class(
+            self._dumps_bytes(obj, **dump_args) + b"\n", mimetype=self.mimetype
+        )
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialize JSON from a string or bytes"""
+        return orjson.loads(s)
+
+
+def dumps_bytes(provider: DefaultJSONProvider, obj: Any) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes with the app's provider, skipping the str step when possible"""
+    if isinstance(provider, OrjsonProvider):
+        return provider._dumps_bytes(obj)
+    return provider.dumps(obj).encode("utf-8")
+
+
+def install_json_provider(app) -> None:
+    """Use the orjson provider for ``app`` if orjson is available"""
+    if orjson is None:
+        logger.info("orjson not installed, using default JSON provider")
+        return
+    app.json = OrjsonProvider(app)
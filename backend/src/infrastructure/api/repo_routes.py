@@ -2,10 +2,12 @@
 
 import logging
 import os
+import threading
+import traceback
 from pathlib import Path
 from typing import Optional
 
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request
 
 from src.application.services.github_service import GitHubService
 from src.application.services.rag_index_service import RAGIndexService
@@ -15,69 +17,88 @@ from src.application.services.repo_scan_service import RepoScanService
 from src.config.settings import settings
 from src.domain.exceptions import ValidationError
 from src.infrastructure.external import LMStudioClient, FPDFGenerator
-from src.infrastructure.external.status_reporter import StatusReporter
+from src.infrastructure.external.status_reporter import (
+    BACKGROUND_TIMEOUT,
+    BackgroundStatusReporter,
+    StatusReporter,
+    ThrottledStatusCallback,
+)
 from src.infrastructure.external.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
+# Evaluated once at import; DEBUG_TRACE does not change at runtime
+_DEBUG_TRACE = os.environ.get("DEBUG_TRACE", "").strip().lower() in ("1", "true", "yes")
 
-def register_repo_routes(app: Flask):
-    """Register repository-related routes"""
-    
-    # Initialize services
-    llm_client = LMStudioClient()
-    pdf_generator = FPDFGenerator()
-    github_service = GitHubService()
-    repo_scan_service = RepoScanService(llm_client)
-    rag_index_service = RAGIndexService(settings.LM_STUDIO_BASE_URL)
-    repo_doc_service = RepoDocService(llm_client, pdf_generator, rag_index_service)
-    status_reporter = StatusReporter(settings.NODE_BACKEND_URL)
-    user_service = UserService(settings.NODE_BACKEND_URL)
+# Process-wide cap on concurrent repository generations (each one saturates LM Studio)
+_gen_lock = threading.Lock()
+_gen_active = 0
+_GEN_RETRY_AFTER_SECONDS = 30
+
+
+def _acquire_generation_slot() -> Optional[int]:
+    """Take a generation slot without blocking; returns the slots left, or None if all are busy"""
+    global _gen_active
+    with _gen_lock:
+        if _gen_active >= settings.MAX_CONCURRENT_GENERATIONS:
+            return None
+        _gen_active += 1
+        return settings.MAX_CONCURRENT_GENERATIONS - _gen_active
+
+
+def _release_generation_slot() -> None:
+    """Give back a slot taken with _acquire_generation_slot()"""
+    global _gen_active
+    with _gen_lock:
+        _gen_active -= 1
+
+
+def _rate_limit_headers(remaining: int) -> dict:
+    """X-RateLimit headers describing the generation slots"""
+    return {
+        "X-RateLimit-Limit": str(settings.MAX_CONCURRENT_GENERATIONS),
+        "X-RateLimit-Remaining": str(remaining),
+    }
+
+
+def register_repo_routes(
+    app: Flask,
+    llm_client: Optional[LMStudioClient] = None,
+    pdf_generator: Optional[FPDFGenerator] = None,
+    github_service: Optional[GitHubService] = None,
+    repo_scan_service: Optional[RepoScanService] = None,
+    rag_index_service: Optional[RAGIndexService] = None,
+    repo_doc_service: Optional[RepoDocService] = None,
+    background_reporter: Optional[BackgroundStatusReporter] = None,
+    user_service: Optional[UserService] = None,
+):
+    """
+    Register repository-related routes
     
-    def status_callback(**kwargs):
-        """Callback to report status updates to Node backend"""
-        # Get auth token from request headers if available
-        token = None
-        try:
-            auth_header = request.headers.get('Authorization', '')
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ', 1)[1]
-        except Exception:
-            pass
-        
-        # Report status update
-        status_reporter.report_progress(
-            status=kwargs.get('status', 'pending'),
-            progress=kwargs.get('progress', 0),
-            current_step=kwargs.get('current_step', ''),
-            token=token,
-            type=kwargs.get('type', 'github_repo'),
-            repo_url=kwargs.get('repo_url'),
-            repo_id=kwargs.get('repo_id'),
-            repo_info=kwargs.get('repo_info'),
-            file_count=kwargs.get('file_count', 0),
-            total_steps=kwargs.get('total_steps', 0),
-            completed_steps=kwargs.get('completed_steps', 0)
-        )
-        
-        # If completed, report completion with markdown
-        if kwargs.get('status') == 'completed':
-            status_reporter.report_completion(
-                markdown=kwargs.get('markdown', ''),
-                pdf_url=kwargs.get('pdf_url'),
-                pdf_info=kwargs.get('pdf_info'),
-                token=token
-            )
+    Services not passed in are created here; create_app() passes its own so
+    the process keeps one LLM client, HTTP session pool and reporter queue.
+    """
     
-    orchestrator = RepoOrchestratorService(
-        llm_client=llm_client,
-        pdf_generator=pdf_generator,
-        github_service=github_service,
-        repo_scan_service=repo_scan_service,
-        rag_index_service=rag_index_service,
-        repo_doc_service=repo_doc_service,
-        status_callback=status_callback
+    # Initialize services
+    llm_client = llm_client or LMStudioClient()
+    pdf_generator = pdf_generator or FPDFGenerator()
+    github_service = github_service or GitHubService()
+    repo_scan_service = repo_scan_service or RepoScanService(llm_client)
+    rag_index_service = rag_index_service or RAGIndexService(settings.LM_STUDIO_BASE_URL)
+    repo_doc_service = repo_doc_service or RepoDocService(llm_client, pdf_generator, rag_index_service)
+    background_reporter = background_reporter or BackgroundStatusReporter(
+        StatusReporter(settings.NODE_BACKEND_URL, timeout=BACKGROUND_TIMEOUT, retries=0)
     )
+    user_service = user_service or UserService(settings.NODE_BACKEND_URL)
+    
+    def release_usage_async(token: Optional[str]):
+        """Release a codeToDoc reservation without blocking the response"""
+        if token:
+            threading.Thread(
+                target=user_service.release_usage,
+                args=(token, "codeToDoc", 1),
+                daemon=True
+            ).start()
     
     @app.route("/api/repo/ingest", methods=["POST"])
     def ingest_repo():
@@ -89,8 +110,8 @@ def register_repo_routes(app: Flask):
             if not repo_url:
                 return jsonify({"success": False, "error": "repo_url is required"}), 400
             
-            # Ingest repository
-            result = github_service.ingest_repository(repo_url)
+            # Ingest repository (reuses the cached manifest if the head is unchanged)
+            result = github_service.get_or_ingest(repo_url)
             
             return jsonify({
                 "repo_id": result.repo_id,
@@ -115,16 +136,20 @@ def register_repo_routes(app: Flask):
             return jsonify({"error": str(e)}), 400
         except Exception as e:
             logger.exception("Repository ingestion failed")
-            include_trace = bool(os.environ.get("DEBUG_TRACE", "").lower() in {"1", "true", "yes"})
             error_msg = str(e)
-            if include_trace:
-                import traceback
+            if _DEBUG_TRACE:
                 error_msg += f"\n{traceback.format_exc()}"
             return jsonify({"error": error_msg}), 500
     
     @app.route("/api/repo/generate", methods=["POST"])
     def generate_repo_doc():
         """Generate documentation from a GitHub repository"""
+        # Get auth token for status reporting
+        token = g.get("token")
+        # Set once codeToDoc usage is reserved; every failure after that releases it
+        reserved = False
+        # Set once a generation slot is taken; released however the request ends
+        slot_held = False
         try:
             data = request.get_json() or {}
             repo_url = data.get("repo_url", "").strip()
@@ -140,36 +165,40 @@ def register_repo_routes(app: Flask):
             # If repo_id not provided, ingest first
             if not repo_id:
                 logger.info(f"repo_id not provided, ingesting repository: {repo_url}")
-                ingestion = github_service.ingest_repository(repo_url)
+                ingestion = github_service.get_or_ingest(repo_url)
                 repo_id = ingestion.repo_id
                 logger.info(f"Ingested repository, got repo_id: {repo_id}")
             else:
                 # Validate repo_id format
-                if not repo_id or len(repo_id) < 3:
+                if len(repo_id) < 3 or not github_service.is_valid_repo_id(repo_id):
                     logger.warning(f"Invalid repo_id format: {repo_id}")
                     return jsonify({"success": False, "error": "Invalid repo_id format"}), 400
             
-            # Get auth token from request headers for status reporting
-            token = None
-            try:
-                auth_header = request.headers.get('Authorization', '')
-                if auth_header.startswith('Bearer '):
-                    token = auth_header.split(' ', 1)[1]
-            except Exception:
-                pass
+            # Reject instead of queueing when every generation slot is taken; checked
+            # before reserving usage so a busy server costs no Node backend calls
+            slots_remaining = _acquire_generation_slot()
+            if slots_remaining is None:
+                logger.warning("Repository generation rejected: all generation slots are busy")
+                return jsonify({
+                    "success": False,
+                    "error": "Server busy, please retry shortly",
+                    "retry_after": _GEN_RETRY_AFTER_SECONDS
+                }), 429, {"Retry-After": str(_GEN_RETRY_AFTER_SECONDS), **_rate_limit_headers(0)}
+            slot_held = True
             
-            # Check usage limit before generating
+            # Check the limit and reserve usage in one round-trip; released again on failure
             if token:
-                can_proceed, usage_info, error_msg = user_service.check_usage_limit(token, "codeToDoc")
+                can_proceed, usage_info, error_msg = user_service.reserve_usage(token, "codeToDoc")
                 if not can_proceed:
                     logger.warning(f"Usage limit reached for codeToDoc: {error_msg}")
                     return jsonify({"error": error_msg}), 403
+                reserved = True
             
             # Create a request-specific status callback that captures the token
             def request_status_callback(**kwargs):
                 """Status callback with captured token from request"""
                 # Report status update
-                status_reporter.report_progress(
+                background_reporter.report_progress(
                     status=kwargs.get('status', 'pending'),
                     progress=kwargs.get('progress', 0),
                     current_step=kwargs.get('current_step', ''),
@@ -182,15 +211,7 @@ def register_repo_routes(app: Flask):
                     total_steps=kwargs.get('total_steps', 0),
                     completed_steps=kwargs.get('completed_steps', 0)
                 )
-                
-                # If completed, report completion with markdown
-                if kwargs.get('status') == 'completed':
-                    status_reporter.report_completion(
-                        markdown=kwargs.get('markdown', ''),
-                        pdf_url=kwargs.get('pdf_url'),
-                        pdf_info=kwargs.get('pdf_info'),
-                        token=token
-                    )
+                # The completion itself (with markdown) is reported once, after generation returns
             
             # Create orchestrator with request-specific status callback
             request_orchestrator = RepoOrchestratorService(
@@ -200,7 +221,7 @@ def register_repo_routes(app: Flask):
                 repo_scan_service=repo_scan_service,
                 rag_index_service=rag_index_service,
                 repo_doc_service=repo_doc_service,
-                status_callback=request_status_callback
+                status_callback=ThrottledStatusCallback(request_status_callback)
             )
             
             # Generate documentation (status updates are handled by orchestrator)
@@ -211,109 +232,103 @@ def register_repo_routes(app: Flask):
                     title=title
                 )
                 
-                logger.info(f"Repository documentation generated successfully | repo_id={repo_id} | output_length={len(result.get('markdown', ''))}")
+                markdown = result.get("markdown", "")
+                pdf_path = result.get("pdf_path")
+                pdf_url = result.get("pdf_url")
+                pdf_filename = Path(pdf_path).name if pdf_path else None
+                pdf_info = {"filename": pdf_filename} if pdf_filename else None
                 
-                # Increment usage after successful generation
-                if token:
-                    user_service.increment_usage(token, "codeToDoc", 1)
+                logger.info(f"Repository documentation generated successfully | repo_id={repo_id} | output_length={len(markdown)}")
                     
             except Exception as e:
                 logger.error(f"Repository documentation generation failed: {e}", exc_info=True)
                 error_msg = f"Repository generation failed: {str(e)}"
                 # Report error to Node backend
                 try:
-                    status_reporter.report_error(
+                    background_reporter.report_error(
                         error_message=error_msg,
                         error_code="REPO_GENERATION_ERROR",
                         token=token
                     )
-                    logger.info("Error status reported to Node backend")
+                    logger.info("Error status queued for Node backend")
                 except Exception as status_err:
                     logger.warning(f"Failed to report error status (non-critical): {status_err}")
                 raise RuntimeError(error_msg)  # Re-raise with better error message
             
-            # Ensure completion status is reported (orchestrator should handle this, but ensure it)
-            # Retry if it fails since completion status is important
-            completion_reported = False
-            if result.get("markdown"):
-                for attempt in range(3):
-                    try:
-                        if status_reporter.report_completion(
-                            markdown=result["markdown"],
-                            pdf_url=result.get("pdf_url"),
-                            pdf_info={"filename": Path(result["pdf_path"]).name} if result.get("pdf_path") else None,
-                            token=token
-                        ):
-                            logger.info("Completion status confirmed for repository generation")
-                            completion_reported = True
-                            break
-                        else:
-                            logger.warning(f"Completion status report returned False (attempt {attempt + 1}/3)")
-                    except Exception as status_err:
-                        logger.warning(f"Failed to confirm completion status (attempt {attempt + 1}/3): {status_err}")
-                        if attempt < 2:
-                            import time
-                            time.sleep(0.5)  # Brief delay before retry
-                
-                if not completion_reported:
-                    logger.error("Failed to report completion status after all retries - this may cause frontend polling issues")
+            # The one completion report, queued in order after this token's progress
+            # updates; the reporter retries it and logs an error if it never lands
+            if markdown:
+                background_reporter.report_completion(
+                    context=f"repo_id={repo_id}",
+                    markdown=markdown,
+                    pdf_url=pdf_url,
+                    pdf_info=pdf_info,
+                    token=token
+                )
             
             return jsonify({
                 "success": True,
-                "output": result["markdown"],
-                "docText": result["markdown"],  # Backward compatibility
-                "pdfFilename": Path(result["pdf_path"]).name if result["pdf_path"] else None,
-                "pdfPath": result["pdf_url"],
-                "pdfUrl": result["pdf_url"],
+                "output": markdown,
+                "docText": markdown,  # Backward compatibility
+                "pdfFilename": pdf_filename,
+                "pdfPath": pdf_url,
+                "pdfUrl": pdf_url,
                 "chapters": result.get("chapters", []),
                 "repo_info": result.get("repo_info", {}),
                 "duration_seconds": result.get("duration_seconds", 0)
-            }), 200
+            }), 200, _rate_limit_headers(slots_remaining)
             
         except ValidationError as e:
             logger.warning(f"Validation error in repo/generate: {e}", exc_info=True)
+            if reserved:
+                release_usage_async(token)
             error_msg = f"Validation error: {str(e)}"
             # Report error status
             try:
-                status_reporter.report_error(
+                background_reporter.report_error(
                     error_message=error_msg,
                     error_code="VALIDATION_ERROR",
                     token=token
                 )
-                logger.info("Validation error status reported to Node backend")
+                logger.info("Validation error status queued for Node backend")
             except Exception as status_err:
                 logger.warning(f"Failed to report validation error status (non-critical): {status_err}")
             return jsonify({"success": False, "error": error_msg}), 400
         except RuntimeError as e:
             logger.error(f"Runtime error: {e}", exc_info=True)
+            if reserved:
+                release_usage_async(token)
             error_msg = f"Generation error: {str(e)}"
             # Report error status
             try:
-                status_reporter.report_error(
+                background_reporter.report_error(
                     error_message=error_msg,
                     error_code="RUNTIME_ERROR",
                     token=token
                 )
-                logger.info("Runtime error status reported to Node backend")
+                logger.info("Runtime error status queued for Node backend")
             except Exception as status_err:
                 logger.warning(f"Failed to report runtime error status (non-critical): {status_err}")
             return jsonify({"success": False, "error": error_msg}), 500
         except Exception as e:
             logger.exception("Repository documentation generation failed")
-            include_trace = bool(os.environ.get("DEBUG_TRACE", "").lower() in {"1", "true", "yes"})
+            if reserved:
+                release_usage_async(token)
             error_msg = f"Internal server error: {str(e)}"
-            if include_trace:
-                import traceback
+            if _DEBUG_TRACE:
                 error_msg += f"\n{traceback.format_exc()}"
             # Report error status
             try:
-                status_reporter.report_error(
+                background_reporter.report_error(
                     error_message=error_msg,
                     error_code="INTERNAL_ERROR",
                     token=token
                 )
-                logger.info("Internal error status reported to Node backend")
+                logger.info("Internal error status queued for Node backend")
             except Exception as status_err:
                 logger.warning(f"Failed to report internal error status (non-critical): {status_err}")
             return jsonify({"success": False, "error": error_msg}), 500
+        finally:
+            if slot_held:
+                _release_generation_slot()
 
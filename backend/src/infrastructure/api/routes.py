@@ -2,28 +2,52 @@
 
 import logging
 import os
+import re
+import tempfile
+import threading
+import time
 import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
+from urllib.parse import quote
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Request, g, jsonify, request, send_from_directory
 from flask_cors import CORS
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.config.settings import settings
 from src.domain.models import DocumentGeneration, ContentType
 from src.domain.exceptions import ValidationError, FileProcessingError
 from src.application.services.file_service import FileService
 from src.application.services.document_service import DocumentService
+from src.application.services.github_service import GitHubService
+from src.application.services.rag_index_service import RAGIndexService
+from src.application.services.repo_doc_service import RepoDocService
+from src.application.services.repo_orchestrator_service import RepoOrchestratorService
+from src.application.services.repo_scan_service import RepoScanService
 from src.application.services.zip_service import ZipService
 from src.infrastructure.external import LMStudioClient, FPDFGenerator
-from src.infrastructure.external.status_reporter import StatusReporter
-from src.infrastructure.external.user_service import UserService
+from src.infrastructure.external.platform_detector import PlatformDetector
+from src.infrastructure.external.status_reporter import (
+    BACKGROUND_TIMEOUT,
+    BackgroundStatusReporter,
+    StatusReporter,
+    ThrottledStatusCallback,
+)
+from src.infrastructure.external.system_monitor import SystemMonitor
+from src.infrastructure.external.user_service import BufferedUsageRecorder, UserService
 from src.infrastructure.api.bot_routes import register_bot_routes
+from src.infrastructure.api.compression import install_compression
+from src.infrastructure.api.json_provider import dumps_bytes, install_json_provider
 from src.infrastructure.api.user_routes import register_user_routes
 from src.infrastructure.api.repo_routes import register_repo_routes
 from src.infrastructure.api.status_routes import register_status_routes
+from src.infrastructure.cache import TTLCache
 from src.infrastructure.storage.database import get_client
 
 logging.basicConfig(
@@ -33,6 +57,152 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+_VALID_CONTENT_TYPES = frozenset(("code", "text"))
+
+# Endpoints that never need the caller's auth token
+_TOKENLESS_ENDPOINTS = frozenset(("static_proxy", "serve_upload", "index", "live", "ready", "status_stylesheet"))
+
+# Evaluated once at import; DEBUG_TRACE does not change at runtime
+_DEBUG_TRACE = os.environ.get("DEBUG_TRACE", "").strip().lower() in ("1", "true", "yes")
+
+# Health probe results are cached so monitoring polls don't repeat slow I/O
+_health_cache = TTLCache()
+_LM_STUDIO_PROBE_TTL = 5.0
+_RESOURCES_TTL = 2.0
+_GPU_INFO_TTL = 60.0
+
+# Keywords that mark "text" content as code; one case-insensitive pass, no lowercase copy
+_CODE_HINT_RE = re.compile(r"function|class|def |import |export ", re.IGNORECASE)
+_CODE_HINT_SCAN_CHARS = 64 * 1024  # The opening of a file is enough to spot code
+
+# Uploads are saved under UPLOAD_PATH/<upload_id>/, so /api/generate can read
+# them from disk (in any worker) instead of the client echoing their content back.
+# Batches older than this are rejected, and swept from disk by the upload and
+# generate routes
+_UPLOAD_ID_TTL = 3600.0
+
+# Uploaded files and generated PDFs are immutable once written
+_UPLOAD_DIR = os.fspath(settings.UPLOAD_PATH)
+_UPLOAD_MAX_AGE = 3600
+
+# Runs the independent health probes concurrently on a cache miss
+_health_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="health")
+
+
+# Use /v1/models endpoint (LM Studio supports this)
+_LM_MODELS_URL = f"{settings.LM_STUDIO_BASE_URL.rstrip('/').rstrip('/v1')}/v1/models"
+
+# Keep-alive session so repeated health probes reuse the LM Studio connection
+_lm_session = requests.Session()
+_lm_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_lm_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+def _faiss_importable() -> bool:
+    """Import faiss for real; a wheel that is found but fails to load counts as missing"""
+    try:
+        import faiss  # noqa: F401
+    except Exception as e:
+        # ImportError, or a native load failure such as missing BLAS/AVX support
+        logger.warning(f"FAISS is not usable: {e}")
+        return False
+    return True
+
+
+def _detect_faiss() -> dict:
+    """Detect FAISS availability and recommended backend (fixed for the process lifetime)"""
+    faiss_backend, _ = PlatformDetector.get_faiss_backend()
+    if _faiss_importable():
+        return {
+            "available": True,
+            "backend": "GPU" if faiss_backend == "faiss-gpu" else "CPU",
+            "recommended": faiss_backend,
+        }
+    return {"available": False, "backend": "Not installed", "recommended": faiss_backend}
+
+
+def _load_platform_stats() -> dict:
+    """Sample system resources, rounded once per refresh rather than per request"""
+    resources = SystemMonitor.get_resources()
+    return {
+        "os": resources.platform,
+        "cpu_percent": round(resources.cpu_percent, 1),
+        "memory_percent": round(resources.memory_percent, 1),
+        "memory_used_gb": round(resources.memory_used_gb, 1),
+        "memory_total_gb": round(resources.memory_total_gb, 1),
+        "gpu_available": resources.gpu_available,
+    }
+
+
+def _probe_lm_studio() -> dict:
+    """Probe LM Studio and return its health fields, ready to merge into the payload"""
+    lm_status = "unknown"
+    available_models = []
+    try:
+        response = _lm_session.get(_LM_MODELS_URL, timeout=2, allow_redirects=False)
+        if response.status_code == 200:
+            lm_status = "connected"
+            try:
+                models_data = response.json()
+                available_models = [model.get("id", model.get("name", "unknown")) for model in models_data.get("data", [])]
+            except Exception:
+                pass
+        else:
+            lm_status = "unavailable"
+    except Exception:
+        lm_status = "disconnected"
+    return {
+        "lm_studio": lm_status,
+        "available_models": available_models,
+        "model_loaded": settings.LM_MODEL_NAME in available_models if available_models else None,
+    }
+
+
+def _init_mongodb() -> None:
+    """Connect to MongoDB and create the model indexes"""
+    try:
+        get_client()  # This will test the connection
+        logger.info("MongoDB connection initialized")
+        
+        # Create indexes for MongoDB models
+        from src.infrastructure.storage.bot_model import BotModel
+        from src.infrastructure.storage.chat_message_model import ChatMessageModel
+        from src.infrastructure.storage.generation_checkpoint import CheckpointService
+        BotModel.create_indexes()
+        ChatMessageModel.create_indexes()
+        CheckpointService.create_indexes()
+        logger.info("MongoDB indexes created")
+    except Exception as e:
+        logger.warning(f"MongoDB connection failed: {e}. Bot storage may not work correctly.")
+
+
+class _UploadRequest(Request):
+    """
+    Request that spools zip uploads to /api/upload straight into a temp file.
+    
+    The multipart parser writes the archive to a named file while the body is
+    received, so extraction can open it in place instead of copying it with
+    FileStorage.save() first. Spools go to the private system temp dir, never
+    the served upload dir, and are recorded in spooled_files so the app's
+    teardown handler removes them however the request ends.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.spooled_files = []
+    
+    def spool_file(self):
+        """Create a named temp file that is removed when the request ends"""
+        spool = tempfile.NamedTemporaryFile(mode="w+b", prefix="upload_", suffix=".zip", delete=False)
+        self.spooled_files.append(spool)
+        return spool
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint == "upload" and filename and filename.lower().endswith(".zip"):
+            return self.spool_file()
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+
 def _error_response(message: str, status: int = 500, include_trace: bool = False):
     """Create standardized error response"""
     payload: dict[str, str] = {
@@ -49,19 +219,9 @@ def create_app() -> Flask:
     # Ensure directories exist
     settings.ensure_directories()
     
-    # Initialize MongoDB connection
-    try:
-        get_client()  # This will test the connection
-        logger.info("MongoDB connection initialized")
-        
-        # Create indexes for MongoDB models
-        from src.infrastructure.storage.bot_model import BotModel
-        from src.infrastructure.storage.chat_message_model import ChatMessageModel
-        BotModel.create_indexes()
-        ChatMessageModel.create_indexes()
-        logger.info("MongoDB indexes created")
-    except Exception as e:
-        logger.warning(f"MongoDB connection failed: {e}. Bot storage may not work correctly.")
+    # Connect to MongoDB in the background so a slow or unreachable server
+    # doesn't hold up startup for the driver's server selection timeout
+    threading.Thread(target=_init_mongodb, name="mongodb-warmup", daemon=True).start()
     
     # Initialize services
     llm_client = LMStudioClient()
@@ -69,77 +229,114 @@ def create_app() -> Flask:
     document_service = DocumentService(llm_client, pdf_generator)
     file_service = FileService()
     zip_service = ZipService()
-    status_reporter = StatusReporter(settings.NODE_BACKEND_URL)
+    status_reporter = StatusReporter(settings.NODE_BACKEND_URL, timeout=BACKGROUND_TIMEOUT, retries=0)
+    background_reporter = BackgroundStatusReporter(status_reporter)
     user_service = UserService(settings.NODE_BACKEND_URL)
+    usage_recorder = BufferedUsageRecorder(user_service, settings.USAGE_FLUSH_INTERVAL)
+    
+    # Repo pipeline services for zip uploads, shared across requests
+    github_service = GitHubService()
+    repo_scan_service = RepoScanService(llm_client)
+    rag_index_service = RAGIndexService(settings.LM_STUDIO_BASE_URL)
+    repo_doc_service = RepoDocService(llm_client, pdf_generator, rag_index_service)
+    
+    # FAISS install and CUDA presence don't change while the process runs
+    faiss_info = _detect_faiss()
+    
+    # Health fields that only depend on configuration and the environment;
+    # only serialized, never mutated, so requests can share the nested dicts
+    health_base = {
+        "status": "ok",
+        "model": settings.LM_MODEL_NAME,
+        "max_files": settings.MAX_FILES,
+        "max_repo_files": settings.GITHUB_MAX_REPO_FILES,
+        "max_content_preview": settings.MAX_CONTENT_PREVIEW,
+        "faiss": faiss_info,
+    }
     
     # Create Flask app
-    app = Flask(__name__, static_folder=str(settings.FRONTEND_DIR), static_url_path="")
+    # No built-in static route: its "/<path:filename>" rule shadowed static_proxy,
+    # so unknown paths 404'd instead of falling back to the SPA's index.html
+    app = Flask(__name__, static_folder=None)
+    app.request_class = _UploadRequest
+    # Let a fronting Apache (mod_xsendfile) move file bytes instead of Python
+    app.config["USE_X_SENDFILE"] = settings.USE_X_SENDFILE
     CORS(app)
+    install_json_provider(app)
+    install_compression(app)
+    
+    @app.teardown_request
+    def remove_spooled_uploads(exc):
+        """Close and delete the temp files zip uploads were spooled into"""
+        for spool in getattr(request, "spooled_files", ()):
+            try:
+                spool.close()
+                os.unlink(spool.name)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove spooled upload {spool.name}: {e}")
+    
+    @app.before_request
+    def extract_token():
+        """Parse the Bearer token once per request into g.token"""
+        if request.endpoint in _TOKENLESS_ENDPOINTS:
+            return
+        auth_header = request.headers.get("Authorization")
+        g.token = auth_header[7:] if auth_header and auth_header.startswith("Bearer ") else None
+    
+    def document_response(markdown: str, **fields):
+        """
+        Build the generate success response with the markdown JSON-encoded once.
+        
+        The markdown is sent under both "output" and "docText" (backward
+        compatibility); jsonify would escape the multi-MB string twice.
+        """
+        encoded = dumps_bytes(app.json, markdown)
+        head = dumps_bytes(app.json, dict(fields, success=True))
+        body = head[:-1] + b', "output": ' + encoded + b', "docText": ' + encoded + b"}\n"
+        return app.response_class(body, mimetype="application/json")
+    
+    @app.route("/api/live", methods=["GET"])
+    def live() -> tuple[dict, int]:
+        """Liveness probe: the process is serving requests, no dependency checks"""
+        return {"status": "ok"}, 200
+    
+    @app.route("/api/ready", methods=["GET"])
+    def ready() -> tuple[dict, int]:
+        """Readiness probe: 200 only while LM Studio answers (cached like /api/health)"""
+        lm = _health_cache.get_or_refresh("lm_studio", _probe_lm_studio, _LM_STUDIO_PROBE_TTL)
+        if lm["lm_studio"] == "connected":
+            return {"status": "ready", "lm_studio": lm["lm_studio"]}, 200
+        return {"status": "unavailable", "lm_studio": lm["lm_studio"]}, 503
+    
+    def health_snapshot() -> dict:
+        """Build the /api/health payload; also read directly by the status page"""
+        # Probe LM Studio and system resources concurrently
+        # (GPU info rarely changes, CPU/memory move quickly)
+        # LM Studio can take up to the 2s timeout to answer, so after the first
+        # probe a stale status is served while it refreshes in the background
+        lm_future = _health_executor.submit(
+            _health_cache.get_or_refresh, "lm_studio", _probe_lm_studio, _LM_STUDIO_PROBE_TTL
+        )
+        platform_future = _health_executor.submit(
+            _health_cache.get_or_load, "platform", _load_platform_stats, _RESOURCES_TTL
+        )
+        gpu_future = _health_executor.submit(
+            _health_cache.get_or_load, "gpu_info", PlatformDetector.get_gpu_info, _GPU_INFO_TTL
+        )
+        platform_stats = platform_future.result()
+        gpu_info = gpu_future.result()
+        
+        payload = dict(health_base, platform=dict(platform_stats, gpu_info=gpu_info))
+        payload.update(lm_future.result())
+        return payload
     
     @app.route("/api/health", methods=["GET"])
     def health() -> tuple[dict, int]:
         """Health check endpoint with system information"""
         try:
-            from src.infrastructure.external.platform_detector import PlatformDetector
-            from src.infrastructure.external.system_monitor import SystemMonitor
-            
-            lm_status = "unknown"
-            available_models = []
-            try:
-                # Use /v1/models endpoint (LM Studio supports this)
-                base_url = settings.LM_STUDIO_BASE_URL.rstrip('/').rstrip('/v1')
-                test_url = f"{base_url}/v1/models"
-                response = requests.get(test_url, timeout=2)
-                if response.status_code == 200:
-                    lm_status = "connected"
-                    try:
-                        models_data = response.json()
-                        available_models = [model.get("id", model.get("name", "unknown")) for model in models_data.get("data", [])]
-                    except Exception:
-                        pass
-                else:
-                    lm_status = "unavailable"
-            except Exception:
-                lm_status = "disconnected"
-            
-            # Get system resources
-            resources = SystemMonitor.get_resources()
-            gpu_info = PlatformDetector.get_gpu_info()
-            faiss_backend, _ = PlatformDetector.get_faiss_backend()
-            
-            # Check FAISS availability
-            try:
-                import faiss
-                faiss_available = True
-                faiss_version = "GPU" if faiss_backend == "faiss-gpu" else "CPU"
-            except ImportError:
-                faiss_available = False
-                faiss_version = "Not installed"
-            
-            return {
-                "status": "ok",
-                "model": settings.LM_MODEL_NAME,
-                "lm_studio": lm_status,
-                "available_models": available_models,
-                "model_loaded": settings.LM_MODEL_NAME in available_models if available_models else None,
-                "max_files": settings.MAX_FILES,
-                "max_repo_files": settings.GITHUB_MAX_REPO_FILES,
-                "max_content_preview": settings.MAX_CONTENT_PREVIEW,
-                "platform": {
-                    "os": resources.platform,
-                    "cpu_percent": round(resources.cpu_percent, 1),
-                    "memory_percent": round(resources.memory_percent, 1),
-                    "memory_used_gb": round(resources.memory_used_gb, 1),
-                    "memory_total_gb": round(resources.memory_total_gb, 1),
-                    "gpu_available": resources.gpu_available,
-                    "gpu_info": gpu_info,
-                },
-                "faiss": {
-                    "available": faiss_available,
-                    "backend": faiss_version,
-                    "recommended": faiss_backend,
-                },
-            }, 200
+            return health_snapshot(), 200
         except Exception as exc:
             logger.exception("Health check failed")
             return {"status": "error", "message": str(exc)}, 500
@@ -153,9 +350,12 @@ def create_app() -> Flask:
                 logger.error("Upload failed: missing file part")
                 return jsonify({"error": "No file part"}), 400
             
-            # Check if any file is a zip
-            zip_files = [f for f in files if f.filename and f.filename.lower().endswith('.zip')]
-            regular_files = [f for f in files if f.filename and not f.filename.lower().endswith('.zip')]
+            # Split zips from regular files in one pass, lowercasing only the suffix
+            zip_files = []
+            regular_files = []
+            for f in files:
+                if f.filename:
+                    (zip_files if f.filename[-4:].lower() == ".zip" else regular_files).append(f)
             
             # Handle zip file upload
             if zip_files:
@@ -166,68 +366,84 @@ def create_app() -> Flask:
                     return jsonify({"error": "Cannot mix zip files with regular files. Upload zip separately or regular files separately."}), 400
                 
                 zip_file = zip_files[0]
-                # Save zip file temporarily
                 safe_name = secure_filename(zip_file.filename)
-                zip_path = settings.UPLOAD_PATH / safe_name
-                zip_file.save(zip_path)
+                # Spooled files are removed by remove_spooled_uploads once the request ends
+                if zip_file.stream in request.spooled_files:
+                    # Already received into a temp file by _UploadRequest
+                    zip_file.stream.flush()
+                    zip_path = Path(zip_file.stream.name)
+                else:
+                    spool = request.spool_file()
+                    zip_file.save(spool, buffer_size=settings.UPLOAD_WRITE_BUFFER_SIZE)
+                    spool.flush()
+                    zip_path = Path(spool.name)
+                
+                # Extract and process zip
+                zip_result = zip_service.extract_zip(zip_path)
+                
+                # Convert to repo format; /api/generate consumes repo_files directly,
+                # so the files are not duplicated into a combined "content" string
+                repo_files = zip_service.convert_to_repo_format(zip_result)
+                
+                logger.info(
+                    f"Zip extraction successful | files={zip_result.total_files} | "
+                    f"content_length={zip_result.total_chars} | skipped={len(zip_result.skipped_files)}"
+                )
+                
+                return jsonify({
+                    "filename": safe_name,
+                    "filenames": [f["path"] for f in repo_files],
+                    "file_count": zip_result.total_files,
+                    "content_type": "code",  # Zip files are typically code projects
+                    "skipped": zip_result.skipped_files[:50],  # Limit response size
+                    "warnings": zip_result.warnings,
+                    "is_zip": True,
+                    "repo_files": repo_files,  # Include structured file data for RAG pipeline
+                })
                 
-                try:
-                    # Extract and process zip
-                    zip_result = zip_service.extract_zip(zip_path)
-                    
-                    # Convert to repo format
-                    repo_files = zip_service.convert_to_repo_format(zip_result)
-                    
-                    # Combine content for backward compatibility
-                    combined_content = "\n\n".join([
-                        f"FILE: {f['path']}\n{f['content']}"
-                        for f in repo_files
-                    ])
-                    
-                    logger.info(
-                        f"Zip extraction successful | files={zip_result.total_files} | "
-                        f"content_length={zip_result.total_chars} | skipped={len(zip_result.skipped_files)}"
-                    )
-                    
-                    return jsonify({
-                        "filename": safe_name,
-                        "filenames": [f["path"] for f in repo_files],
-                        "file_count": zip_result.total_files,
-                        "content": combined_content,
-                        "content_type": "code",  # Zip files are typically code projects
-                        "skipped": zip_result.skipped_files[:50],  # Limit response size
-                        "warnings": zip_result.warnings,
-                        "is_zip": True,
-                        "repo_files": repo_files,  # Include structured file data for RAG pipeline
-                    })
-                finally:
-                    # Clean up zip file
-                    try:
-                        zip_path.unlink()
-                    except Exception:
-                        pass
-            
             # Handle regular file uploads (existing logic)
-            saved_uploads, skipped = file_service.save_uploaded_files(regular_files)
-            
-            # Combine content - read FULL files
-            combined_content = file_service.combine_file_contents(saved_uploads)
+            file_service.maybe_remove_expired_uploads(_UPLOAD_ID_TTL)
+            upload_id = uuid.uuid4().hex
+            saved_uploads, skipped = file_service.save_uploaded_files(regular_files, upload_id)
             content_type = file_service.get_batch_content_type(saved_uploads)
             
+            filenames = [upload.filename for upload in saved_uploads]
+            response_data = {
+                "filename": ", ".join(filenames),
+                "filenames": filenames,
+                "file_count": len(filenames),
+                "content_type": content_type,
+                "total_bytes": sum(upload.file_path.stat().st_size for upload in saved_uploads),
+                "upload_id": upload_id,
+                "skipped": skipped,
+                "is_zip": False,
+            }
+            
+            # ?combine=0 skips reading the files back; /api/generate then
+            # combines them from disk using "upload_id"
+            if request.args.get("combine", "1") == "0":
+                logger.info(f"Upload successful | files={len(saved_uploads)} | type={content_type} | combine=0")
+                return jsonify(response_data)
+            
+            # Read every file before the status line goes out, so a read failure
+            # still becomes an error response instead of a truncated 200
+            pieces = list(file_service.iter_file_contents(saved_uploads))
             logger.info(
                 f"Upload successful | files={len(saved_uploads)} | "
-                f"content_length={len(combined_content)} | type={content_type}"
+                f"content_length={sum(map(len, pieces))} | type={content_type}"
             )
             
-            return jsonify({
-                "filename": ", ".join(upload.filename for upload in saved_uploads),
-                "filenames": [upload.filename for upload in saved_uploads],
-                "file_count": len(saved_uploads),
-                "content": combined_content,
-                "content_type": content_type,
-                "skipped": skipped,
-                "is_zip": False,
-            })
+            # Stream the FULL file contents into the "content" field piece by piece
+            # rather than building the combined string and its JSON-escaped copy.
+            # Streamed bodies are not gzipped by compress_response.
+            def stream_upload_body():
+                head = app.json.dumps(response_data)
+                yield head[:-1] + ', "content": "'
+                for piece in pieces:
+                    yield app.json.dumps(piece)[1:-1]
+                yield '"}\n'
+            
+            return app.response_class(stream_upload_body(), mimetype="application/json")
         except ValidationError as e:
             logger.warning(f"Validation error: {e}")
             return jsonify({"error": str(e)}), 400
@@ -236,15 +452,23 @@ def create_app() -> Flask:
             return jsonify({"error": str(e)}), 500
         except Exception as e:
             logger.exception("Upload failed")
-            include_trace = bool(os.environ.get("DEBUG_TRACE", "").lower() in {"1", "true", "yes"})
-            return _error_response(str(e), status=500, include_trace=include_trace)
+            return _error_response(str(e), status=500, include_trace=_DEBUG_TRACE)
     
     @app.route("/api/generate", methods=["POST"])
     def generate():
         """Generate documentation from uploaded files or zip archives"""
+        token = g.token
         try:
-            data = request.get_json(silent=True) or {}
-            raw_content: str = (data.get("rawContent") or "").strip()
+            # Parsed by the app JSON provider (orjson when installed); cache=False
+            # releases the raw body bytes instead of keeping them for the request
+            data = request.get_json(silent=True, cache=False)
+            if not isinstance(data, dict):
+                data = {}
+            # No strip() copy of multi-MB content: isspace() stops at the first
+            # non-blank character, and DocumentService trims the text itself
+            raw_content: str = data.get("rawContent") or ""
+            if raw_content.isspace():
+                raw_content = ""
             content_type_str: str = (data.get("contentType") or "").strip()
             title: Optional[str] = (data.get("title") or "").strip() or None
             file_count = data.get("file_count")
@@ -253,27 +477,6 @@ def create_app() -> Flask:
             
             # Handle zip file uploads - use RAG pipeline like GitHub repos
             if is_zip and repo_files:
-                # Import repo services here to avoid circular imports
-                from src.application.services.github_service import GitHubService
-                from src.application.services.rag_index_service import RAGIndexService
-                from src.application.services.repo_doc_service import RepoDocService
-                from src.application.services.repo_orchestrator_service import RepoOrchestratorService
-                from src.application.services.repo_scan_service import RepoScanService
-                
-                github_service = GitHubService()
-                repo_scan_service = RepoScanService(llm_client)
-                rag_index_service = RAGIndexService(settings.LM_STUDIO_BASE_URL)
-                repo_doc_service = RepoDocService(llm_client, pdf_generator, rag_index_service)
-                
-                # Get auth token
-                token = None
-                try:
-                    auth_header = request.headers.get('Authorization', '')
-                    if auth_header.startswith('Bearer '):
-                        token = auth_header.split(' ', 1)[1]
-                except Exception:
-                    pass
-                
                 # Check usage limit
                 if token:
                     can_proceed, usage_info, error_msg = user_service.check_usage_limit(token, "codeToDoc")
@@ -283,7 +486,7 @@ def create_app() -> Flask:
                 
                 # Create status callback
                 def zip_status_callback(**kwargs):
-                    status_reporter.report_progress(
+                    background_reporter.report_progress(
                         status=kwargs.get('status', 'pending'),
                         progress=kwargs.get('progress', 0),
                         current_step=kwargs.get('current_step', ''),
@@ -293,13 +496,7 @@ def create_app() -> Flask:
                         total_steps=kwargs.get('total_steps', 0),
                         completed_steps=kwargs.get('completed_steps', 0)
                     )
-                    if kwargs.get('status') == 'completed':
-                        status_reporter.report_completion(
-                            markdown=kwargs.get('markdown', ''),
-                            pdf_url=kwargs.get('pdf_url'),
-                            pdf_info=kwargs.get('pdf_info'),
-                            token=token
-                        )
+                    # The completion itself (with markdown) is reported once, after generation returns
                 
                 # Create orchestrator for zip files
                 zip_orchestrator = RepoOrchestratorService(
@@ -309,11 +506,10 @@ def create_app() -> Flask:
                     repo_scan_service=repo_scan_service,
                     rag_index_service=rag_index_service,
                     repo_doc_service=repo_doc_service,
-                    status_callback=zip_status_callback
+                    status_callback=ThrottledStatusCallback(zip_status_callback)
                 )
                 
                 # Generate repo_id for zip
-                import time
                 zip_repo_id = f"zip_upload_{int(time.time())}"
                 
                 # Generate documentation using RAG pipeline
@@ -328,51 +524,57 @@ def create_app() -> Flask:
                     
                     logger.info(f"Zip documentation generated successfully | repo_id={zip_repo_id} | output_length={len(result.get('markdown', ''))}")
                     
-                    # Ensure completion status is reported
+                    # The one completion report for this generation
                     try:
                         if result.get("markdown"):
-                            status_reporter.report_completion(
+                            background_reporter.report_completion(
+                                context=f"repo_id={zip_repo_id}",
                                 markdown=result["markdown"],
                                 pdf_url=result.get("pdf_url"),
                                 pdf_info={"filename": Path(result["pdf_path"]).name} if result.get("pdf_path") else None,
                                 token=token
                             )
-                            logger.info("Completion status confirmed for zip generation")
+                            logger.info("Completion status queued for zip generation")
                     except Exception as status_err:
                         logger.warning(f"Failed to confirm completion status (non-critical): {status_err}")
                     
-                    # Increment usage
-                    if token:
-                        user_service.increment_usage(token, "codeToDoc", 1)
+                    # Increment usage (sent with the next batched flush)
+                    usage_recorder.increment(token, "codeToDoc", 1)
                     
-                    return jsonify({
-                        "success": True,
-                        "output": result["markdown"],
-                        "docText": result["markdown"],
-                        "pdfFilename": Path(result["pdf_path"]).name if result["pdf_path"] else None,
-                        "pdfPath": result["pdf_url"],
-                        "pdfUrl": result["pdf_url"],
-                        "chapters": result.get("chapters", []),
-                        "content_type": "code",
-                        "file_count": len(repo_files),
-                    }), 200
+                    return document_response(
+                        result["markdown"],
+                        pdfFilename=Path(result["pdf_path"]).name if result["pdf_path"] else None,
+                        pdfPath=result["pdf_url"],
+                        pdfUrl=result["pdf_url"],
+                        chapters=result.get("chapters", []),
+                        content_type="code",
+                        file_count=len(repo_files),
+                    ), 200
                 except Exception as zip_error:
                     logger.error(f"Zip generation failed: {zip_error}", exc_info=True)
                     error_msg = f"Zip generation failed: {str(zip_error)}"
                     # Report error with better message
                     try:
-                        status_reporter.report_error(
+                        background_reporter.report_error(
                             error_message=error_msg,
                             error_code="ZIP_GENERATION_ERROR",
                             token=token
                         )
-                        logger.info("Zip generation error status reported to Node backend")
+                        logger.info("Zip generation error status queued for Node backend")
                     except Exception as status_err:
                         logger.warning(f"Failed to report zip error status (non-critical): {status_err}")
                     raise RuntimeError(error_msg)
             
+            # Uploads made with ?combine=0 are referenced by their upload_id
+            upload_id = data.get("upload_id")
+            if not raw_content and upload_id:
+                file_service.maybe_remove_expired_uploads(_UPLOAD_ID_TTL)
+                saved_uploads = file_service.load_saved_uploads(upload_id, max_age=_UPLOAD_ID_TTL)
+                raw_content = file_service.combine_file_contents(saved_uploads)
+                file_count = file_count or len(saved_uploads)
+            
             # Validate input - only allow file uploads, no direct text
-            if not raw_content:
+            if not raw_content or raw_content.isspace():
                 error_msg = "No content provided. Please upload files or use GitHub repo mode."
                 logger.warning(error_msg)
                 return jsonify({"success": False, "error": error_msg}), 400
@@ -384,7 +586,7 @@ def create_app() -> Flask:
                 return jsonify({"success": False, "error": error_msg}), 400
             
             # Validate content type
-            if content_type_str not in {"code", "text"}:
+            if content_type_str not in _VALID_CONTENT_TYPES:
                 error_msg = "contentType must be 'code' or 'text'"
                 logger.warning(error_msg)
                 return jsonify({"success": False, "error": error_msg}), 400
@@ -392,19 +594,10 @@ def create_app() -> Flask:
             content_type: ContentType = content_type_str  # type: ignore
             
             # Auto-detect content type if ambiguous
-            if content_type == "text" and any(keyword in raw_content.lower() for keyword in ["function", "class", "def ", "import ", "export "]):
+            if content_type == "text" and _CODE_HINT_RE.search(raw_content, 0, _CODE_HINT_SCAN_CHARS):
                 logger.info("Auto-detected code content, switching content_type")
                 content_type = "code"
             
-            # Get auth token from request headers
-            token = None
-            try:
-                auth_header = request.headers.get('Authorization', '')
-                if auth_header.startswith('Bearer '):
-                    token = auth_header.split(' ', 1)[1]
-            except Exception:
-                pass
-            
             # Check usage limit before generating
             if token:
                 can_proceed, usage_info, error_msg = user_service.check_usage_limit(token, "codeToDoc")
@@ -413,7 +606,7 @@ def create_app() -> Flask:
                     return jsonify({"error": error_msg}), 403
             
             # Report initial status
-            status_reporter.report_progress(
+            background_reporter.report_progress(
                 status="pending",
                 progress=0,
                 current_step="Starting generation...",
@@ -431,7 +624,7 @@ def create_app() -> Flask:
             )
             
             # Report generating status
-            status_reporter.report_progress(
+            background_reporter.report_progress(
                 status="generating",
                 progress=30,
                 current_step="Generating documentation from files...",
@@ -449,12 +642,12 @@ def create_app() -> Flask:
                 error_msg = f"Document generation failed: {str(gen_error)}"
                 # Report error before re-raising
                 try:
-                    status_reporter.report_error(
+                    background_reporter.report_error(
                         error_message=error_msg,
                         error_code="GENERATION_ERROR",
                         token=token
                     )
-                    logger.info("Generation error status reported to Node backend")
+                    logger.info("Generation error status queued for Node backend")
                 except Exception as status_err:
                     logger.warning(f"Failed to report generation error status (non-critical): {status_err}")
                 raise RuntimeError(error_msg)
@@ -466,69 +659,49 @@ def create_app() -> Flask:
                 user_error_msg = "Generated documentation is incomplete or empty. Please try again."
                 # Report error
                 try:
-                    status_reporter.report_error(
+                    background_reporter.report_error(
                         error_message=user_error_msg,
                         error_code="INCOMPLETE_OUTPUT",
                         token=token
                     )
-                    logger.info("Incomplete output error status reported to Node backend")
+                    logger.info("Incomplete output error status queued for Node backend")
                 except Exception as status_err:
                     logger.warning(f"Failed to report incomplete output error status (non-critical): {status_err}")
                 raise RuntimeError(user_error_msg)
             
             logger.info(f"Document generation successful | output_length={len(result.markdown_content)} | pdf={bool(result.pdf_path)}")
             
-            # Report completion (CRITICAL - must complete)
-            # Retry if it fails since completion status is important
-            completion_reported = False
-            for attempt in range(3):
-                try:
-                    if status_reporter.report_completion(
-                        markdown=result.markdown_content,
-                        pdf_url=result.pdf_url,
-                        pdf_info={"filename": result.pdf_path.name} if result.pdf_path else None,
-                        token=token
-                    ):
-                        logger.info("Completion status reported successfully")
-                        completion_reported = True
-                        break
-                    else:
-                        logger.warning(f"Completion status report returned False (attempt {attempt + 1}/3)")
-                except Exception as status_err:
-                    logger.warning(f"Failed to report completion status (attempt {attempt + 1}/3): {status_err}")
-                    if attempt < 2:
-                        import time
-                        time.sleep(0.5)  # Brief delay before retry
-            
-            if not completion_reported:
-                logger.error("Failed to report completion status after all retries - this may cause frontend polling issues")
-                # Don't fail the request if status reporting fails, but log the error
+            # Report completion in the background; the reporter retries it itself
+            background_reporter.report_completion(
+                context="file upload",
+                markdown=result.markdown_content,
+                pdf_url=result.pdf_url,
+                pdf_info={"filename": result.pdf_path.name} if result.pdf_path else None,
+                token=token
+            )
             
-            # Increment usage after successful generation
-            if token:
-                user_service.increment_usage(token, "codeToDoc", 1)
+            # Increment usage after successful generation (sent with the next batched flush)
+            usage_recorder.increment(token, "codeToDoc", 1)
             
-            return jsonify({
-                "success": True,
-                "output": result.markdown_content,
-                "docText": result.markdown_content,  # Backward compatibility
-                "pdfFilename": result.pdf_path.name if result.pdf_path else None,
-                "pdfPath": result.pdf_url,
-                "pdfUrl": result.pdf_url,
-                "content_type": result.content_type,
-                "file_count": result.file_count,
-            }), 200
+            return document_response(
+                result.markdown_content,
+                pdfFilename=result.pdf_path.name if result.pdf_path else None,
+                pdfPath=result.pdf_url,
+                pdfUrl=result.pdf_url,
+                content_type=result.content_type,
+                file_count=result.file_count,
+            ), 200
         except ValidationError as e:
             logger.warning(f"Validation error: {e}", exc_info=True)
             error_msg = f"Validation error: {str(e)}"
             # Report error status with better error message
             try:
-                status_reporter.report_error(
+                background_reporter.report_error(
                     error_message=error_msg,
                     error_code="VALIDATION_ERROR",
                     token=token
                 )
-                logger.info("Validation error status reported to Node backend")
+                logger.info("Validation error status queued for Node backend")
             except Exception as status_err:
                 logger.warning(f"Failed to report validation error status (non-critical): {status_err}")
             return jsonify({"success": False, "error": error_msg}), 400
@@ -537,50 +710,82 @@ def create_app() -> Flask:
             error_msg = f"Generation error: {str(e)}"
             # Report error status
             try:
-                status_reporter.report_error(
+                background_reporter.report_error(
                     error_message=error_msg,
                     error_code="RUNTIME_ERROR",
                     token=token
                 )
-                logger.info("Runtime error status reported to Node backend")
+                logger.info("Runtime error status queued for Node backend")
             except Exception as status_err:
                 logger.warning(f"Failed to report runtime error status (non-critical): {status_err}")
             return jsonify({"success": False, "error": error_msg}), 500
         except Exception as e:
             logger.exception("Document generation failed")
-            include_trace = bool(os.environ.get("DEBUG_TRACE", "").lower() in {"1", "true", "yes"})
             error_msg = f"Internal server error: {str(e)}"
-            if include_trace:
+            if _DEBUG_TRACE:
                 error_msg += f"\n{traceback.format_exc()}"
             # Report error status
             try:
-                status_reporter.report_error(
+                background_reporter.report_error(
                     error_message=error_msg,
                     error_code="INTERNAL_ERROR",
                     token=token
                 )
-                logger.info("Internal error status reported to Node backend")
+                logger.info("Internal error status queued for Node backend")
             except Exception as status_err:
                 logger.warning(f"Failed to report internal error status (non-critical): {status_err}")
-            return _error_response(error_msg, 500, include_trace)
+            return _error_response(error_msg, 500, _DEBUG_TRACE)
     
     # Register API routes BEFORE static routes to ensure proper matching
     logger.info("Registering bot, user, and repo API routes...")
     register_bot_routes(app)
     register_user_routes(app)
-    register_repo_routes(app)
-    register_status_routes(app)
+    register_repo_routes(
+        app,
+        llm_client=llm_client,
+        pdf_generator=pdf_generator,
+        github_service=github_service,
+        repo_scan_service=repo_scan_service,
+        rag_index_service=rag_index_service,
+        repo_doc_service=repo_doc_service,
+        background_reporter=background_reporter,
+        user_service=user_service,
+    )
+    register_status_routes(app, health_snapshot=health_snapshot)
     logger.info("API routes registered successfully")
     
     @app.route("/uploads/<path:filename>", methods=["GET"])
     def serve_upload(filename: str):
         """Serve uploaded files"""
-        return send_from_directory(str(settings.UPLOAD_PATH), filename, as_attachment=False)
+        if settings.X_ACCEL_UPLOADS_PREFIX:
+            # Hand the transfer to nginx's internal location; it serves the file via sendfile(2)
+            if safe_join(_UPLOAD_DIR, filename) is None:
+                return jsonify({"error": "Not found"}), 404
+            response = app.response_class()
+            response.headers["X-Accel-Redirect"] = f"{settings.X_ACCEL_UPLOADS_PREFIX.rstrip('/')}/{quote(filename)}"
+            response.headers["Cache-Control"] = f"public, max-age={_UPLOAD_MAX_AGE}"
+            del response.headers["Content-Type"]
+            return response
+        return send_from_directory(
+            _UPLOAD_DIR,
+            filename,
+            as_attachment=False,
+            conditional=True,
+            max_age=_UPLOAD_MAX_AGE,
+        )
+    
+    # The frontend build is fixed while the server runs, so list its files once.
+    # Only listed paths are served, which also rules out ".." traversal without
+    # a filesystem lookup per request.
+    static_root = settings.FRONTEND_DIR
+    static_files = frozenset(
+        p.relative_to(static_root).as_posix() for p in static_root.rglob("*") if p.is_file()
+    ) if static_root.is_dir() else frozenset()
     
     @app.route("/")
     def index():
         """Serve frontend index"""
-        return send_from_directory(app.static_folder, "index.html")
+        return send_from_directory(static_root, "index.html")
     
     @app.route("/<path:path>")
     def static_proxy(path: str):
@@ -589,10 +794,9 @@ def create_app() -> Flask:
         if path.startswith("api/") or path == "status.recallai":
             return jsonify({"error": "Route not found"}), 404
         
-        target = Path(app.static_folder) / path
-        if target.exists():
-            return send_from_directory(app.static_folder, path)
-        return send_from_directory(app.static_folder, "index.html")
+        if path in static_files:
+            return send_from_directory(static_root, path)
+        return send_from_directory(static_root, "index.html")
     
     return app
 
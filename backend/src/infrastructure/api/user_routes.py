@@ -2,6 +2,8 @@
 
 import json
 import logging
+import os
+import tempfile
 from pathlib import Path
 from datetime import datetime, date
 
@@ -15,6 +17,9 @@ logger = logging.getLogger(__name__)
 USER_DATA_DIR = Path(settings.BASE_DIR) / "data" / "users"
 USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Mode for newly created user files (mkstemp creates them 0600)
+_USER_FILE_MODE = 0o644
+
 
 def get_user_file(user_id: str = "default") -> Path:
     """Get user data file path"""
@@ -50,8 +55,23 @@ def save_user_data(user_id: str, data: dict) -> None:
     """Save user data to storage"""
     user_file = get_user_file(user_id)
     try:
-        with open(user_file, "w") as f:
-            json.dump(data, f, indent=2)
+        # Encode first so the file gets one write() rather than one per token,
+        # then swap it in so readers never see a partial file
+        payload = json.dumps(data, indent=2)
+        try:
+            mode = user_file.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = _USER_FILE_MODE
+        fd, tmp_path = tempfile.mkstemp(dir=USER_DATA_DIR, prefix=f".{user_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                if hasattr(os, "fchmod"):  # Not available on Windows
+                    os.fchmod(f.fileno(), mode)
+                f.write(payload)
+            os.replace(tmp_path, user_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
     except Exception as e:
         logger.error(f"Failed to save user data: {e}")
         raise
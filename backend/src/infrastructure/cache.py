@@ -0,0 +1,118 @@
+"""In-process TTL cache for slow probes and lookups"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Thread-safe cache whose entries expire after a per-call TTL.
+
+    Concurrent misses for the same key are coalesced: one thread runs the
+    loader while the others wait for its result instead of repeating the
+    slow call.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _lock_for(self, key: Hashable) -> threading.Lock:
+        """Get the per-key lock used to coalesce refreshes"""
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value if present and not expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] > time.monotonic():
+            return entry[1]
+        # Expired entries are left for set()/get_or_load() to overwrite and
+        # prune() to drop; popping here could discard a concurrent refresh
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds"""
+        entry = (time.monotonic() + ttl, value)
+        with self._guard:
+            self._entries[key] = entry
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: float) -> Any:
+        """
+        Return the cached value, calling ``loader`` to refresh it when expired.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable producing the fresh value
+            ttl: Seconds the loaded value stays valid
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        with self._lock_for(key):
+            # Another thread may have refreshed the entry while we waited
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            value = loader()
+            self.set(key, value, ttl)
+            return value
+
+    def get_or_refresh(self, key: Hashable, loader: Callable[[], Any], ttl: float) -> Any:
+        """
+        Return the cached value, refreshing an expired one in the background.
+        
+        An expired value is returned immediately while a daemon thread reloads
+        it, so callers never wait on a slow loader once the key has been loaded.
+        Only the very first load for a key runs inline.
+        
+        Args:
+            key: Cache key
+            loader: Zero-argument callable producing the fresh value
+            ttl: Seconds the loaded value stays valid
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return self.get_or_load(key, loader, ttl)
+        if entry[0] > time.monotonic():
+            return entry[1]
+        
+        lock = self._lock_for(key)
+        if lock.acquire(blocking=False):
+            def refresh():
+                try:
+                    self.set(key, loader(), ttl)
+                except Exception:
+                    logger.warning(f"Background refresh failed for {key!r}", exc_info=True)
+                finally:
+                    lock.release()
+            
+            threading.Thread(target=refresh, daemon=True).start()
+        return entry[1]
+    
+    def prune(self) -> None:
+        """Drop every expired entry"""
+        now = time.monotonic()
+        with self._guard:
+            expired = [key for key, entry in self._entries.items() if entry[0] <= now]
+            for key in expired:
+                del self._entries[key]
+    
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when no key is given"""
+        with self._guard:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -12,84 +12,225 @@ from src.domain.models import ContentType
 logger = logging.getLogger(__name__)
 
 
+# The prompt text is fixed; only the title, file count, structure hints and
+# the content itself vary per request, so everything else is built at import
+_BASE_RULES = (
+    "You are Recall AI Documentation Engine - an expert technical writer and code analyst.\n"
+    "You convert source material into PROFESSIONAL, COMPREHENSIVE, and STRUCTURED documentation.\n\n"
+    "STRICT RULES:\n"
+    "- Output MUST be valid markdown\n"
+    "- Use clear hierarchical structure with numbered sections\n"
+    "- Be thorough but concise\n"
+    "- Do NOT invent or assume anything not in the source\n"
+    "- Only document what actually exists\n"
+    "- Use code blocks for code examples\n"
+    "- Include practical examples where relevant\n"
+    "- No conversational tone - be professional and direct\n"
+    "- No emojis or decorative elements\n"
+    "- No meta commentary about the documentation process\n"
+    "- CRITICAL: Output ONLY the final documentation content\n"
+    "- Do NOT include your thinking process, reasoning steps, or internal analysis\n"
+    "- Do NOT include phrases like 'Okay, I need to...', 'Let me...', 'First, looking at...', 'Wait, the user...', etc.\n"
+    "- Start directly with the documentation title/heading - no preamble\n"
+    "- Output should be clean, publication-ready documentation\n"
+)
+
+_CODE_SYSTEM_PROMPT = _BASE_RULES + (
+    "\nDOCUMENT MODE: CODE → DOCUMENTATION\n"
+    "Your task is to analyze code and create comprehensive technical documentation.\n\n"
+    "ANALYSIS APPROACH:\n"
+    "1. Identify the overall purpose and architecture\n"
+    "2. Document all modules, classes, and functions with:\n"
+    "   - Clear descriptions of purpose\n"
+    "   - Parameters and return types\n"
+    "   - Dependencies and relationships\n"
+    "   - Usage examples where helpful\n"
+    "3. Identify patterns, design decisions, and architecture\n"
+    "4. Note error handling, edge cases, and potential issues\n"
+    "5. Provide insights on code quality and improvements\n\n"
+    "OUTPUT STRUCTURE:\n"
+    "- Start with a clear title and overview\n"
+    "- Include architecture/design section\n"
+    "- Document all major components systematically\n"
+    "- Include usage examples and best practices\n"
+    "- Note any limitations or considerations\n"
+)
+
+_TEXT_SYSTEM_PROMPT = _BASE_RULES + (
+    "\nDOCUMENT MODE: TEXT/DATA → DOCUMENTATION\n"
+    "Your task is to transform text or data content into well-structured documentation.\n\n"
+    "PROCESSING APPROACH:\n"
+    "1. Identify content type (text, JSON, database records, configuration, etc.)\n"
+    "2. For data structures: analyze schema, fields, relationships, and patterns\n"
+    "3. For text: identify main themes and concepts\n"
+    "4. Organize information hierarchically\n"
+    "5. Create clear sections with logical flow\n"
+    "6. Extract key insights and conclusions\n"
+    "7. Maintain original meaning while improving clarity\n\n"
+    "OUTPUT STRUCTURE:\n"
+    "- Clear title and executive summary\n"
+    "- For data: schema documentation with field descriptions\n"
+    "- For text: organized sections with headings\n"
+    "- Key points highlighted\n"
+    "- Conclusions and takeaways\n"
+    "- Use tables for structured data when appropriate\n"
+)
+
+_CODE_USER_INSTRUCTIONS = (
+    "CONTENT_TYPE: Code\n\n"
+    "Analyze the following code and generate comprehensive technical documentation.\n"
+    "IMPORTANT: Output ONLY the final documentation. Do NOT include your thinking process, reasoning steps, or any meta-commentary.\n"
+    "Start directly with the documentation title/heading. Do NOT include text like 'Okay, I need to...', 'Let me...', 'First, looking at...', etc.\n\n"
+    "REQUIRED DOCUMENTATION STRUCTURE:\n\n"
+    "1. **Title** (use provided title or generate appropriate one)\n"
+    "2. **Table of Contents** (auto-generated, numbered)\n"
+    "3. **Overview**\n"
+    "   - Purpose and scope\n"
+    "   - High-level description\n"
+    "   - Key technologies/frameworks used\n\n"
+    "4. **Architecture & Design**\n"
+    "   - Overall structure\n"
+    "   - Design patterns used\n"
+    "   - Component relationships\n"
+    "   - Data flow (if applicable)\n\n"
+    "5. **Components & Modules**\n"
+    "   - Document each major component:\n"
+    "     * Classes: purpose, properties, methods\n"
+    "     * Functions: parameters, return values, behavior\n"
+    "     * Modules: responsibilities and exports\n"
+    "   - Include code examples where helpful\n"
+    "   - Note dependencies between components\n\n"
+    "6. **Usage & Examples**\n"
+    "   - How to use the code\n"
+    "   - Practical examples\n"
+    "   - Common use cases\n\n"
+    "7. **Technical Details**\n"
+    "   - Error handling approach\n"
+    "   - Edge cases and considerations\n"
+    "   - Performance characteristics (if relevant)\n\n"
+    "8. **Summary & Notes**\n"
+    "   - Key takeaways\n"
+    "   - Potential improvements\n"
+    "   - Important considerations\n\n"
+    "FORMATTING:\n"
+    "- Use proper markdown syntax\n"
+    "- Code blocks with language tags\n"
+    "- Clear headings hierarchy (#, ##, ###)\n"
+    "- Bullet points for lists\n"
+    "- Bold for emphasis\n\n"
+    "SOURCE CODE:\n"
+    "============\n"
+)
+
+_DATA_USER_INSTRUCTIONS = (
+    "CONTENT_TYPE: Data/JSON Documentation\n\n"
+    "Analyze the following data structure and generate comprehensive documentation.\n"
+    "CRITICAL: Output ONLY the final documentation. Do NOT include your thinking process, reasoning steps, or any meta-commentary.\n"
+    "Start directly with the documentation title/heading. Do NOT include phrases like 'Okay, I need to...', 'Let me...', 'First, looking at...', 'Wait, the user...', etc.\n\n"
+    "REQUIRED DOCUMENTATION STRUCTURE:\n\n"
+    "1. **Title** (use provided title or generate descriptive title like 'User Data Schema Documentation')\n"
+    "2. **Table of Contents** (auto-generated)\n"
+    "3. **Overview**\n"
+    "   - Purpose of the data structure\n"
+    "   - Type of data (database records, configuration, API response, etc.)\n"
+    "   - Scope and context\n\n"
+    "4. **Data Schema**\n"
+    "   - Document each field with:\n"
+    "     * Field name and type\n"
+    "     * Purpose and description\n"
+    "     * Constraints or validation rules\n"
+    "     * Example values\n"
+    "   - Required vs optional fields\n"
+    "   - Relationships between fields\n\n"
+    "5. **Data Structure Analysis**\n"
+    "   - Overall structure pattern\n"
+    "   - Nested objects or arrays\n"
+    "   - Special fields (IDs, timestamps, references)\n"
+    "   - Data types and formats\n\n"
+    "6. **Usage & Examples**\n"
+    "   - How the data is used\n"
+    "   - Example records with explanations\n"
+    "   - Common operations\n\n"
+    "7. **Technical Details**\n"
+    "   - Database/collection information (if applicable)\n"
+    "   - Indexing considerations\n"
+    "   - Data validation rules\n"
+    "   - Security considerations (especially for sensitive fields)\n\n"
+    "8. **Summary**\n"
+    "   - Key insights about the data structure\n"
+    "   - Important notes\n"
+    "   - Recommendations\n\n"
+    "FORMATTING:\n"
+    "- Use proper markdown syntax\n"
+    "- Code blocks with 'json' language tag for examples\n"
+    "- Tables for field documentation\n"
+    "- Clear headings hierarchy\n"
+    "- Bold for field names and important terms\n\n"
+    "SOURCE DATA:\n"
+    "============\n"
+)
+
+_TEXT_USER_INSTRUCTIONS = (
+    "CONTENT_TYPE: Text\n\n"
+    "Transform the following text content into well-structured documentation.\n"
+    "CRITICAL: Output ONLY the final documentation. Do NOT include your thinking process, reasoning, or any meta-commentary.\n"
+    "Start directly with the documentation title/heading. Do NOT include phrases like 'Okay, I need to...', 'Let me...', 'First, looking at...', etc.\n\n"
+    "REQUIRED DOCUMENTATION STRUCTURE:\n\n"
+    "1. **Title** (use provided title or generate from content)\n"
+    "2. **Table of Contents** (auto-generated)\n"
+    "3. **Executive Summary**\n"
+    "   - Main purpose and scope\n"
+    "   - Key points overview\n\n"
+    "4. **Main Content**\n"
+    "   - Organize into logical sections\n"
+    "   - Use clear headings\n"
+    "   - Maintain original meaning\n"
+    "   - Improve clarity and flow\n\n"
+    "5. **Key Concepts**\n"
+    "   - Important ideas highlighted\n"
+    "   - Relationships between concepts\n"
+    "   - Supporting details\n\n"
+    "6. **Insights & Analysis**\n"
+    "   - Patterns identified\n"
+    "   - Important conclusions\n"
+    "   - Practical implications\n\n"
+    "7. **Summary**\n"
+    "   - Main takeaways\n"
+    "   - Action items (if applicable)\n"
+    "   - Related topics\n\n"
+    "FORMATTING:\n"
+    "- Use proper markdown syntax\n"
+    "- Clear headings hierarchy\n"
+    "- Bullet points for lists\n"
+    "- Bold for key terms\n"
+    "- Code blocks for technical terms if needed\n\n"
+    "SOURCE TEXT:\n"
+    "============\n"
+)
+
+
+# Substrings that mark each kind of content, matched against lowercased text
+_STRUCTURE_KEYWORDS = {
+    "has_code": ("function", "class", "def ", "import ", "export ", "const ", "let ", "var "),
+    "has_data": ("_id", "email", "password", "createdat", "updatedat"),
+    "is_database": ("mongodb", "collection", "document", "$oid", "$date"),
+    "is_config": ("config", "settings", "env", "environment"),
+}
+
+
 class LMStudioClient(LLMClient):
     """LM Studio API client implementation"""
     
     def _build_system_prompt(self, content_type: ContentType) -> str:
         """Build system prompt for the model"""
-        base_rules = (
-            "You are Recall AI Documentation Engine - an expert technical writer and code analyst.\n"
-            "You convert source material into PROFESSIONAL, COMPREHENSIVE, and STRUCTURED documentation.\n\n"
-            "STRICT RULES:\n"
-            "- Output MUST be valid markdown\n"
-            "- Use clear hierarchical structure with numbered sections\n"
-            "- Be thorough but concise\n"
-            "- Do NOT invent or assume anything not in the source\n"
-            "- Only document what actually exists\n"
-            "- Use code blocks for code examples\n"
-            "- Include practical examples where relevant\n"
-            "- No conversational tone - be professional and direct\n"
-            "- No emojis or decorative elements\n"
-            "- No meta commentary about the documentation process\n"
-            "- CRITICAL: Output ONLY the final documentation content\n"
-            "- Do NOT include your thinking process, reasoning steps, or internal analysis\n"
-            "- Do NOT include phrases like 'Okay, I need to...', 'Let me...', 'First, looking at...', 'Wait, the user...', etc.\n"
-            "- Start directly with the documentation title/heading - no preamble\n"
-            "- Output should be clean, publication-ready documentation\n"
-        )
-        
-        if content_type == "code":
-            return base_rules + (
-                "\nDOCUMENT MODE: CODE → DOCUMENTATION\n"
-                "Your task is to analyze code and create comprehensive technical documentation.\n\n"
-                "ANALYSIS APPROACH:\n"
-                "1. Identify the overall purpose and architecture\n"
-                "2. Document all modules, classes, and functions with:\n"
-                "   - Clear descriptions of purpose\n"
-                "   - Parameters and return types\n"
-                "   - Dependencies and relationships\n"
-                "   - Usage examples where helpful\n"
-                "3. Identify patterns, design decisions, and architecture\n"
-                "4. Note error handling, edge cases, and potential issues\n"
-                "5. Provide insights on code quality and improvements\n\n"
-                "OUTPUT STRUCTURE:\n"
-                "- Start with a clear title and overview\n"
-                "- Include architecture/design section\n"
-                "- Document all major components systematically\n"
-                "- Include usage examples and best practices\n"
-                "- Note any limitations or considerations\n"
-            )
-        
-        return base_rules + (
-            "\nDOCUMENT MODE: TEXT/DATA → DOCUMENTATION\n"
-            "Your task is to transform text or data content into well-structured documentation.\n\n"
-            "PROCESSING APPROACH:\n"
-            "1. Identify content type (text, JSON, database records, configuration, etc.)\n"
-            "2. For data structures: analyze schema, fields, relationships, and patterns\n"
-            "3. For text: identify main themes and concepts\n"
-            "4. Organize information hierarchically\n"
-            "5. Create clear sections with logical flow\n"
-            "6. Extract key insights and conclusions\n"
-            "7. Maintain original meaning while improving clarity\n\n"
-            "OUTPUT STRUCTURE:\n"
-            "- Clear title and executive summary\n"
-            "- For data: schema documentation with field descriptions\n"
-            "- For text: organized sections with headings\n"
-            "- Key points highlighted\n"
-            "- Conclusions and takeaways\n"
-            "- Use tables for structured data when appropriate\n"
-        )
+        return _CODE_SYSTEM_PROMPT if content_type == "code" else _TEXT_SYSTEM_PROMPT
     
     def _detect_content_structure(self, content: str) -> dict:
         """Detect content structure and type for better processing"""
         content_lower = content.lower()
-        structure_info = {
-            "has_json": "{" in content and "}" in content,
-            "has_code": any(keyword in content_lower for keyword in ["function", "class", "def ", "import ", "export ", "const ", "let ", "var "]),
-            "has_data": any(keyword in content_lower for keyword in ["_id", "email", "password", "createdat", "updatedat"]),
-            "is_database": any(keyword in content_lower for keyword in ["mongodb", "collection", "document", "$oid", "$date"]),
-            "is_config": any(keyword in content_lower for keyword in ["config", "settings", "env", "environment"]),
-        }
+        structure_info = {"has_json": "{" in content and "}" in content}
+        for category, keywords in _STRUCTURE_KEYWORDS.items():
+            structure_info[category] = any(keyword in content_lower for keyword in keywords)
         return structure_info
     
     def _build_user_prompt(
@@ -103,6 +244,10 @@ class LMStudioClient(LLMClient):
         title_line = f"USER_PROVIDED_TITLE: {user_title}\n" if user_title else ""
         file_info = f"FILES_PROCESSED: {file_count} file(s)\n" if file_count else ""
         
+        # Code prompts carry no structure hints, so skip scanning the content
+        if content_type == "code":
+            return f"{title_line}{file_info}{_CODE_USER_INSTRUCTIONS}{raw_content}\n"
+        
         # Detect content structure for better analysis
         structure = self._detect_content_structure(raw_content)
         structure_hints = []
@@ -118,151 +263,11 @@ class LMStudioClient(LLMClient):
         structure_context = "\n".join(f"- {hint}" for hint in structure_hints) if structure_hints else ""
         structure_section = f"\nCONTENT_ANALYSIS:\n{structure_context}\n" if structure_context else ""
         
-        if content_type == "code":
-            return (
-                f"{title_line}"
-                f"{file_info}"
-                f"CONTENT_TYPE: Code\n\n"
-                "Analyze the following code and generate comprehensive technical documentation.\n"
-                "IMPORTANT: Output ONLY the final documentation. Do NOT include your thinking process, reasoning steps, or any meta-commentary.\n"
-                "Start directly with the documentation title/heading. Do NOT include text like 'Okay, I need to...', 'Let me...', 'First, looking at...', etc.\n\n"
-                "REQUIRED DOCUMENTATION STRUCTURE:\n\n"
-                "1. **Title** (use provided title or generate appropriate one)\n"
-                "2. **Table of Contents** (auto-generated, numbered)\n"
-                "3. **Overview**\n"
-                "   - Purpose and scope\n"
-                "   - High-level description\n"
-                "   - Key technologies/frameworks used\n\n"
-                "4. **Architecture & Design**\n"
-                "   - Overall structure\n"
-                "   - Design patterns used\n"
-                "   - Component relationships\n"
-                "   - Data flow (if applicable)\n\n"
-                "5. **Components & Modules**\n"
-                "   - Document each major component:\n"
-                "     * Classes: purpose, properties, methods\n"
-                "     * Functions: parameters, return values, behavior\n"
-                "     * Modules: responsibilities and exports\n"
-                "   - Include code examples where helpful\n"
-                "   - Note dependencies between components\n\n"
-                "6. **Usage & Examples**\n"
-                "   - How to use the code\n"
-                "   - Practical examples\n"
-                "   - Common use cases\n\n"
-                "7. **Technical Details**\n"
-                "   - Error handling approach\n"
-                "   - Edge cases and considerations\n"
-                "   - Performance characteristics (if relevant)\n\n"
-                "8. **Summary & Notes**\n"
-                "   - Key takeaways\n"
-                "   - Potential improvements\n"
-                "   - Important considerations\n\n"
-                "FORMATTING:\n"
-                "- Use proper markdown syntax\n"
-                "- Code blocks with language tags\n"
-                "- Clear headings hierarchy (#, ##, ###)\n"
-                "- Bullet points for lists\n"
-                "- Bold for emphasis\n\n"
-                "SOURCE CODE:\n"
-                "============\n"
-                f"{raw_content}\n"
-            )
-        
         # Special handling for JSON/data structures
         if structure["has_json"] or structure["is_database"] or structure["has_data"]:
-            return (
-                f"{title_line}"
-                f"{file_info}"
-                f"{structure_section}"
-                f"CONTENT_TYPE: Data/JSON Documentation\n\n"
-                "Analyze the following data structure and generate comprehensive documentation.\n"
-                "CRITICAL: Output ONLY the final documentation. Do NOT include your thinking process, reasoning steps, or any meta-commentary.\n"
-                "Start directly with the documentation title/heading. Do NOT include phrases like 'Okay, I need to...', 'Let me...', 'First, looking at...', 'Wait, the user...', etc.\n\n"
-                "REQUIRED DOCUMENTATION STRUCTURE:\n\n"
-                "1. **Title** (use provided title or generate descriptive title like 'User Data Schema Documentation')\n"
-                "2. **Table of Contents** (auto-generated)\n"
-                "3. **Overview**\n"
-                "   - Purpose of the data structure\n"
-                "   - Type of data (database records, configuration, API response, etc.)\n"
-                "   - Scope and context\n\n"
-                "4. **Data Schema**\n"
-                "   - Document each field with:\n"
-                "     * Field name and type\n"
-                "     * Purpose and description\n"
-                "     * Constraints or validation rules\n"
-                "     * Example values\n"
-                "   - Required vs optional fields\n"
-                "   - Relationships between fields\n\n"
-                "5. **Data Structure Analysis**\n"
-                "   - Overall structure pattern\n"
-                "   - Nested objects or arrays\n"
-                "   - Special fields (IDs, timestamps, references)\n"
-                "   - Data types and formats\n\n"
-                "6. **Usage & Examples**\n"
-                "   - How the data is used\n"
-                "   - Example records with explanations\n"
-                "   - Common operations\n\n"
-                "7. **Technical Details**\n"
-                "   - Database/collection information (if applicable)\n"
-                "   - Indexing considerations\n"
-                "   - Data validation rules\n"
-                "   - Security considerations (especially for sensitive fields)\n\n"
-                "8. **Summary**\n"
-                "   - Key insights about the data structure\n"
-                "   - Important notes\n"
-                "   - Recommendations\n\n"
-                "FORMATTING:\n"
-                "- Use proper markdown syntax\n"
-                "- Code blocks with 'json' language tag for examples\n"
-                "- Tables for field documentation\n"
-                "- Clear headings hierarchy\n"
-                "- Bold for field names and important terms\n\n"
-                "SOURCE DATA:\n"
-                "============\n"
-                f"{raw_content}\n"
-            )
+            return f"{title_line}{file_info}{structure_section}{_DATA_USER_INSTRUCTIONS}{raw_content}\n"
         
-        return (
-            f"{title_line}"
-            f"{file_info}"
-            f"{structure_section}"
-            f"CONTENT_TYPE: Text\n\n"
-            "Transform the following text content into well-structured documentation.\n"
-            "CRITICAL: Output ONLY the final documentation. Do NOT include your thinking process, reasoning, or any meta-commentary.\n"
-            "Start directly with the documentation title/heading. Do NOT include phrases like 'Okay, I need to...', 'Let me...', 'First, looking at...', etc.\n\n"
-            "REQUIRED DOCUMENTATION STRUCTURE:\n\n"
-            "1. **Title** (use provided title or generate from content)\n"
-            "2. **Table of Contents** (auto-generated)\n"
-            "3. **Executive Summary**\n"
-            "   - Main purpose and scope\n"
-            "   - Key points overview\n\n"
-            "4. **Main Content**\n"
-            "   - Organize into logical sections\n"
-            "   - Use clear headings\n"
-            "   - Maintain original meaning\n"
-            "   - Improve clarity and flow\n\n"
-            "5. **Key Concepts**\n"
-            "   - Important ideas highlighted\n"
-            "   - Relationships between concepts\n"
-            "   - Supporting details\n\n"
-            "6. **Insights & Analysis**\n"
-            "   - Patterns identified\n"
-            "   - Important conclusions\n"
-            "   - Practical implications\n\n"
-            "7. **Summary**\n"
-            "   - Main takeaways\n"
-            "   - Action items (if applicable)\n"
-            "   - Related topics\n\n"
-            "FORMATTING:\n"
-            "- Use proper markdown syntax\n"
-            "- Clear headings hierarchy\n"
-            "- Bullet points for lists\n"
-            "- Bold for key terms\n"
-            "- Code blocks for technical terms if needed\n\n"
-            "SOURCE TEXT:\n"
-            "============\n"
-            f"{raw_content}\n"
-        )
+        return f"{title_line}{file_info}{structure_section}{_TEXT_USER_INSTRUCTIONS}{raw_content}\n"
     
     def generate_documentation(
         self,
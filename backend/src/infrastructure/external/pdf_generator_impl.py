@@ -1,19 +1,26 @@
 """PDF generator implementation using FPDF"""
 
+import functools
 import os
 import re
 from pathlib import Path
-from fpdf import FPDF
 
 from src.application.interfaces.pdf_generator import PDFGenerator
 
 
-class SimplePDF(FPDF):
-    """Custom PDF class with minimal header"""
+@functools.cache
+def _simple_pdf_class() -> type:
+    """Build the FPDF subclass on first use; importing fpdf is slow"""
+    from fpdf import FPDF
     
-    def header(self):
-        """Minimal header - can be overridden if needed"""
-        pass
+    class SimplePDF(FPDF):
+        """Custom PDF class with minimal header"""
+        
+        def header(self):
+            """Minimal header - can be overridden if needed"""
+            pass
+    
+    return SimplePDF
 
 
 class FPDFGenerator(PDFGenerator):
@@ -217,7 +224,7 @@ class FPDFGenerator(PDFGenerator):
         output_dir = Path(os.path.dirname(str(output_path)) or ".")
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        pdf = SimplePDF()
+        pdf = _simple_pdf_class()()
         pdf.set_auto_page_break(auto=True, margin=20)
         pdf.add_page()
         
@@ -2,33 +2,95 @@
 
 import logging
 import os
-from typing import Optional, Dict, Any
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, List, Tuple, Union
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Statuses that must always reach the Node backend, regardless of throttling
+TERMINAL_STATUSES = frozenset(("completed", "error", "failed"))
+
+# Connect/read timeout for reporters behind BackgroundStatusReporter; a stalled
+# Node backend must not hold a worker (and every update queued behind it) for long
+BACKGROUND_TIMEOUT = (2.0, 10.0)
+
+
+class ThrottledStatusCallback:
+    """
+    Wraps a status callback so rapid progress ticks are coalesced.
+    
+    Forwards at most one update per ``min_interval`` seconds. Terminal states,
+    status transitions and progress jumps of ``min_progress_delta`` or more
+    are always forwarded.
+    """
+    
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        min_interval: float = 0.25,
+        min_progress_delta: int = 5
+    ):
+        self.fn = fn
+        self.min_interval = min_interval
+        self.min_progress_delta = min_progress_delta
+        self.last = 0.0
+        self.last_status: Optional[str] = None
+        self.last_progress = 0
+        self.lock = threading.Lock()
+    
+    def __call__(self, **kwargs):
+        status = kwargs.get("status")
+        progress = kwargs.get("progress", 0) or 0
+        
+        if status not in TERMINAL_STATUSES:
+            with self.lock:
+                now = time.monotonic()
+                if (
+                    status == self.last_status
+                    and now - self.last < self.min_interval
+                    and abs(progress - self.last_progress) < self.min_progress_delta
+                ):
+                    logger.debug(f"Throttled status update: {status} ({progress}%)")
+                    return None
+                self.last = now
+                self.last_status = status
+                self.last_progress = progress
+        
+        return self.fn(**kwargs)
+
 
 class StatusReporter:
     """Reports generation status updates to Node.js backend"""
     
-    def __init__(self, node_backend_url: Optional[str] = None):
+    def __init__(
+        self,
+        node_backend_url: Optional[str] = None,
+        timeout: Union[float, Tuple[float, float]] = 30,
+        retries: int = 3
+    ):
         """
         Initialize status reporter.
         
         Args:
             node_backend_url: Base URL for Node.js backend (defaults to env var)
+            timeout: Request timeout in seconds, or a (connect, read) pair
+            retries: urllib3 retries for connection errors and 429/5xx responses
         """
         self.node_backend_url = node_backend_url or os.getenv(
             "NODE_BACKEND_URL", 
             "http://localhost:5002"
         )
+        self.timeout = timeout
         
         # Create session with retry strategy
         self.session = requests.Session()
         retry_strategy = Retry(
-            total=3,
+            total=retries,
             backoff_factor=0.3,
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["POST"]
@@ -82,7 +144,7 @@ class StatusReporter:
                 url,
                 json=status_data,
                 headers=headers,
-                timeout=30  # Increased timeout to 30 seconds for large markdown content
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
@@ -203,7 +265,6 @@ class StatusReporter:
                 return True
             if attempt < max_retries - 1:
                 logger.warning(f"Completion status report failed, retrying ({attempt + 1}/{max_retries})...")
-                import time
                 time.sleep(0.5)  # Brief delay before retry
         
         logger.error("Failed to report completion status after all retries")
@@ -236,3 +297,77 @@ class StatusReporter:
         
         return self.update_status(token=token, status_data=status_data)
 
+
+class BackgroundStatusReporter:
+    """
+    Sends StatusReporter updates from background workers.
+    
+    Request handlers don't need the Node backend's acknowledgement, so the
+    HTTP round-trips are taken off the request path. Updates are sharded by
+    token onto single-thread executors: one user's updates stay in submission
+    order (pending -> generating -> completed) while a slow call for one user
+    doesn't delay anyone else's. The wrapped reporter should use short
+    timeouts and no urllib3 retries (see BACKGROUND_TIMEOUT).
+    
+    If the Node backend falls behind and ``max_pending`` updates are queued,
+    further progress updates are dropped; completion and error reports are
+    always queued, and a completion that doesn't land is logged as an error
+    and resolves its Future to False.
+    """
+    
+    def __init__(self, reporter: StatusReporter, max_pending: int = 100, workers: int = 4):
+        self.reporter = reporter
+        self.max_pending = max_pending
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.executors: List[ThreadPoolExecutor] = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"status-{i}")
+            for i in range(max(1, workers))
+        ]
+    
+    def _executor_for(self, token: Optional[str]) -> ThreadPoolExecutor:
+        """Pick the executor that orders this token's updates"""
+        return self.executors[hash(token) % len(self.executors)]
+    
+    def _submit(self, fn: Callable[..., bool], droppable: bool = False, **kwargs) -> Optional[Future]:
+        with self.lock:
+            if droppable and self.pending >= self.max_pending:
+                logger.warning(f"Status queue full ({self.pending} pending), dropping progress update")
+                return None
+            self.pending += 1
+        
+        def run() -> bool:
+            try:
+                return fn(**kwargs)
+            except Exception as e:
+                logger.warning(f"Background status update failed (non-critical): {e}")
+                return False
+            finally:
+                with self.lock:
+                    self.pending -= 1
+        return self._executor_for(kwargs.get("token")).submit(run)
+    
+    def report_progress(self, **kwargs) -> Optional[Future]:
+        """Queue a StatusReporter.report_progress call; dropped if the queue is full"""
+        droppable = kwargs.get("status") not in TERMINAL_STATUSES
+        return self._submit(self.reporter.report_progress, droppable=droppable, **kwargs)
+    
+    def report_completion(self, context: str = "generation", **kwargs) -> Future:
+        """
+        Queue a StatusReporter.report_completion call (retried by the reporter).
+        
+        The returned Future resolves to False, and an error naming ``context``
+        is logged, if the completion never reached the Node backend.
+        """
+        future = self._submit(self.reporter.report_completion, **kwargs)
+        
+        def log_undelivered(done: Future) -> None:
+            if not done.result():
+                logger.error(f"Completion status for {context} was not delivered to the Node backend")
+        
+        future.add_done_callback(log_undelivered)
+        return future
+    
+    def report_error(self, **kwargs) -> Future:
+        """Queue a StatusReporter.report_error call"""
+        return self._submit(self.reporter.report_error, **kwargs)
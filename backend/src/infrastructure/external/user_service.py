@@ -1,7 +1,11 @@
 """User service for interacting with Node backend for authentication and usage"""
 
+import atexit
 import logging
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Tuple
 
 from src.config.settings import settings
@@ -12,8 +16,22 @@ logger = logging.getLogger(__name__)
 class UserService:
     """Service for user authentication and usage management via Node backend"""
     
-    def __init__(self, node_backend_url: str = None):
+    def __init__(self, node_backend_url: str = None, session: Optional[requests.Session] = None):
+        """
+        Initialize user service.
+        
+        Args:
+            node_backend_url: Base URL for Node.js backend (defaults to settings)
+            session: Optional shared session; a pooled keep-alive session is created if omitted
+        """
         self.node_backend_url = (node_backend_url or settings.NODE_BACKEND_URL).rstrip("/")
+        if session is None:
+            # No automatic retries: usage increments/reservations are not idempotent
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
     
     def verify_token(self, token: str) -> Optional[Dict]:
         """
@@ -29,7 +47,7 @@ class UserService:
             return None
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.node_backend_url}/api/auth/me",
                 headers={"Authorization": f"Bearer {token}"},
                 timeout=5
@@ -72,7 +90,7 @@ class UserService:
                 return False, None, "Invalid authentication token"
             
             # Get usage information
-            response = requests.get(
+            response = self.session.get(
                 f"{self.node_backend_url}/api/users/usage",
                 headers={"Authorization": f"Bearer {token}"},
                 timeout=5
@@ -110,7 +128,106 @@ class UserService:
             # Allow request to proceed if Node backend is unavailable (graceful degradation)
             return True, None, None
     
-    def increment_usage(self, token: str, usage_type: str, amount: int = 1) -> bool:
+    def reserve_usage(self, token: str, usage_type: str, amount: int = 1) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Check the usage limit and reserve usage in a single Node backend call.
+        
+        The reservation counts as used; call release_usage() if the work it
+        was reserved for does not complete.
+        
+        Args:
+            token: JWT token string
+            usage_type: Type of usage ('codeToDoc', 'bots', 'chats', 'tokens')
+            amount: Amount to reserve (default: 1)
+            
+        Returns:
+            Tuple of (can_proceed, usage_info, error_message), as check_usage_limit()
+        """
+        if not token:
+            # Allow unauthenticated requests for now (backward compatibility)
+            return True, None, None
+        
+        try:
+            response = self.session.post(
+                f"{self.node_backend_url}/api/users/usage/reserve",
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/json"
+                },
+                json={"type": usage_type, "amount": amount},
+                timeout=5
+            )
+            
+            if response.status_code == 404:
+                # Older Node backend without the reserve endpoint: check, then increment
+                can_proceed, usage, error_msg = self.check_usage_limit(token, usage_type)
+                if can_proceed:
+                    self.increment_usage(token, usage_type, amount)
+                return can_proceed, usage, error_msg
+            
+            if response.status_code == 401:
+                return False, None, "Invalid authentication token"
+            
+            data = response.json()
+            if response.status_code == 403:
+                return False, data.get("usage"), data.get("error", f"You have reached your {usage_type} limit.")
+            
+            if response.status_code != 200 or not data.get("success"):
+                logger.warning(f"Failed to reserve usage: {response.status_code}")
+                return False, None, "Failed to check usage limits"
+            
+            logger.info(f"Reserved {amount} {usage_type} usage")
+            return True, data.get("usage"), None
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to reserve usage: {e}")
+            # Allow request to proceed if Node backend is unavailable (graceful degradation)
+            return True, None, None
+    
+    def release_usage(self, token: str, usage_type: str, amount: int = 1) -> bool:
+        """
+        Release usage previously reserved with reserve_usage().
+        
+        Args:
+            token: JWT token string
+            usage_type: Type of usage ('codeToDoc', 'bots', 'chats', 'tokens')
+            amount: Amount to release (default: 1)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not token:
+            return True
+        
+        try:
+            response = self.session.post(
+                f"{self.node_backend_url}/api/users/usage/release",
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/json"
+                },
+                json={"type": usage_type, "amount": amount},
+                timeout=5
+            )
+            
+            if response.status_code == 200 and response.json().get("success"):
+                logger.info(f"Released {amount} {usage_type} usage")
+                return True
+            
+            logger.warning(f"Failed to release usage: {response.status_code}")
+            return False
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to release usage: {e}")
+            return False
+    
+    def increment_usage(
+        self,
+        token: str,
+        usage_type: str,
+        amount: int = 1,
+        raise_connection_errors: bool = False
+    ) -> bool:
         """
         Increment usage counter for a user.
         
@@ -118,6 +235,9 @@ class UserService:
             token: JWT token string
             usage_type: Type of usage ('codeToDoc', 'bots', 'chats', 'tokens')
             amount: Amount to increment (default: 1)
+            raise_connection_errors: Re-raise requests.ConnectionError instead of
+                returning False, so callers can tell a connection that never
+                reached the backend apart from a rejected or timed-out increment
             
         Returns:
             True if successful, False otherwise
@@ -127,7 +247,7 @@ class UserService:
             return True
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.node_backend_url}/api/users/usage/increment",
                 headers={
                     "Authorization": f"Bearer {token}",
@@ -147,7 +267,93 @@ class UserService:
             return False
             
         except requests.exceptions.RequestException as e:
+            if raise_connection_errors and isinstance(e, requests.exceptions.ConnectionError):
+                raise
             logger.error(f"Failed to increment usage: {e}")
             # Don't fail the request if usage increment fails
             return False
 
+
+
+class BufferedUsageRecorder:
+    """
+    Aggregates usage increments and sends them to the Node backend periodically.
+    
+    Successful generations only need their usage counted eventually, so rather
+    than one POST per generation the amounts are summed per (token, usage type)
+    and flushed every ``flush_interval`` seconds from a daemon thread, plus once
+    at interpreter exit. Limit checks can lag by up to one interval.
+    
+    Increments are not idempotent, so an amount is only kept for the next flush
+    when the connection to the Node backend failed (``requests.ConnectionError``),
+    and at most ``max_retries`` times. Rejected requests (4xx), server errors and
+    read timeouts are dropped with a warning, since the backend may already have
+    counted them. Whatever is still buffered when the process is killed
+    outright is not counted.
+    
+    A ``flush_interval`` of 0 or less sends every increment immediately.
+    """
+    
+    def __init__(self, user_service: UserService, flush_interval: float = 5.0, max_retries: int = 3):
+        self.user_service = user_service
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.pending: Dict[Tuple[str, str], int] = {}
+        # Consecutive failed connection attempts per key still in pending
+        self.retries: Dict[Tuple[str, str], int] = {}
+        self.lock = threading.Lock()
+        if flush_interval > 0:
+            threading.Thread(target=self._run, name="usage-flush", daemon=True).start()
+            atexit.register(self.flush)
+    
+    def increment(self, token: Optional[str], usage_type: str, amount: int = 1) -> None:
+        """Record usage to be sent with the next flush"""
+        if not token:
+            # Unauthenticated usage isn't tracked
+            return
+        if self.flush_interval <= 0:
+            self.user_service.increment_usage(token, usage_type, amount)
+            return
+        key = (token, usage_type)
+        with self.lock:
+            self.pending[key] = self.pending.get(key, 0) + amount
+    
+    def flush(self) -> None:
+        """Send all buffered increments, one request per (token, usage type)"""
+        with self.lock:
+            if not self.pending:
+                return
+            entries, self.pending = self.pending, {}
+        for key, amount in entries.items():
+            try:
+                sent = self.user_service.increment_usage(
+                    key[0], key[1], amount, raise_connection_errors=True
+                )
+            except requests.exceptions.ConnectionError as e:
+                with self.lock:
+                    attempts = self.retries.get(key, 0) + 1
+                    if attempts > self.max_retries:
+                        self.retries.pop(key, None)
+                        logger.warning(
+                            f"Dropping {amount} {key[1]} usage after {self.max_retries} "
+                            f"failed connection attempts: {e}"
+                        )
+                        continue
+                    self.retries[key] = attempts
+                    self.pending[key] = self.pending.get(key, 0) + amount
+                logger.warning(f"Usage flush could not connect, will retry: {e}")
+                continue
+            with self.lock:
+                self.retries.pop(key, None)
+            if not sent:
+                # The request reached the backend (or timed out after sending);
+                # resending could count the same usage twice
+                logger.warning(f"Dropping {amount} {key[1]} usage the Node backend did not accept")
+    
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Usage flush failed (non-critical): {e}")
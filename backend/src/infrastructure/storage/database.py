@@ -1,6 +1,7 @@
 """MongoDB database connection"""
 
 import logging
+import threading
 from typing import Optional
 
 from pymongo import MongoClient
@@ -13,30 +14,48 @@ logger = logging.getLogger(__name__)
 # Global MongoDB client
 _client: Optional[MongoClient] = None
 _db = None
+# The startup warmup thread and request threads may race to create the client
+_client_lock = threading.Lock()
 
 
 def get_client() -> MongoClient:
-    """Get or create MongoDB client"""
+    """
+    Get or create MongoDB client
+    
+    The client is only published once the ping succeeds, so a failed
+    connection attempt leaves nothing cached and the next caller retries
+    (and raises again if MongoDB is still unreachable). Callers arriving
+    while the first ping is in flight wait on the lock for its outcome.
+    """
     global _client
-    if _client is None:
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is not None:
+            return _client
+        client = MongoClient(
+            settings.MONGODB_URI,
+            serverSelectionTimeoutMS=5000,
+            connectTimeoutMS=5000,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        )
         try:
-            _client = MongoClient(
-                settings.MONGODB_URI,
-                serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=5000,
-            )
             # Test connection
-            _client.admin.command('ping')
+            client.admin.command('ping')
             logger.info(f"MongoDB connected: {settings.MONGODB_URI}")
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            client.close()
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise RuntimeError(
                 f"Cannot connect to MongoDB at {settings.MONGODB_URI}. "
                 "Please ensure MongoDB is running and MONGODB_URI is correct."
             ) from e
+        _client = client
     return _client
 
-
 def get_database():
     """Get database instance"""
     global _db
@@ -73,16 +73,15 @@ class CheckpointService:
             logger.warning(f"MongoDB not available for checkpoints: {e}")
             self.db = None
             self.collection = None
-        
-        # Create indexes for efficient queries
-        if self.collection is not None:
-            try:
-                self.collection.create_index("repo_id")
-                self.collection.create_index("status")
-                self.collection.create_index("last_updated")
-                self.collection.create_index([("status", 1), ("last_updated", -1)])
-            except Exception as e:
-                logger.warning(f"Failed to create indexes: {e}")
+    
+    @classmethod
+    def create_indexes(cls) -> None:
+        """Create indexes for efficient queries (done once at startup, not per service)"""
+        collection = get_database()[cls.COLLECTION_NAME]
+        collection.create_index("repo_id")
+        collection.create_index("status")
+        collection.create_index("last_updated")
+        collection.create_index([("status", 1), ("last_updated", -1)])
     
     def save_checkpoint(
         self,
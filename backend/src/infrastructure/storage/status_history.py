@@ -1,9 +1,12 @@
 """Status history storage for tracking system health over time"""
 
+import atexit
 import logging
+import queue
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from pymongo import MongoClient
+from typing import List, Dict, Any, Iterable, Tuple
 
 from src.infrastructure.storage.database import get_database
 
@@ -11,6 +14,9 @@ logger = logging.getLogger(__name__)
 
 COLLECTION_NAME = "status_history"
 
+# Groups records by calendar day (UTC)
+_DAY_EXPR = {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}}
+
 
 class StatusHistory:
     """Store and retrieve status check history"""
@@ -53,6 +59,27 @@ class StatusHistory:
         except Exception as e:
             logger.warning(f"Failed to record status check: {e}")
     
+    @staticmethod
+    def record_status_checks_bulk(checks: Iterable[Tuple[str, str, Dict[str, Any], datetime]]) -> None:
+        """Record several (service, status, details, timestamp) checks in one insert"""
+        records = [
+            {
+                "service": service_name,
+                "status": status,
+                "timestamp": timestamp,
+                "details": details or {}
+            }
+            for service_name, status, details, timestamp in checks
+        ]
+        if not records:
+            return
+        try:
+            collection = StatusHistory.get_collection()
+            collection.insert_many(records, ordered=False)
+            logger.debug(f"Recorded {len(records)} status checks")
+        except Exception as e:
+            logger.warning(f"Failed to record {len(records)} status checks: {e}")
+    
     @staticmethod
     def get_recent_statuses(service_name: str, days: int = 30) -> List[Dict[str, Any]]:
         """Get recent status checks for a service"""
@@ -93,33 +120,7 @@ class StatusHistory:
                         "timestamp": {"$gte": cutoff_date}
                     }
                 },
-                {
-                    "$group": {
-                        "_id": {
-                            "$dateToString": {
-                                "format": "%Y-%m-%d",
-                                "date": "$timestamp"
-                            }
-                        },
-                        "checks": {"$push": "$$ROOT"},
-                        "total_checks": {"$sum": 1},
-                        "healthy_count": {
-                            "$sum": {
-                                "$cond": [{"$eq": ["$status", "healthy"]}, 1, 0]
-                            }
-                        },
-                        "unhealthy_count": {
-                            "$sum": {
-                                "$cond": [{"$eq": ["$status", "unhealthy"]}, 1, 0]
-                            }
-                        },
-                        "error_count": {
-                            "$sum": {
-                                "$cond": [{"$eq": ["$status", "error"]}, 1, 0]
-                            }
-                        }
-                    }
-                },
+                StatusHistory._group_by_day(_DAY_EXPR),
                 {
                     "$sort": {"_id": 1}
                 }
@@ -128,30 +129,7 @@ class StatusHistory:
             results = list(collection.aggregate(pipeline))
             
             # Format results
-            daily_summaries = []
-            for result in results:
-                total = result["total_checks"]
-                healthy = result["healthy_count"]
-                unhealthy = result["unhealthy_count"]
-                error = result["error_count"]
-                
-                # Determine day status based on majority
-                if error > total * 0.1:  # More than 10% errors = red
-                    day_status = "red"
-                elif unhealthy > total * 0.1:  # More than 10% unhealthy = yellow
-                    day_status = "yellow"
-                else:  # Mostly healthy = green
-                    day_status = "green"
-                
-                daily_summaries.append({
-                    "date": result["_id"],
-                    "status": day_status,
-                    "healthy_count": healthy,
-                    "unhealthy_count": unhealthy,
-                    "error_count": error,
-                    "total_checks": total,
-                    "uptime_percentage": round((healthy / total * 100) if total > 0 else 100, 2)
-                })
+            daily_summaries = [StatusHistory._summarize_day(result["_id"], result) for result in results]
             
             return daily_summaries
         except Exception as e:
@@ -190,21 +168,133 @@ class StatusHistory:
         """Get uptime bars for visualization (one per day)"""
         try:
             daily_summaries = StatusHistory.get_daily_status_summary(service_name, days)
-            
-            # If we have less than 30 days, pad with green (assume healthy)
-            bars = [day["status"] for day in daily_summaries]
-            
-            # Pad to 30 days if needed
-            while len(bars) < days:
-                bars.insert(0, "green")  # Add green bars at the beginning
-            
-            # Take last 30 days
-            return bars[-days:]
+            return StatusHistory._bars_from_daily(daily_summaries, days)
         except Exception as e:
             logger.warning(f"Failed to get uptime bars: {e}")
             # Return all green if error
             return ["green"] * days
     
+    @staticmethod
+    def get_uptime_summary(service_name: str, days: int = 30) -> Tuple[float, List[str]]:
+        """
+        Get uptime percentage and daily bars from a single aggregation.
+        
+        Equivalent to calculate_uptime_percentage() plus get_uptime_bars(),
+        which query the same window of records separately.
+        """
+        daily_summaries = StatusHistory.get_daily_status_summary(service_name, days)
+        return StatusHistory._uptime_from_daily(daily_summaries, days)
+    
+    @staticmethod
+    def get_all_uptime(service_names: Iterable[str], days: int = 30) -> Dict[str, Tuple[float, List[str]]]:
+        """
+        Get uptime percentage and daily bars for several services in one aggregation.
+        
+        Returns:
+            Dict mapping each service name to (uptime_percentage, bars), as
+            get_uptime_summary() would return for it
+        """
+        service_names = list(service_names)
+        try:
+            collection = StatusHistory.get_collection()
+            cutoff_date = datetime.utcnow() - timedelta(days=days)
+            
+            pipeline = [
+                {
+                    "$match": {
+                        "service": {"$in": service_names},
+                        "timestamp": {"$gte": cutoff_date}
+                    }
+                },
+                StatusHistory._group_by_day({"service": "$service", "date": _DAY_EXPR}),
+                {
+                    "$sort": {"_id.date": 1}
+                }
+            ]
+            
+            daily_by_service: Dict[str, List[Dict[str, Any]]] = {name: [] for name in service_names}
+            for result in collection.aggregate(pipeline):
+                daily_by_service[result["_id"]["service"]].append(
+                    StatusHistory._summarize_day(result["_id"]["date"], result)
+                )
+        except Exception as e:
+            logger.warning(f"Failed to get uptime for {service_names}: {e}")
+            daily_by_service = {name: [] for name in service_names}
+        
+        return {
+            name: StatusHistory._uptime_from_daily(daily_summaries, days)
+            for name, daily_summaries in daily_by_service.items()
+        }
+    
+    @staticmethod
+    def _group_by_day(group_id: Any) -> Dict[str, Any]:
+        """$group stage counting checks by status under ``group_id``"""
+        return {
+            "$group": {
+                "_id": group_id,
+                "total_checks": {"$sum": 1},
+                "healthy_count": {
+                    "$sum": {
+                        "$cond": [{"$eq": ["$status", "healthy"]}, 1, 0]
+                    }
+                },
+                "unhealthy_count": {
+                    "$sum": {
+                        "$cond": [{"$eq": ["$status", "unhealthy"]}, 1, 0]
+                    }
+                },
+                "error_count": {
+                    "$sum": {
+                        "$cond": [{"$eq": ["$status", "error"]}, 1, 0]
+                    }
+                }
+            }
+        }
+    
+    @staticmethod
+    def _summarize_day(date: str, counts: Dict[str, Any]) -> Dict[str, Any]:
+        """Build one day's summary from its grouped status counts"""
+        total = counts["total_checks"]
+        healthy = counts["healthy_count"]
+        unhealthy = counts["unhealthy_count"]
+        error = counts["error_count"]
+        
+        # Determine day status based on majority
+        if error > total * 0.1:  # More than 10% errors = red
+            day_status = "red"
+        elif unhealthy > total * 0.1:  # More than 10% unhealthy = yellow
+            day_status = "yellow"
+        else:  # Mostly healthy = green
+            day_status = "green"
+        
+        return {
+            "date": date,
+            "status": day_status,
+            "healthy_count": healthy,
+            "unhealthy_count": unhealthy,
+            "error_count": error,
+            "total_checks": total,
+            "uptime_percentage": round((healthy / total * 100) if total > 0 else 100, 2)
+        }
+    
+    @staticmethod
+    def _uptime_from_daily(daily_summaries: List[Dict[str, Any]], days: int) -> Tuple[float, List[str]]:
+        """Overall uptime percentage and bars from daily summaries"""
+        total = sum(day["total_checks"] for day in daily_summaries)
+        healthy = sum(day["healthy_count"] for day in daily_summaries)
+        
+        # No data = assume 100% uptime
+        uptime_percentage = round((healthy / total * 100), 2) if total > 0 else 100.0
+        return uptime_percentage, StatusHistory._bars_from_daily(daily_summaries, days)
+    
+    @staticmethod
+    def _bars_from_daily(daily_summaries: List[Dict[str, Any]], days: int) -> List[str]:
+        """Pad daily statuses with green (assume healthy) and keep the last `days`"""
+        bars = [day["status"] for day in daily_summaries]
+        if len(bars) < days:
+            bars = ["green"] * (days - len(bars)) + bars
+        return bars[-days:]
+    
     @staticmethod
     def cleanup_old_records(days_to_keep: int = 90):
         """Remove status records older than specified days"""
@@ -222,3 +312,88 @@ class StatusHistory:
             logger.warning(f"Failed to cleanup old records: {e}")
             return 0
 
+
+
+class StatusHistoryWriter:
+    """
+    Queues status checks and writes them to MongoDB in batches.
+    
+    Recording happens on the request path of the status page, so records are
+    put on a bounded queue and a daemon thread inserts them with one
+    insert_many() per batch. Timestamps are taken when a check is recorded,
+    not when it is written. If MongoDB falls behind and the queue fills up,
+    new records are dropped. Whatever is still queued is written at exit.
+    
+    With a min_interval, a service's check is only recorded if its status
+    changed or min_interval seconds have passed since its last record, so
+    frequent polling doesn't flood the history with identical rows.
+    """
+    
+    def __init__(
+        self,
+        max_pending: int = 10_000,
+        max_batch: int = 200,
+        batch_window: float = 0.5,
+        min_interval: float = 0.0,
+    ):
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.min_interval = min_interval
+        self.pending: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._last_recorded: Dict[str, Tuple[str, float]] = {}
+        self._last_recorded_lock = threading.Lock()
+        self._started = False
+        self._start_lock = threading.Lock()
+    
+    def record(self, service_name: str, status: str, details: Dict[str, Any] = None) -> None:
+        """Queue a status check to be recorded"""
+        if self.min_interval > 0 and not self._due(service_name, status):
+            return
+        if not self._started:
+            self._start()
+        try:
+            self.pending.put_nowait((service_name, status, details, datetime.utcnow()))
+        except queue.Full:
+            logger.warning(f"Status history queue full, dropping {service_name} check")
+    
+    def flush(self) -> None:
+        """Write everything currently queued"""
+        batch = self._drain(self.pending.qsize())
+        while batch:
+            StatusHistory.record_status_checks_bulk(batch)
+            batch = self._drain(self.max_batch)
+    
+    def _due(self, service_name: str, status: str) -> bool:
+        now = time.monotonic()
+        with self._last_recorded_lock:
+            last = self._last_recorded.get(service_name)
+            if last is not None and last[0] == status and now - last[1] < self.min_interval:
+                return False
+            self._last_recorded[service_name] = (status, now)
+            return True
+    
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._started:
+                return
+            threading.Thread(target=self._run, name="status-history", daemon=True).start()
+            atexit.register(self.flush)
+            self._started = True
+    
+    def _drain(self, limit: int) -> list:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self) -> None:
+        while True:
+            # Block for the first record, then give the rest of the burst
+            # (one check per service) a moment to arrive
+            batch = [self.pending.get()]
+            time.sleep(self.batch_window)
+            batch.extend(self._drain(self.max_batch - 1))
+            StatusHistory.record_status_checks_bulk(batch)
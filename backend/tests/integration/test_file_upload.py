@@ -65,3 +65,86 @@ class TestFileUpload:
         # Should reject invalid file types
         assert response.status_code in [400, 415]
 
+
+
+class TestZipUploadSpooling:
+    """Test that spooled zip uploads never outlive the request"""
+    
+    @pytest.fixture
+    def spool_dir(self, tmp_path, monkeypatch):
+        """Point the system temp dir at an empty directory"""
+        import tempfile
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+        return tmp_path
+    
+    @staticmethod
+    def _zip_bytes():
+        import zipfile
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('main.py', 'print("hello")\n')
+        return buffer.getvalue()
+    
+    def test_rejected_zip_is_removed(self, client, spool_dir):
+        """Test that a 400 for mixed uploads leaves no spooled archive behind"""
+        from src.config.settings import settings
+        before = set(settings.UPLOAD_PATH.glob('upload_*.zip'))
+        
+        response = client.post(
+            '/api/upload',
+            data={'file': [(BytesIO(self._zip_bytes()), 'project.zip'), (BytesIO(b'x = 1'), 'extra.py')]},
+            content_type='multipart/form-data'
+        )
+        
+        assert response.status_code == 400
+        assert list(spool_dir.iterdir()) == []
+        assert set(settings.UPLOAD_PATH.glob('upload_*.zip')) == before
+    
+    def test_extracted_zip_is_removed(self, client, spool_dir):
+        """Test that the spooled archive is deleted after a successful extraction"""
+        response = client.post(
+            '/api/upload',
+            data={'file': (BytesIO(self._zip_bytes()), 'project.zip')},
+            content_type='multipart/form-data'
+        )
+        
+        assert response.status_code == 200
+        assert response.get_json()['filenames'] == ['main.py']
+        assert list(spool_dir.iterdir()) == []
+
+
+class TestCombinedUploadResponse:
+    """Test the streamed upload response with combined content"""
+    
+    @pytest.fixture(autouse=True)
+    def upload_path(self, tmp_path, monkeypatch):
+        """Save uploads under a temp dir"""
+        from src.config.settings import settings
+        monkeypatch.setattr(settings, 'UPLOAD_PATH', tmp_path)
+    
+    def test_content_is_well_formed_json(self, client):
+        """Test that the streamed body parses and carries the combined content"""
+        response = client.post(
+            '/api/upload',
+            data={'file': (BytesIO(b'print("hi")\n'), 'main.py')},
+            content_type='multipart/form-data'
+        )
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['content'].endswith('print("hi")\n')
+        assert data['total_bytes'] == 12
+    
+    def test_read_failure_is_an_error_response(self, client):
+        """Test that a file that can't be read yields a 500, not a truncated 200"""
+        from src.domain.exceptions import FileProcessingError
+        with patch('src.application.services.file_service.FileService.read_file_content',
+                   side_effect=FileProcessingError('Cannot read file')):
+            response = client.post(
+                '/api/upload',
+                data={'file': (BytesIO(b'x = 1'), 'main.py')},
+                content_type='multipart/form-data'
+            )
+        
+        assert response.status_code == 500
+        assert json.loads(response.data)['error']
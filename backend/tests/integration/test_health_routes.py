@@ -0,0 +1,60 @@
+"""Integration tests for health and probe routes"""
+
+import json
+from unittest.mock import patch
+
+
+class TestHealthRoutes:
+    """Test liveness and readiness endpoints"""
+    
+    def test_live_makes_no_dependency_calls(self, client):
+        """Test GET /api/live"""
+        with patch('src.infrastructure.api.routes._probe_lm_studio') as mock_probe:
+            response = client.get('/api/live')
+            
+            assert response.status_code == 200
+            assert json.loads(response.data) == {'status': 'ok'}
+            mock_probe.assert_not_called()
+    
+    def test_ready_when_lm_studio_connected(self, client):
+        """Test GET /api/ready with LM Studio reachable"""
+        with patch('src.infrastructure.api.routes._health_cache') as mock_cache:
+            mock_cache.get_or_refresh.return_value = {
+                'lm_studio': 'connected', 'available_models': [], 'model_loaded': None
+            }
+            response = client.get('/api/ready')
+            
+            assert response.status_code == 200
+            assert json.loads(response.data)['status'] == 'ready'
+    
+    def test_not_ready_when_lm_studio_down(self, client):
+        """Test GET /api/ready with LM Studio unreachable"""
+        with patch('src.infrastructure.api.routes._health_cache') as mock_cache:
+            mock_cache.get_or_refresh.return_value = {
+                'lm_studio': 'disconnected', 'available_models': [], 'model_loaded': None
+            }
+            response = client.get('/api/ready')
+            
+            assert response.status_code == 503
+            assert json.loads(response.data)['status'] == 'unavailable'
+
+
+class TestDetectFaiss:
+    """Test FAISS availability detection"""
+    
+    def test_broken_faiss_reported_unavailable(self):
+        """Test that a faiss wheel that fails to load is reported as unavailable"""
+        import builtins
+        from src.infrastructure.api.routes import _detect_faiss
+        real_import = builtins.__import__
+        
+        def failing_import(name, *args, **kwargs):
+            if name == 'faiss':
+                raise OSError('libopenblas.so.0: cannot open shared object file')
+            return real_import(name, *args, **kwargs)
+        
+        with patch('builtins.__import__', side_effect=failing_import):
+            info = _detect_faiss()
+        
+        assert info['available'] is False
+        assert info['backend'] == 'Not installed'
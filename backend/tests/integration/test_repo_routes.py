@@ -56,3 +56,94 @@ class TestRepoRoutes:
                 data = json.loads(response.data)
                 assert 'markdown' in data
 
+
+
+class TestRepoGenerateUsage:
+    """Test codeToDoc reservations on /api/repo/generate"""
+    
+    def test_releases_reservation_when_setup_fails(self, client):
+        """Test that a failure outside the generation call still releases usage"""
+        import threading
+        from src.domain.exceptions import ValidationError
+        from src.infrastructure.external.user_service import UserService
+        
+        released = threading.Event()
+        with patch.object(UserService, 'reserve_usage', return_value=(True, {}, None)), \
+                patch.object(UserService, 'release_usage', side_effect=lambda *args: released.set()) as mock_release, \
+                patch('src.infrastructure.api.repo_routes.RepoOrchestratorService', side_effect=ValidationError('bad repo')):
+            response = client.post(
+                '/api/repo/generate',
+                json={'repo_url': 'https://github.com/user/repo', 'repo_id': 'user_repo'},
+                headers={'Authorization': 'Bearer test-token'}
+            )
+            
+            assert response.status_code == 400
+            assert released.wait(timeout=2)
+            mock_release.assert_called_once_with('test-token', 'codeToDoc', 1)
+
+
+class TestRepoGenerateCompletion:
+    """Test completion reporting on /api/repo/generate"""
+    
+    def test_completion_reported_once(self, client):
+        """Test that a completed generation queues exactly one completion report"""
+        from src.infrastructure.external.status_reporter import BackgroundStatusReporter
+        
+        def fake_orchestrator(status_callback, **services):
+            def generate_documentation(**kwargs):
+                status_callback(status='completed', progress=100, markdown='# Doc')
+                return {'markdown': '# Doc', 'pdf_path': None, 'pdf_url': None}
+            return Mock(generate_documentation=generate_documentation)
+        
+        with patch.object(BackgroundStatusReporter, 'report_completion') as mock_completion, \
+                patch.object(BackgroundStatusReporter, 'report_progress'), \
+                patch('src.infrastructure.api.repo_routes.RepoOrchestratorService', side_effect=fake_orchestrator):
+            response = client.post(
+                '/api/repo/generate',
+                json={'repo_url': 'https://github.com/user/repo', 'repo_id': 'user_repo_1'}
+            )
+            
+            assert response.status_code == 200
+            mock_completion.assert_called_once()
+            assert mock_completion.call_args.kwargs['markdown'] == '# Doc'
+
+
+class TestRepoGenerateSlots:
+    """Test generation slot limits on /api/repo/generate"""
+    
+    def test_busy_server_skips_usage_reservation(self, client):
+        """Test that a 429 is returned before any usage is reserved"""
+        from src.infrastructure.external.user_service import UserService
+        
+        with patch('src.infrastructure.api.repo_routes._acquire_generation_slot', return_value=None), \
+                patch.object(UserService, 'reserve_usage') as mock_reserve:
+            response = client.post(
+                '/api/repo/generate',
+                json={'repo_url': 'https://github.com/user/repo', 'repo_id': 'user_repo_1'},
+                headers={'Authorization': 'Bearer test-token'}
+            )
+            
+            assert response.status_code == 429
+            assert response.headers['X-RateLimit-Remaining'] == '0'
+            mock_reserve.assert_not_called()
+    
+    def test_success_sends_rate_limit_headers(self, client):
+        """Test that a 200 carries the rate-limit headers and frees its slot"""
+        from src.config.settings import settings
+        from src.infrastructure.api import repo_routes
+        from src.infrastructure.external.status_reporter import BackgroundStatusReporter
+        
+        orchestrator = Mock()
+        orchestrator.generate_documentation.return_value = {'markdown': '# Doc', 'pdf_path': None, 'pdf_url': None}
+        with patch.object(BackgroundStatusReporter, 'report_completion'), \
+                patch.object(BackgroundStatusReporter, 'report_progress'), \
+                patch('src.infrastructure.api.repo_routes.RepoOrchestratorService', return_value=orchestrator):
+            response = client.post(
+                '/api/repo/generate',
+                json={'repo_url': 'https://github.com/user/repo', 'repo_id': 'user_repo_1'}
+            )
+            
+            assert response.status_code == 200
+            assert response.headers['X-RateLimit-Limit'] == str(settings.MAX_CONCURRENT_GENERATIONS)
+            assert response.headers['X-RateLimit-Remaining'] == str(settings.MAX_CONCURRENT_GENERATIONS - 1)
+            assert repo_routes._gen_active == 0
@@ -0,0 +1,85 @@
+"""Integration tests for status page routes"""
+
+from unittest.mock import patch
+
+import gzip
+import json
+
+import pytest
+
+from src.infrastructure.api import status_routes
+from src.infrastructure.cache import TTLCache
+
+
+class TestStatusStylesheet:
+    """Test the status page stylesheet route"""
+    
+    def test_served_with_long_cache_lifetime(self, client):
+        """Test GET /static/status.css"""
+        response = client.get('/static/status.css')
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'text/css'
+        assert response.cache_control.max_age == 86400
+        assert response.cache_control.immutable
+        assert b'.status-container' in response.data
+
+
+class TestStatusPage:
+    """Test the status page route"""
+    
+    @pytest.fixture(autouse=True)
+    def stub_checks(self):
+        """Stub the service checks and history with fixed healthy results"""
+        checks = {name: {'status': 'healthy'} for name in ('mongodb', 'python_backend', 'node_backend')}
+        uptime = {'uptime_percentage': 100.0, 'uptime_history': ['green'] * 30}
+        with patch.object(status_routes, '_status_cache', TTLCache()), \
+                patch.object(status_routes, 'run_status_checks', side_effect=lambda *a: {k: dict(v) for k, v in checks.items()}), \
+                patch.object(status_routes, 'get_uptime', return_value=uptime), \
+                patch.object(status_routes, '_history_writer'):
+            yield
+    
+    def test_unchanged_page_revalidates_with_304(self, client):
+        """Test GET /status.recallai with If-None-Match"""
+        first = client.get('/status.recallai')
+        assert first.status_code == 200
+        assert first.headers['ETag']
+        
+        # Drop the cached render so the page is built again with a new timestamp
+        status_routes._status_cache.invalidate()
+        second = client.get('/status.recallai', headers={'If-None-Match': first.headers['ETag']})
+        
+        assert second.status_code == 304
+        assert second.data == b''
+    
+    def test_auto_refresh_uses_header_not_script(self, client):
+        """Test GET /status.recallai sets Refresh instead of embedding JS"""
+        response = client.get('/status.recallai')
+        
+        assert response.headers['Refresh'] == '30'
+        assert b'<script' not in response.data
+    
+    def test_page_is_gzipped_when_accepted(self, client):
+        """Test GET /status.recallai with Accept-Encoding: gzip"""
+        plain = client.get('/status.recallai')
+        compressed = client.get('/status.recallai', headers={'Accept-Encoding': 'gzip'})
+        
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(compressed.data) == plain.data
+        assert compressed.headers['ETag'] != plain.headers['ETag']
+        assert 'Accept-Encoding' in compressed.headers['Vary']
+    
+    def test_api_reuses_serialized_status(self, client):
+        """Test GET /api/status returns cached JSON and honors If-None-Match"""
+        first = client.get('/api/status')
+        assert first.status_code == 200
+        assert json.loads(first.data)['status'] == 'healthy'
+        assert set(json.loads(first.data)['services']) == {'web', 'python_backend', 'node_backend', 'mongodb'}
+        
+        second = client.get('/api/status')
+        assert second.data == first.data
+        status_routes.run_status_checks.assert_called_once()
+        
+        status_routes._status_cache.invalidate('status_api')
+        revalidated = client.get('/api/status', headers={'If-None-Match': first.headers['ETag']})
+        assert revalidated.status_code == 304
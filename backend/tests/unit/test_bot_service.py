@@ -16,6 +16,15 @@ class TestBotService:
             service.bot_model = mock_model
             yield service
     
+    def test_init_can_skip_index_creation(self):
+        """Test that ensure_indexes=False does no database work"""
+        with patch('src.application.services.bot_service.BotModel') as mock_model:
+            BotService(ensure_indexes=False)
+            mock_model.create_indexes.assert_not_called()
+            
+            BotService()
+            mock_model.create_indexes.assert_called_once()
+    
     def test_list_bots(self, bot_service):
         """Test listing bots"""
         mock_bots = [
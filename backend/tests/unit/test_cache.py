@@ -0,0 +1,115 @@
+"""Unit tests for the in-process TTL cache"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+from src.infrastructure.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test TTLCache class"""
+
+    def test_get_or_load_caches_within_ttl(self):
+        """Test that the loader runs once while the entry is fresh"""
+        cache = TTLCache()
+        loader = Mock(return_value="value")
+
+        assert cache.get_or_load("key", loader, ttl=60) == "value"
+        assert cache.get_or_load("key", loader, ttl=60) == "value"
+        loader.assert_called_once()
+
+    def test_get_or_load_refreshes_after_expiry(self):
+        """Test that an expired entry is reloaded"""
+        cache = TTLCache()
+        loader = Mock(side_effect=["first", "second"])
+
+        with patch("src.infrastructure.cache.time.monotonic") as mock_time:
+            mock_time.return_value = 100.0
+            assert cache.get_or_load("key", loader, ttl=5) == "first"
+            mock_time.return_value = 106.0
+            assert cache.get_or_load("key", loader, ttl=5) == "second"
+
+    def test_concurrent_misses_are_coalesced(self):
+        """Test that concurrent misses share a single loader call"""
+        cache = TTLCache()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        threads = [
+            threading.Thread(target=cache.get_or_load, args=("key", slow_loader, 60))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+
+    def test_invalidate(self):
+        """Test dropping a cached entry"""
+        cache = TTLCache()
+        cache.set("key", "value", ttl=60)
+
+        cache.invalidate("key")
+
+        assert cache.get("key") is None
+
+    def test_get_or_refresh_serves_stale_value(self):
+        """Test that an expired entry is returned while it reloads in the background"""
+        cache = TTLCache()
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return "fresh"
+
+        with patch("src.infrastructure.cache.time.monotonic") as mock_time:
+            mock_time.return_value = 100.0
+            cache.set("key", "stale", ttl=5)
+            mock_time.return_value = 106.0
+
+            assert cache.get_or_refresh("key", loader, ttl=5) == "stale"
+            assert refreshed.wait(timeout=5)
+            for _ in range(100):
+                if cache.get("key") == "fresh":
+                    break
+                time.sleep(0.01)
+            assert cache.get("key") == "fresh"
+
+    def test_get_or_refresh_loads_inline_when_empty(self):
+        """Test that the first load for a key runs synchronously"""
+        cache = TTLCache()
+
+        assert cache.get_or_refresh("key", Mock(return_value="value"), ttl=5) == "value"
+
+    def test_get_ignores_expired_entry(self):
+        """Test that an expired entry reads as missing until prune drops it"""
+        cache = TTLCache()
+
+        with patch("src.infrastructure.cache.time.monotonic") as mock_time:
+            mock_time.return_value = 100.0
+            cache.set("key", "value", ttl=5)
+            mock_time.return_value = 106.0
+
+            assert cache.get("key") is None
+            cache.prune()
+            assert "key" not in cache._entries
+
+    def test_prune(self):
+        """Test that prune removes only expired entries"""
+        cache = TTLCache()
+
+        with patch("src.infrastructure.cache.time.monotonic") as mock_time:
+            mock_time.return_value = 100.0
+            cache.set("old", "value", ttl=5)
+            cache.set("new", "value", ttl=60)
+            mock_time.return_value = 106.0
+
+            cache.prune()
+
+            assert list(cache._entries) == ["new"]
@@ -0,0 +1,63 @@
+"""Unit tests for API response compression"""
+
+import gzip
+import json
+
+import pytest
+from flask import Flask, jsonify
+
+from src.infrastructure.api.compression import install_compression
+
+
+class TestCompression:
+    """Test gzip response compression"""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client for an app with compression installed"""
+        app = Flask(__name__)
+        install_compression(app)
+
+        @app.route("/large")
+        def large():
+            return jsonify({"content": "def f():\n    pass\n" * 500})
+
+        @app.route("/small")
+        def small():
+            return jsonify({"ok": True})
+
+        return app.test_client()
+
+    def test_compresses_large_json(self, client):
+        """Test that large JSON responses are gzipped"""
+        response = client.get("/large", headers={"Accept-Encoding": "gzip, deflate"})
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        body = json.loads(gzip.decompress(response.data))
+        assert body["content"].startswith("def f():")
+
+    def test_skips_without_accept_encoding(self, client):
+        """Test that clients without gzip support get plain JSON"""
+        response = client.get("/large")
+
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json()["content"].startswith("def f():")
+
+    def test_skips_when_gzip_refused(self, client):
+        """Test that gzip;q=0 is treated as a refusal"""
+        response = client.get("/large", headers={"Accept-Encoding": "gzip;q=0, deflate"})
+
+        assert "Content-Encoding" not in response.headers
+
+    def test_compresses_for_wildcard(self, client):
+        """Test that a wildcard encoding accepts gzip"""
+        response = client.get("/large", headers={"Accept-Encoding": "*"})
+
+        assert response.headers["Content-Encoding"] == "gzip"
+
+    def test_skips_small_responses(self, client):
+        """Test that tiny responses are left uncompressed"""
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in response.headers
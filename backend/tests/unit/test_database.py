@@ -0,0 +1,47 @@
+"""Unit tests for the MongoDB connection helper"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from src.infrastructure.storage import database
+
+
+@pytest.fixture(autouse=True)
+def reset_client(monkeypatch):
+    """Start every test without a cached client"""
+    monkeypatch.setattr(database, "_client", None)
+    monkeypatch.setattr(database, "_db", None)
+
+
+class TestGetClient:
+    """Test get_client function"""
+
+    def test_unreachable_server_is_not_cached(self):
+        """Test that a failed ping leaves no client behind and raises again"""
+        client = Mock()
+        client.admin.command.side_effect = ServerSelectionTimeoutError("down")
+
+        with patch.object(database, "MongoClient", return_value=client) as mock_cls:
+            with pytest.raises(RuntimeError):
+                database.get_client()
+            assert database._client is None
+
+            with pytest.raises(RuntimeError):
+                database.get_client()
+            assert database._client is None
+
+        assert mock_cls.call_count == 2
+        assert client.close.call_count == 2
+
+    def test_reachable_server_is_cached(self):
+        """Test that the client is reused once the ping succeeds"""
+        client = Mock()
+
+        with patch.object(database, "MongoClient", return_value=client) as mock_cls:
+            assert database.get_client() is client
+            assert database.get_client() is client
+
+        mock_cls.assert_called_once()
+        client.admin.command.assert_called_once_with('ping')
@@ -0,0 +1,112 @@
+"""Unit tests for File Service"""
+
+import os
+import time
+import uuid
+from datetime import datetime
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from src.application.services import file_service
+from src.application.services.file_service import FileService
+from src.config.settings import settings
+from src.domain.exceptions import ValidationError
+from src.domain.models import FileUpload
+
+
+class TestFileService:
+    """Test FileService class"""
+
+    def _upload(self, path, content):
+        path.write_text(content)
+        return FileUpload(
+            filename=path.name,
+            file_path=path,
+            content_type=FileService.detect_content_type(path.name),
+            size=len(content),
+            uploaded_at=datetime.now()
+        )
+
+    def test_combine_file_contents_format(self, tmp_path):
+        """Test the combined layout of headers and separators"""
+        uploads = [
+            self._upload(tmp_path / "a.py", "print('a')"),
+            self._upload(tmp_path / "b.md", "# B"),
+        ]
+
+        combined = FileService.combine_file_contents(uploads)
+
+        assert combined == (
+            "FILE 1: a.py\n---\nFile: a.py\nType: code\nSize: 10 bytes\n---\n\nprint('a')"
+            "\n\n\n" + "=" * 80 + "\n\n\n"
+            "FILE 2: b.md\n---\nFile: b.md\nType: text\nSize: 3 bytes\n---\n\n# B"
+        )
+
+
+class TestSavedUploads:
+    """Test per-upload directories"""
+
+    @pytest.fixture(autouse=True)
+    def upload_path(self, tmp_path, monkeypatch):
+        """Save uploads under a temp dir"""
+        monkeypatch.setattr(settings, "UPLOAD_PATH", tmp_path)
+        return tmp_path
+
+    def _save(self, name, content):
+        upload_id = uuid.uuid4().hex
+        FileService.save_uploaded_files([FileStorage(BytesIO(content), name)], upload_id)
+        return upload_id
+
+    def test_same_filename_in_two_uploads(self):
+        """Test that uploads of the same name don't overwrite each other"""
+        first = self._save("main.py", b"first = 1")
+        second = self._save("main.py", b"second = 2")
+
+        assert FileService.load_saved_uploads(first)[0].file_path.read_text() == "first = 1"
+        assert FileService.load_saved_uploads(second)[0].file_path.read_text() == "second = 2"
+
+    def test_rejects_ids_it_did_not_generate(self, upload_path):
+        """Test that only well-formed upload ids resolve"""
+        (upload_path / "secret.py").write_text("token = 1")
+
+        for upload_id in ["..", "../secret.py", "", None, "A" * 32]:
+            with pytest.raises(ValidationError):
+                FileService.load_saved_uploads(upload_id)
+
+    def test_missing_or_expired_upload(self):
+        """Test that unknown and expired uploads are reported as not found"""
+        upload_id = self._save("notes.md", b"# Notes")
+
+        with pytest.raises(ValidationError, match="not found or expired"):
+            FileService.load_saved_uploads(uuid.uuid4().hex)
+        with pytest.raises(ValidationError, match="not found or expired"):
+            FileService.load_saved_uploads(upload_id, max_age=-1)
+
+    def test_remove_expired_uploads(self, upload_path):
+        """Test that only upload directories past max_age are deleted"""
+        old = self._save("old.py", b"old = 1")
+        fresh = self._save("fresh.py", b"fresh = 1")
+        other = upload_path / "reports"
+        other.mkdir()
+        past = time.time() - 7200
+        for path in (upload_path / old, other):
+            os.utime(path, (past, past))
+
+        assert FileService.remove_expired_uploads(3600) == 1
+        assert not (upload_path / old).exists()
+        assert (upload_path / fresh).exists()
+        assert other.exists()
+
+    def test_sweep_runs_at_most_once_per_interval(self):
+        """Test that the sweep starts on a thread and is gated by time"""
+        with patch.object(file_service, "_last_upload_sweep", float("-inf")), \
+                patch.object(file_service.threading, "Thread") as thread:
+            assert FileService.maybe_remove_expired_uploads(3600) is True
+            assert FileService.maybe_remove_expired_uploads(3600) is False
+
+        thread.assert_called_once()
+        assert thread.call_args.kwargs["target"] == FileService.remove_expired_uploads
+        thread.return_value.start.assert_called_once()
@@ -0,0 +1,101 @@
+"""Unit tests for GitHub Service manifest caching"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.application.services.github_service import GitHubService, RepoIngestionResult
+from src.config.settings import settings
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """Create GitHub service with its repo cache in a temp dir"""
+    monkeypatch.setattr(settings, "REPO_CACHE_PATH", tmp_path / "repo_cache")
+    return GitHubService()
+
+
+def _result(repo_id):
+    return RepoIngestionResult(
+        repo_id=repo_id,
+        owner="octo",
+        repo_name="demo",
+        included_files=[],
+        skipped_files=[],
+        total_files=0,
+        total_chars=0,
+        warnings=[],
+        tree_sha="abc123",
+    )
+
+
+class TestManifests:
+    """Test persisted ingestion manifests"""
+
+    def test_round_trip(self, service):
+        """Test that a saved manifest loads back by repo_id"""
+        service._save_manifest(_result("octo_demo_1700000000"))
+
+        loaded = service.load_manifest("octo_demo_1700000000")
+
+        assert loaded.tree_sha == "abc123"
+
+    def test_rejects_repo_ids_outside_the_cache(self, service, tmp_path):
+        """Test that path segments in repo_id can't escape REPO_CACHE_PATH"""
+        (tmp_path / "manifest.json").write_text('{"repo_id": "x"}')
+
+        for repo_id in ["..", "../", "../../etc", "a/../..", ".hidden", ""]:
+            assert service.load_manifest(repo_id) is None
+            assert not GitHubService.is_valid_repo_id(repo_id)
+
+
+class TestGetOrIngest:
+    """Test manifest reuse in get_or_ingest"""
+
+    @pytest.fixture
+    def fetch(self, service, monkeypatch):
+        """Stub out the tree fetch and filtering; returns the fetch mock"""
+        fetch = Mock(return_value=[])
+        monkeypatch.setattr(service, "fetch_repo_tree", fetch)
+        monkeypatch.setattr(service, "filter_and_validate_files", Mock(return_value=([], [], [])))
+        return fetch
+
+    def test_miss_ingests(self, service, fetch):
+        """Test that the first request fetches the tree"""
+        with patch.object(service, "resolve_tree_sha", return_value="abc123"):
+            result = service.get_or_ingest("octo/demo")
+
+        fetch.assert_called_once()
+        assert result.tree_sha == "abc123"
+        assert GitHubService.is_valid_repo_id(result.repo_id)
+        assert service.load_manifest(result.repo_id) is not None
+
+    def test_hit_returns_new_repo_id(self, service, fetch):
+        """Test that a cached manifest is reused under a fresh run id"""
+        with patch.object(service, "resolve_tree_sha", return_value="abc123"):
+            first = service.get_or_ingest("octo/demo")
+            second = service.get_or_ingest("octo/demo")
+
+        fetch.assert_called_once()
+        assert second.repo_id != first.repo_id
+        assert GitHubService.is_valid_repo_id(second.repo_id)
+        assert second.tree_sha == first.tree_sha
+
+    def test_hit_from_disk_by_repo_id(self, service, fetch):
+        """Test that a persisted manifest is found through the caller's repo_id"""
+        service._save_manifest(_result("octo_demo_1700000000"))
+        with patch.object(service, "resolve_tree_sha", return_value="abc123"):
+            result = service.get_or_ingest("octo/demo", repo_id="octo_demo_1700000000")
+
+        fetch.assert_not_called()
+        assert result.repo_id != "octo_demo_1700000000"
+
+    def test_tree_sha_mismatch_reingests(self, service, fetch):
+        """Test that a moved branch head invalidates the manifest"""
+        with patch.object(service, "resolve_tree_sha", return_value="abc123"):
+            service.get_or_ingest("octo/demo")
+        with patch.object(service, "resolve_tree_sha", return_value="def456"):
+            result = service.get_or_ingest("octo/demo")
+
+        assert fetch.call_count == 2
+        assert result.tree_sha == "def456"
@@ -0,0 +1,68 @@
+"""Unit tests for the orjson-backed JSON provider"""
+
+from datetime import datetime
+
+import pytest
+from flask import Flask, jsonify
+
+from src.infrastructure.api import json_provider
+from src.infrastructure.api.json_provider import OrjsonProvider, install_json_provider
+
+pytestmark = pytest.mark.skipif(json_provider.orjson is None, reason="orjson not installed")
+
+
+class TestOrjsonProvider:
+    """Test OrjsonProvider class"""
+
+    @pytest.fixture
+    def app(self):
+        """Create app using the orjson provider"""
+        app = Flask(__name__)
+        install_json_provider(app)
+        return app
+
+    def test_installed(self, app):
+        """Test that the provider is installed on the app"""
+        assert isinstance(app.json, OrjsonProvider)
+
+    def test_matches_default_provider_output(self, app):
+        """Test that output matches Flask's default provider"""
+        payload = {"b": 1, "a": [1.5, None, "é"], "ok": True, "when": datetime(2024, 1, 2, 3, 4, 5)}
+        default_app = Flask(__name__)
+
+        assert app.json.loads(app.json.dumps(payload)) == default_app.json.loads(default_app.json.dumps(payload))
+
+    def test_falls_back_for_big_integers(self, app):
+        """Test that values orjson rejects still serialize"""
+        assert app.json.dumps({"n": 2 ** 70}) == '{"n": 1180591620717411303424}'
+
+    def test_jsonify_and_get_json(self, app):
+        """Test round trip through jsonify and request parsing"""
+        @app.route("/echo", methods=["POST"])
+        def echo():
+            from flask import request
+            return jsonify(request.get_json())
+
+        response = app.test_client().post("/echo", json={"files": [{"path": "a.py"}]})
+
+        assert response.get_json() == {"files": [{"path": "a.py"}]}
+
+    def test_response_is_compact_utf8(self, app):
+        """Test that jsonify bodies are compact UTF-8 JSON with sorted keys"""
+        payload = {"output": "# Doc\n\"quoted\" é", "file_count": 2, "chapters": []}
+
+        with app.app_context():
+            response = jsonify(payload)
+
+        assert response.mimetype == "application/json"
+        assert response.get_data() == (
+            '{"chapters":[],"file_count":2,"output":"# Doc\\n\\"quoted\\" é"}\n'.encode("utf-8")
+        )
+
+    def test_dumps_bytes_matches_dumps(self, app):
+        """Test that dumps_bytes agrees with dumps for both providers"""
+        payload = {"output": "# Doc é", "pdfUrl": None}
+        default_app = Flask(__name__)
+
+        assert json_provider.dumps_bytes(app.json, payload) == app.json.dumps(payload).encode("utf-8")
+        assert json_provider.dumps_bytes(default_app.json, payload) == default_app.json.dumps(payload).encode("utf-8")
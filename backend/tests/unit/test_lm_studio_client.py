@@ -0,0 +1,73 @@
+"""Unit tests for LM Studio client prompt building"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.infrastructure.external.lm_studio_client import LMStudioClient
+
+
+@pytest.fixture
+def client():
+    """Create LM Studio client"""
+    return LMStudioClient()
+
+
+class TestPromptBuilding:
+    """Test system and user prompt construction"""
+
+    def test_system_prompt_per_content_type(self, client):
+        """Test that code and text get their own system prompts"""
+        code_prompt = client._build_system_prompt("code")
+        text_prompt = client._build_system_prompt("text")
+
+        assert "DOCUMENT MODE: CODE" in code_prompt
+        assert "DOCUMENT MODE: TEXT/DATA" in text_prompt
+        assert code_prompt.startswith("You are Recall AI Documentation Engine")
+        assert text_prompt.startswith("You are Recall AI Documentation Engine")
+
+    def test_code_prompt_skips_structure_detection(self, client):
+        """Test that code prompts don't scan the content"""
+        with patch.object(client, "_detect_content_structure") as detect:
+            prompt = client._build_user_prompt("def main(): pass", "Tool", "code", 2)
+
+        detect.assert_not_called()
+        assert prompt.startswith("USER_PROVIDED_TITLE: Tool\nFILES_PROCESSED: 2 file(s)\nCONTENT_TYPE: Code\n\n")
+        assert prompt.endswith("SOURCE CODE:\n============\ndef main(): pass\n")
+
+    def test_data_prompt_includes_structure_hints(self, client):
+        """Test that JSON-like text gets the data prompt and analysis section"""
+        prompt = client._build_user_prompt('{"_id": 1, "email": "a@b.c"}', None, "text")
+
+        assert prompt.startswith("\nCONTENT_ANALYSIS:\n- The content contains JSON data structures\n")
+        assert "CONTENT_TYPE: Data/JSON Documentation" in prompt
+        assert prompt.endswith('SOURCE DATA:\n============\n{"_id": 1, "email": "a@b.c"}\n')
+
+    def test_plain_text_prompt(self, client):
+        """Test that prose gets the text prompt"""
+        prompt = client._build_user_prompt("Notes on the quarterly plan.", None, "text")
+
+        assert prompt.startswith("CONTENT_TYPE: Text\n\n")
+        assert prompt.endswith("SOURCE TEXT:\n============\nNotes on the quarterly plan.\n")
+
+
+class TestDetectContentStructure:
+    """Test content structure detection"""
+
+    def test_keywords_match_case_insensitively(self, client):
+        """Test that each category is flagged by its keywords in any case"""
+        structure = client._detect_content_structure("CLASS Foo: uses MongoDB and Settings")
+
+        assert structure == {
+            "has_json": False,
+            "has_code": True,
+            "has_data": False,
+            "is_database": True,
+            "is_config": True,
+        }
+
+    def test_plain_text_matches_nothing(self, client):
+        """Test that prose without keywords flags no category"""
+        structure = client._detect_content_structure("Notes on the quarterly plan.")
+
+        assert not any(structure.values())
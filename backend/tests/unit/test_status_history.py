@@ -0,0 +1,103 @@
+"""Unit tests for status history storage"""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from src.infrastructure.storage.status_history import StatusHistory, StatusHistoryWriter
+
+
+class TestStatusHistoryWriter:
+    """Test StatusHistoryWriter class"""
+
+    def test_flush_writes_queued_checks_in_one_batch(self):
+        """Test that queued checks are inserted together, oldest first"""
+        writer = StatusHistoryWriter()
+        writer._started = True  # No background thread; flush explicitly
+
+        with patch.object(StatusHistory, "record_status_checks_bulk") as mock_bulk:
+            writer.record("mongodb", "healthy", {"connected": True})
+            writer.record("node_backend", "unhealthy")
+            writer.flush()
+
+        mock_bulk.assert_called_once()
+        batch = mock_bulk.call_args[0][0]
+        assert [(service, status, details) for service, status, details, _ in batch] == [
+            ("mongodb", "healthy", {"connected": True}),
+            ("node_backend", "unhealthy", None),
+        ]
+        assert all(isinstance(timestamp, datetime) for *_, timestamp in batch)
+
+    def test_drops_checks_when_queue_full(self):
+        """Test that recording never blocks once the queue is full"""
+        writer = StatusHistoryWriter(max_pending=1)
+        writer._started = True
+
+        writer.record("web", "healthy")
+        writer.record("web", "healthy")
+
+        assert writer.pending.qsize() == 1
+
+    def test_min_interval_skips_repeated_status(self):
+        """Test that unchanged statuses are recorded once per interval"""
+        writer = StatusHistoryWriter(min_interval=60)
+        writer._started = True
+
+        writer.record("web", "healthy")
+        writer.record("web", "healthy")
+        writer.record("mongodb", "healthy")
+        writer.record("web", "error")
+
+        services = [writer.pending.get_nowait()[:2] for _ in range(writer.pending.qsize())]
+        assert services == [("web", "healthy"), ("mongodb", "healthy"), ("web", "error")]
+
+
+class TestGetUptimeSummary:
+    """Test StatusHistory.get_uptime_summary"""
+
+    def test_percentage_and_bars_from_one_aggregation(self):
+        """Test that both values come from the daily summary"""
+        daily = [
+            {"status": "red", "total_checks": 10, "healthy_count": 5},
+            {"status": "green", "total_checks": 30, "healthy_count": 30},
+        ]
+        with patch.object(StatusHistory, "get_daily_status_summary", return_value=daily) as summary:
+            percentage, bars = StatusHistory.get_uptime_summary("mongodb", days=4)
+
+        summary.assert_called_once_with("mongodb", 4)
+        assert percentage == 87.5
+        assert bars == ["green", "green", "red", "green"]
+
+    def test_no_history_is_fully_up(self):
+        """Test defaults when there are no records"""
+        with patch.object(StatusHistory, "get_daily_status_summary", return_value=[]):
+            assert StatusHistory.get_uptime_summary("web", days=3) == (100.0, ["green"] * 3)
+
+
+class TestGetAllUptime:
+    """Test StatusHistory.get_all_uptime"""
+
+    def test_splits_one_aggregation_by_service(self):
+        """Test that every requested service gets its own summary"""
+        collection = Mock()
+        collection.aggregate.return_value = [
+            {"_id": {"service": "mongodb", "date": "2024-05-01"},
+             "total_checks": 4, "healthy_count": 2, "unhealthy_count": 0, "error_count": 2},
+            {"_id": {"service": "web", "date": "2024-05-01"},
+             "total_checks": 3, "healthy_count": 3, "unhealthy_count": 0, "error_count": 0},
+            {"_id": {"service": "mongodb", "date": "2024-05-02"},
+             "total_checks": 4, "healthy_count": 4, "unhealthy_count": 0, "error_count": 0},
+        ]
+        with patch.object(StatusHistory, "get_collection", return_value=collection):
+            uptime = StatusHistory.get_all_uptime(["web", "mongodb", "node_backend"], days=3)
+
+        collection.aggregate.assert_called_once()
+        assert uptime == {
+            "web": (100.0, ["green", "green", "green"]),
+            "mongodb": (75.0, ["green", "red", "green"]),
+            "node_backend": (100.0, ["green", "green", "green"]),
+        }
+
+    def test_defaults_when_query_fails(self):
+        """Test that a failed aggregation reports every service as up"""
+        with patch.object(StatusHistory, "get_collection", side_effect=RuntimeError("down")):
+            assert StatusHistory.get_all_uptime(["web"], days=2) == {"web": (100.0, ["green", "green"])}
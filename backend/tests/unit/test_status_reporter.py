@@ -0,0 +1,146 @@
+"""Unit tests for Status Reporter helpers"""
+
+import logging
+import threading
+
+import pytest
+from unittest.mock import Mock, patch
+from src.infrastructure.external.status_reporter import (
+    BackgroundStatusReporter,
+    StatusReporter,
+    ThrottledStatusCallback,
+)
+
+
+class TestThrottledStatusCallback:
+    """Test ThrottledStatusCallback class"""
+
+    @pytest.fixture
+    def callback(self):
+        """Create throttled callback around a mock"""
+        return ThrottledStatusCallback(Mock(), min_interval=60)
+
+    def test_drops_rapid_duplicate_updates(self, callback):
+        """Test that near-identical updates inside the interval are dropped"""
+        callback(status="generating", progress=50)
+        callback(status="generating", progress=51)
+        callback(status="generating", progress=52)
+
+        assert callback.fn.call_count == 1
+
+    def test_forwards_large_progress_jumps(self, callback):
+        """Test that progress jumps bypass the interval"""
+        callback(status="generating", progress=50)
+        callback(status="generating", progress=60)
+
+        assert callback.fn.call_count == 2
+
+    def test_forwards_status_transitions(self, callback):
+        """Test that a new status is always forwarded"""
+        callback(status="scanning", progress=20)
+        callback(status="indexing", progress=21)
+
+        assert callback.fn.call_count == 2
+
+    def test_terminal_states_always_forwarded(self, callback):
+        """Test that completed/failed updates are never throttled"""
+        callback(status="generating", progress=99)
+        callback(status="completed", progress=100, markdown="# Doc")
+        callback(status="completed", progress=100, markdown="# Doc")
+
+        assert callback.fn.call_count == 3
+        callback.fn.assert_called_with(status="completed", progress=100, markdown="# Doc")
+
+    def test_forwards_after_interval(self):
+        """Test that updates resume once the interval has elapsed"""
+        callback = ThrottledStatusCallback(Mock(), min_interval=0.25)
+        with patch("src.infrastructure.external.status_reporter.time.monotonic") as mock_time:
+            mock_time.return_value = 100.0
+            callback(status="generating", progress=50)
+            mock_time.return_value = 100.1
+            callback(status="generating", progress=51)
+            mock_time.return_value = 100.5
+            callback(status="generating", progress=52)
+
+        assert callback.fn.call_count == 2
+
+
+class TestBackgroundStatusReporter:
+    """Test BackgroundStatusReporter class"""
+
+    def test_updates_sent_in_order(self):
+        """Test that queued updates reach the reporter in submission order"""
+        reporter = Mock()
+        calls = []
+        reporter.report_progress.side_effect = lambda **kw: calls.append(kw["status"]) or True
+        reporter.report_completion.side_effect = lambda **kw: calls.append("completed") or True
+        background = BackgroundStatusReporter(reporter)
+
+        background.report_progress(status="pending", progress=0)
+        background.report_progress(status="generating", progress=30)
+        assert background.report_completion(markdown="# Doc").result(timeout=5) is True
+
+        assert calls == ["pending", "generating", "completed"]
+
+    def test_failures_are_swallowed(self):
+        """Test that a failing update resolves to False instead of raising"""
+        reporter = Mock()
+        reporter.report_error.side_effect = RuntimeError("node down")
+        background = BackgroundStatusReporter(reporter)
+
+        assert background.report_error(error_message="boom").result(timeout=5) is False
+
+    def test_drops_progress_when_queue_full(self):
+        """Test that progress updates are dropped but completion is kept when backlogged"""
+        reporter = Mock()
+        background = BackgroundStatusReporter(reporter, max_pending=1)
+        background.pending = 1  # Simulate a backlog
+
+        assert background.report_progress(status="generating", progress=40) is None
+        background.pending = 0
+        assert background.report_completion(markdown="# Doc").result(timeout=5) is not None
+
+        reporter.report_progress.assert_not_called()
+        reporter.report_completion.assert_called_once()
+
+    def test_slow_token_does_not_block_others(self):
+        """Test that one user's stalled update doesn't hold up another user's"""
+        reporter = Mock()
+        release = threading.Event()
+        reporter.report_progress.side_effect = lambda **kw: release.wait(5) if kw["token"] == "slow" else True
+        background = BackgroundStatusReporter(reporter, workers=4)
+        slow_token = "slow"
+        fast_token = next(
+            t for t in (f"user-{i}" for i in range(100))
+            if background._executor_for(t) is not background._executor_for(slow_token)
+        )
+
+        background.report_progress(status="generating", progress=10, token=slow_token)
+        fast = background.report_progress(status="generating", progress=10, token=fast_token)
+
+        assert fast.result(timeout=1) is True
+        release.set()
+
+    def test_undelivered_completion_is_logged(self, caplog):
+        """Test that a completion that never lands resolves False and logs an error"""
+        reporter = Mock()
+        reporter.report_completion.return_value = False
+        background = BackgroundStatusReporter(reporter)
+
+        with caplog.at_level(logging.ERROR):
+            assert background.report_completion(markdown="# Doc", token="t").result(timeout=5) is False
+
+        assert "Completion status for generation was not delivered" in caplog.text
+
+
+class TestStatusReporter:
+    """Test StatusReporter class"""
+
+    def test_uses_configured_timeout_and_retries(self):
+        """Test that background reporters can use a short timeout without retries"""
+        reporter = StatusReporter("http://node", timeout=(1.0, 2.0), retries=0)
+        reporter.session.post = Mock(return_value=Mock(status_code=200))
+
+        assert reporter.report_progress(status="pending", progress=0, current_step="") is True
+        assert reporter.session.post.call_args.kwargs["timeout"] == (1.0, 2.0)
+        assert reporter.session.get_adapter("http://node").max_retries.total == 0
@@ -0,0 +1,216 @@
+"""Unit tests for status page helpers"""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from pymongo.errors import PyMongoError
+
+from src.infrastructure.api import status_routes
+from src.infrastructure.cache import TTLCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_status_cache():
+    """Give every test its own status cache (late background checks can't leak across)"""
+    with patch.object(status_routes, "_status_cache", TTLCache()):
+        yield
+
+
+class TestRunStatusChecks:
+    """Test run_status_checks function"""
+
+    def test_runs_checks_concurrently(self):
+        """Test that total time is bounded by the slowest check, not the sum"""
+        def slow_check():
+            time.sleep(0.2)
+            return {"status": "healthy"}
+
+        with patch.object(status_routes, "check_mongodb", slow_check), \
+                patch.object(status_routes, "check_python_backend", slow_check), \
+                patch.object(status_routes, "check_node_backend", slow_check):
+            start = time.monotonic()
+            results = status_routes.run_status_checks()
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.5
+        assert {name: result["status"] for name, result in results.items()} == {
+            "mongodb": "healthy",
+            "python_backend": "healthy",
+            "node_backend": "healthy",
+        }
+
+    def test_substitutes_timeout_for_hung_check(self):
+        """Test that a check exceeding the timeout is reported as an error"""
+        def hung_check():
+            time.sleep(0.3)
+            return {"status": "healthy"}
+
+        with patch.object(status_routes, "_CHECK_TIMEOUT", 0.1), \
+                patch.object(status_routes, "check_mongodb", hung_check), \
+                patch.object(status_routes, "check_python_backend", lambda: {"status": "healthy"}), \
+                patch.object(status_routes, "check_node_backend", lambda: {"status": "healthy"}):
+            results = status_routes.run_status_checks()
+
+        assert results["mongodb"] == {"status": "error", "error": "timeout"}
+        assert results["python_backend"]["status"] == "healthy"
+
+    def test_reuses_recent_results(self):
+        """Test that checks within the TTL are served from the cache"""
+        check = Mock(return_value={"status": "healthy"})
+
+        with patch.object(status_routes, "check_mongodb", check), \
+                patch.object(status_routes, "check_python_backend", check), \
+                patch.object(status_routes, "check_node_backend", check):
+            first = status_routes.run_status_checks()
+            first["mongodb"]["uptime_percentage"] = 99.0
+            second = status_routes.run_status_checks()
+
+        assert check.call_count == 3
+        assert "uptime_percentage" not in second["mongodb"]
+
+
+class TestCheckPythonBackend:
+    """Test check_python_backend function"""
+
+    def test_reads_health_snapshot_without_http(self):
+        """Test that an in-process snapshot replaces the loopback request"""
+        snapshot = Mock(return_value={"status": "ok", "lm_studio": "connected"})
+
+        with patch.object(status_routes, "_history_writer"), \
+                patch.object(status_routes._http, "get") as mock_get:
+            result = status_routes.check_python_backend(snapshot)
+
+        mock_get.assert_not_called()
+        assert result["status"] == "healthy"
+        assert result["health_data"] == {"status": "ok", "lm_studio": "connected"}
+        assert {"uptime", "port", "host"} <= result.keys()
+
+    def test_snapshot_failure_is_reported(self):
+        """Test that a failing snapshot marks the backend as errored"""
+        snapshot = Mock(side_effect=RuntimeError("boom"))
+
+        with patch.object(status_routes, "_history_writer"):
+            result = status_routes.check_python_backend(snapshot)
+
+        assert result == {"status": "error", "error": "boom"}
+
+
+class TestCheckMongodb:
+    """Test check_mongodb function"""
+
+    def test_server_info_and_db_stats_are_reused(self):
+        """Test that only the ping is repeated on back-to-back checks"""
+        client = Mock()
+        client.admin.command.side_effect = lambda name, **kwargs: {"version": "7.0.2"} if name == "buildInfo" else {"ok": 1}
+        database = Mock()
+        database.command.return_value = {"collections": 4, "dataSize": 3 * 1024 * 1024}
+
+        with patch.object(status_routes, "_server_version", None), \
+                patch.object(status_routes, "get_client", return_value=client), \
+                patch.object(status_routes, "get_database", return_value=database), \
+                patch.object(status_routes, "_history_writer"):
+            first = status_routes.check_mongodb()
+            second = status_routes.check_mongodb()
+
+        assert first == second
+        assert first["server_version"] == "7.0.2"
+        assert (first["collections"], first["data_size_mb"]) == (4, 3.0)
+        assert database.command.call_count == 1
+        assert [c.args[0] for c in client.admin.command.call_args_list] == ["ping", "buildInfo", "ping"]
+
+    def test_db_stats_failure_keeps_last_values(self):
+        """Test that a failed dbStats reuses the previous stats and backs off"""
+        database = Mock()
+        database.command.side_effect = PyMongoError("timed out")
+
+        with patch.object(status_routes, "_last_db_stats", (4, 3.0)), \
+                patch.object(status_routes, "get_database", return_value=database):
+            first = status_routes._status_cache.get_or_load(
+                "mongodb_db_stats", status_routes._load_db_stats, status_routes._DB_STATS_TTL
+            )
+            second = status_routes._status_cache.get_or_load(
+                "mongodb_db_stats", status_routes._load_db_stats, status_routes._DB_STATS_TTL
+            )
+
+        assert first == second == (4, 3.0)
+        assert database.command.call_count == 1
+
+
+class TestMaybeCleanupHistory:
+    """Test maybe_cleanup_history function"""
+
+    def test_runs_at_most_once_per_interval(self):
+        """Test that cleanup starts on a thread and is gated by time"""
+        with patch.object(status_routes, "_last_cleanup", float("-inf")), \
+                patch.object(status_routes.threading, "Thread") as thread:
+            assert status_routes.maybe_cleanup_history() is True
+            assert status_routes.maybe_cleanup_history() is False
+
+        thread.assert_called_once()
+        assert thread.call_args.kwargs["target"] == status_routes.StatusHistory.cleanup_old_records
+        thread.return_value.start.assert_called_once()
+
+
+class TestFormatUptime:
+    """Test format_uptime function"""
+
+    def test_formats_each_unit(self):
+        """Test days, hours, minutes and seconds formatting"""
+        assert status_routes.format_uptime(0) == "0s"
+        assert status_routes.format_uptime(59.9) == "59s"
+        assert status_routes.format_uptime(3 * 86400 + 2 * 3600 + 5 * 60 + 7.5) == "3d 2h 5m 7s"
+        assert status_routes.format_uptime(3600) == "1h"
+
+
+class TestCheckRecording:
+    """Test that each check records its result once"""
+
+    def test_node_backend_failure_recorded_once(self):
+        """Test that the returned status is the one recorded"""
+        with patch.object(status_routes._http, "get", side_effect=requests.exceptions.ConnectionError()), \
+                patch.object(status_routes, "_history_writer") as writer:
+            result = status_routes.check_node_backend()
+
+        assert result["status"] == "unhealthy"
+        writer.record.assert_called_once_with("node_backend", "unhealthy", result)
+
+    def test_node_backend_timeout_is_unhealthy_without_traceback(self, caplog):
+        """Test that a timed-out probe is logged as a warning, not an exception"""
+        with patch.object(status_routes._http, "get", side_effect=requests.exceptions.ReadTimeout("slow")), \
+                patch.object(status_routes, "_history_writer"):
+            result = status_routes.check_node_backend()
+
+        assert result["status"] == "unhealthy"
+        assert result["error"] == "Node.js backend timed out"
+        assert all(record.exc_info is None for record in caplog.records)
+
+
+class TestCollectStatus:
+    """Test collect_status function"""
+
+    def test_shares_one_probe_cycle(self):
+        """Test that back-to-back callers reuse the same checks and uptime"""
+        checks = {name: {"status": "healthy"} for name in ("mongodb", "python_backend", "node_backend")}
+        uptime = {"uptime_percentage": 100.0, "uptime_history": ["green"]}
+        with patch.object(status_routes, "run_status_checks", return_value=checks) as run, \
+                patch.object(status_routes, "get_uptime", return_value=uptime), \
+                patch.object(status_routes, "_history_writer"):
+            first = status_routes.collect_status()
+            second = status_routes.collect_status()
+
+        assert first is second
+        run.assert_called_once()
+        assert first["all_healthy"] is True
+        assert list(first["services"]) == ["web", "python_backend", "node_backend", "mongodb"]
+        assert first["services"]["mongodb"]["component_count"] == 2
+
+
+class TestUtcTimestamp:
+    """Test utc_timestamp function"""
+
+    def test_formats_utc_not_local_time(self):
+        """Test that the UTC label matches the formatted time"""
+        with patch.object(status_routes.time, "time", return_value=0.7):
+            assert status_routes.utc_timestamp() == "1970-01-01 00:00:00 UTC"
@@ -0,0 +1,84 @@
+"""Unit tests for user data storage helpers"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.infrastructure.api import user_routes
+
+
+@pytest.fixture
+def user_dir(tmp_path):
+    """Point user storage at a temporary directory"""
+    with patch.object(user_routes, "USER_DATA_DIR", tmp_path):
+        yield tmp_path
+
+
+class TestUserDataStorage:
+    """Test load_user_data and save_user_data"""
+
+    def test_save_then_load_round_trip(self, user_dir):
+        """Test that saved data is written atomically and read back"""
+        user_routes.save_user_data("alice", {"id": "alice", "usage": {"chats": {"today": 1}}})
+
+        assert json.loads((user_dir / "alice.json").read_text()) == {"id": "alice", "usage": {"chats": {"today": 1}}}
+        assert [p.name for p in user_dir.iterdir()] == ["alice.json"]
+        assert user_routes.load_user_data("alice")["usage"]["chats"]["today"] == 1
+
+    def test_loads_do_not_share_state(self, user_dir):
+        """Test that modifying loaded data doesn't leak into later loads"""
+        user_routes.save_user_data("alice", {"id": "alice", "usage": {"bots": {"current": 0}}})
+
+        first = user_routes.load_user_data("alice")
+        first["usage"]["bots"]["current"] = 5
+        second = user_routes.load_user_data("alice")
+
+        assert second["usage"]["bots"]["current"] == 0
+
+    def test_external_change_is_picked_up(self, user_dir):
+        """Test that a file changed outside the process is re-read"""
+        user_routes.save_user_data("alice", {"name": "old"})
+        user_file = user_dir / "alice.json"
+        user_file.write_text(json.dumps({"name": "new"}))
+        stat = user_file.stat()
+        os.utime(user_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert user_routes.load_user_data("alice") == {"name": "new"}
+
+    def test_same_mtime_replacement_is_picked_up(self, user_dir):
+        """Test that another writer's file is re-read even with an identical mtime"""
+        user_routes.save_user_data("alice", {"name": "old"})
+        user_file = user_dir / "alice.json"
+        stat = user_file.stat()
+        replacement = user_dir / "other.json"
+        replacement.write_text(json.dumps({"name": "newer"}))
+        os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(replacement, user_file)
+
+        assert user_routes.load_user_data("alice") == {"name": "newer"}
+
+    def test_saved_file_mode(self, user_dir):
+        """Test that saves don't leave user files readable only by the owner"""
+        user_routes.save_user_data("alice", {"name": "a"})
+        user_file = user_dir / "alice.json"
+
+        assert user_file.stat().st_mode & 0o777 == 0o644
+        user_file.chmod(0o640)
+        user_routes.save_user_data("alice", {"name": "b"})
+        assert user_file.stat().st_mode & 0o777 == 0o640
+
+    def test_save_without_fchmod(self, user_dir, monkeypatch):
+        """Test that saving works on platforms without os.fchmod"""
+        monkeypatch.delattr(os, "fchmod")
+        user_routes.save_user_data("alice", {"name": "a"})
+
+        assert user_routes.load_user_data("alice") == {"name": "a"}
+
+    def test_missing_file_returns_defaults(self, user_dir):
+        """Test default data for a user without a file"""
+        data = user_routes.load_user_data("bob")
+
+        assert data["id"] == "bob"
+        assert data["plan"] == "free"
@@ -0,0 +1,110 @@
+"""Unit tests for User Service helpers"""
+
+import pytest
+import requests
+from unittest.mock import Mock, call
+from src.infrastructure.external.user_service import BufferedUsageRecorder, UserService
+
+
+class TestBufferedUsageRecorder:
+    """Test BufferedUsageRecorder class"""
+
+    def test_flush_sums_increments_per_token_and_type(self):
+        """Test that buffered increments are sent as one request per key"""
+        user_service = Mock()
+        recorder = BufferedUsageRecorder(user_service, flush_interval=3600)
+        recorder.increment("token-a", "codeToDoc")
+        recorder.increment("token-a", "codeToDoc", 2)
+        recorder.increment("token-b", "codeToDoc")
+
+        user_service.increment_usage.assert_not_called()
+        recorder.flush()
+
+        assert user_service.increment_usage.call_args_list == [
+            call("token-a", "codeToDoc", 3, raise_connection_errors=True),
+            call("token-b", "codeToDoc", 1, raise_connection_errors=True),
+        ]
+        recorder.flush()
+        assert user_service.increment_usage.call_count == 2
+
+    def test_skips_unauthenticated_usage(self):
+        """Test that increments without a token are not recorded"""
+        user_service = Mock()
+        recorder = BufferedUsageRecorder(user_service, flush_interval=3600)
+        recorder.increment(None, "codeToDoc")
+        recorder.flush()
+
+        user_service.increment_usage.assert_not_called()
+
+    def test_zero_interval_sends_immediately(self):
+        """Test that a non-positive interval disables buffering"""
+        user_service = Mock()
+        recorder = BufferedUsageRecorder(user_service, flush_interval=0)
+        recorder.increment("token-a", "codeToDoc")
+
+        user_service.increment_usage.assert_called_once_with("token-a", "codeToDoc", 1)
+
+    def test_connection_error_keeps_amount(self):
+        """Test that increments that never reached the backend are retried"""
+        user_service = Mock()
+        user_service.increment_usage.side_effect = [requests.exceptions.ConnectionError("refused"), True]
+        recorder = BufferedUsageRecorder(user_service, flush_interval=3600)
+        recorder.increment("token-a", "codeToDoc", 2)
+        recorder.flush()
+        recorder.increment("token-a", "codeToDoc")
+        recorder.flush()
+
+        assert user_service.increment_usage.call_args_list == [
+            call("token-a", "codeToDoc", 2, raise_connection_errors=True),
+            call("token-a", "codeToDoc", 3, raise_connection_errors=True),
+        ]
+        assert recorder.pending == {}
+        assert recorder.retries == {}
+
+    def test_rejected_increment_is_dropped(self):
+        """Test that increments the backend answered (4xx/5xx/timeout) are not resent"""
+        user_service = Mock()
+        user_service.increment_usage.return_value = False
+        recorder = BufferedUsageRecorder(user_service, flush_interval=3600)
+        recorder.increment("token-a", "codeToDoc", 2)
+        recorder.flush()
+        recorder.flush()
+
+        user_service.increment_usage.assert_called_once()
+        assert recorder.pending == {}
+
+    def test_retries_are_capped(self):
+        """Test that an amount is dropped after max_retries failed connections"""
+        user_service = Mock()
+        user_service.increment_usage.side_effect = requests.exceptions.ConnectionError("refused")
+        recorder = BufferedUsageRecorder(user_service, flush_interval=3600, max_retries=2)
+        recorder.increment("token-a", "codeToDoc")
+        for _ in range(5):
+            recorder.flush()
+
+        assert user_service.increment_usage.call_count == 3
+        assert recorder.pending == {}
+        assert recorder.retries == {}
+
+
+class TestIncrementUsage:
+    """Test UserService.increment_usage"""
+
+    def _service(self, error):
+        session = Mock()
+        session.post.side_effect = error
+        return UserService("http://node", session=session)
+
+    def test_raises_connection_errors_when_asked(self):
+        """Test that connection failures propagate for the recorder to retry"""
+        service = self._service(requests.exceptions.ConnectionError("refused"))
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            service.increment_usage("token-a", "codeToDoc", raise_connection_errors=True)
+        assert service.increment_usage("token-a", "codeToDoc") is False
+
+    def test_read_timeout_is_not_raised(self):
+        """Test that a timeout after sending is reported as a plain failure"""
+        service = self._service(requests.exceptions.ReadTimeout("slow"))
+
+        assert service.increment_usage("token-a", "codeToDoc", raise_connection_errors=True) is False
@@ -0,0 +1,52 @@
+"""Unit tests for Zip Service"""
+
+import zipfile
+import pytest
+from src.application.services.zip_service import ZipService
+from src.domain.exceptions import ValidationError
+
+
+class TestZipService:
+    """Test ZipService class"""
+
+    @pytest.fixture
+    def zip_service(self):
+        """Create zip service instance"""
+        return ZipService()
+
+    def _write_zip(self, path, files):
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, content in files.items():
+                zf.writestr(name, content)
+        return path
+
+    def test_extract_zip_preserves_archive_order(self, zip_service, tmp_path):
+        """Test that parallel extraction returns files in archive order"""
+        files = {f"src/module_{i:03d}.py": f"print({i})\n" * 10 for i in range(50)}
+        zip_path = self._write_zip(tmp_path / "repo.zip", files)
+
+        result = zip_service.extract_zip(zip_path)
+
+        assert [f.path for f in result.included_files] == list(files)
+        assert [f.content for f in result.included_files] == list(files.values())
+        assert result.total_chars == sum(len(c) for c in files.values())
+
+    def test_extract_zip_filters_ignored_and_unsupported(self, zip_service, tmp_path):
+        """Test that ignored paths and extensions are skipped"""
+        zip_path = self._write_zip(tmp_path / "repo.zip", {
+            "app.py": "print('hi')",
+            "node_modules/lib.js": "x",
+            "image.bin": "x",
+        })
+
+        result = zip_service.extract_zip(zip_path)
+
+        assert [f.path for f in result.included_files] == ["app.py"]
+        assert len(result.skipped_files) == 2
+
+    def test_extract_zip_no_supported_files(self, zip_service, tmp_path):
+        """Test that an archive without supported files is rejected"""
+        zip_path = self._write_zip(tmp_path / "repo.zip", {"image.bin": "x"})
+
+        with pytest.raises(ValidationError):
+            zip_service.extract_zip(zip_path)
@@ -122,6 +122,129 @@ const incrementUsage = async (req, res) => {
   }
 };
 
+// Counter field that is checked against the limit for each usage type
+const USAGE_COUNTERS = {
+  bots: 'current',
+  chats: 'today',
+  codeToDoc: 'used',
+  tokens: 'used',
+};
+
+// Largest amount a single reserve/release request may move a counter by
+const MAX_USAGE_AMOUNT = 10000;
+
+// Reserve/release amounts must be positive integers; a negative reservation
+// would lower the caller's own counter
+const isValidUsageAmount = (amount) =>
+  Number.isInteger(amount) && amount > 0 && amount <= MAX_USAGE_AMOUNT;
+
+// @desc    Atomically check the limit and reserve usage in one round-trip
+// @route   POST /api/users/usage/reserve
+// @access  Private
+const reserveUsage = async (req, res) => {
+  try {
+    const { type, amount = 1 } = req.body;
+    const counter = USAGE_COUNTERS[type];
+
+    if (!counter) {
+      return res.status(400).json({
+        success: false,
+        error: type ? 'Invalid usage type' : 'Usage type is required',
+      });
+    }
+
+    if (!isValidUsageAmount(amount)) {
+      return res.status(400).json({
+        success: false,
+        error: `Amount must be a positive integer no greater than ${MAX_USAGE_AMOUNT}`,
+      });
+    }
+
+    const user = await User.findById(req.user._id);
+
+    // Reset daily usage if needed
+    user.resetDailyUsage();
+    await user.save();
+
+    const path = `usage.${type}.${counter}`;
+    const limit = user.usage[type].limit;
+
+    // Only increment while the counter is still below the limit (-1 = unlimited)
+    const filter = { _id: user._id };
+    if (limit !== -1) {
+      filter[path] = { $lte: limit - amount };
+    }
+
+    const updated = await User.findOneAndUpdate(
+      filter,
+      { $inc: { [path]: amount } },
+      { new: true }
+    );
+
+    if (!updated) {
+      const used = user.usage[type][counter];
+      return res.status(403).json({
+        success: false,
+        error: `You have reached your ${type} limit (${used}/${limit}). Please upgrade your ${user.plan} plan to continue.`,
+        plan: user.plan,
+        usage: user.usage,
+      });
+    }
+
+    res.status(200).json({
+      success: true,
+      plan: updated.plan,
+      usage: updated.usage,
+    });
+  } catch (error) {
+    res.status(500).json({
+      success: false,
+      error: error.message || 'Server error',
+    });
+  }
+};
+
+// @desc    Release usage reserved for work that did not complete
+// @route   POST /api/users/usage/release
+// @access  Private
+const releaseUsage = async (req, res) => {
+  try {
+    const { type, amount = 1 } = req.body;
+    const counter = USAGE_COUNTERS[type];
+
+    if (!counter) {
+      return res.status(400).json({
+        success: false,
+        error: type ? 'Invalid usage type' : 'Usage type is required',
+      });
+    }
+
+    if (!isValidUsageAmount(amount)) {
+      return res.status(400).json({
+        success: false,
+        error: `Amount must be a positive integer no greater than ${MAX_USAGE_AMOUNT}`,
+      });
+    }
+
+    const path = `usage.${type}.${counter}`;
+    const updated = await User.findOneAndUpdate(
+      { _id: req.user._id, [path]: { $gte: amount } },
+      { $inc: { [path]: -amount } },
+      { new: true }
+    );
+
+    res.status(200).json({
+      success: true,
+      released: Boolean(updated),
+    });
+  } catch (error) {
+    res.status(500).json({
+      success: false,
+      error: error.message || 'Server error',
+    });
+  }
+};
+
 // @desc    Update user plan
 // @route   PUT /api/users/plan
 // @access  Private
@@ -186,6 +309,8 @@ const deleteAccount = async (req, res) => {
 module.exports = {
   getUsage,
   incrementUsage,
+  reserveUsage,
+  releaseUsage,
   updatePlan,
   deleteAccount,
 };
@@ -7,6 +7,8 @@ const router = express.Router();
 const {
   getUsage,
   incrementUsage,
+  reserveUsage,
+  releaseUsage,
   updatePlan,
   deleteAccount,
 } = require('../controllers/userController');
@@ -17,6 +19,8 @@ router.use(protect);
 
 router.get('/usage', getUsage);
 router.post('/usage/increment', incrementUsage);
+router.post('/usage/reserve', reserveUsage);
+router.post('/usage/release', releaseUsage);
 router.put('/plan', updatePlan);
 router.delete('/account', deleteAccount);
 
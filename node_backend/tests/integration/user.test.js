@@ -90,6 +90,76 @@ describe('User Management API', () => {
     });
   });
 
+  describe('POST /api/users/usage/reserve', () => {
+    test('should reserve usage while under the limit', async () => {
+      const response = await request(app)
+        .post('/api/users/usage/reserve')
+        .set('Authorization', `Bearer ${authToken}`)
+        .send({
+          type: 'codeToDoc',
+          amount: 1,
+        });
+
+      expect(response.status).toBe(200);
+      expect(response.body.success).toBe(true);
+      expect(response.body.usage.codeToDoc.used).toBe(1);
+    });
+
+    test('should reject reservations past the limit', async () => {
+      await User.updateOne({ _id: testUserId }, { 'usage.codeToDoc.used': 2, 'usage.codeToDoc.limit': 2 });
+
+      const response = await request(app)
+        .post('/api/users/usage/reserve')
+        .set('Authorization', `Bearer ${authToken}`)
+        .send({
+          type: 'codeToDoc',
+          amount: 1,
+        });
+
+      expect(response.status).toBe(403);
+      expect(response.body.success).toBe(false);
+    });
+
+    test('should release reserved usage', async () => {
+      await request(app)
+        .post('/api/users/usage/reserve')
+        .set('Authorization', `Bearer ${authToken}`)
+        .send({ type: 'codeToDoc', amount: 1 });
+
+      const response = await request(app)
+        .post('/api/users/usage/release')
+        .set('Authorization', `Bearer ${authToken}`)
+        .send({ type: 'codeToDoc', amount: 1 });
+
+      expect(response.status).toBe(200);
+      expect(response.body.released).toBe(true);
+    });
+
+    test.each([-1000, 0, 1.5, '1', null, 10001])('should reject reserve amount %p', async (amount) => {
+      const response = await request(app)
+        .post('/api/users/usage/reserve')
+        .set('Authorization', `Bearer ${authToken}`)
+        .send({ type: 'codeToDoc', amount });
+
+      expect(response.status).toBe(400);
+      const user = await User.findById(testUserId);
+      expect(user.usage.codeToDoc.used).toBe(0);
+    });
+
+    test.each([-1, 0, 2.5, '1'])('should reject release amount %p', async (amount) => {
+      await User.updateOne({ _id: testUserId }, { 'usage.codeToDoc.used': 1 });
+
+      const response = await request(app)
+        .post('/api/users/usage/release')
+        .set('Authorization', `Bearer ${authToken}`)
+        .send({ type: 'codeToDoc', amount });
+
+      expect(response.status).toBe(400);
+      const user = await User.findById(testUserId);
+      expect(user.usage.codeToDoc.used).toBe(1);
+    });
+  });
+
   describe('PUT /api/users/plan', () => {
     test('should update user plan', async () => {
       const response = await request(app)